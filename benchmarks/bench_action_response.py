@@ -0,0 +1,108 @@
+"""
+Compares the ActionResponse parse paths on responses with growing plan logs.
+
+- `baseline`: `json.loads` of the body and `ActionResponse.model_validate`
+  (what every step did before)
+- `fast`: pydantic-core parsing of the body and `ActionResponse.from_api`
+  (what every step does now)
+- `fast_hlp`: `fast`, then reading the plan (which builds its log on demand)
+
+Usage:
+    python benchmarks/bench_action_response.py --log-sizes 0 100 1000 --output parse.json
+"""
+import argparse
+import copy
+import json
+import statistics
+import time
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from game_sdk.game.custom_types import ActionResponse
+from game_sdk.game.serialization import loads
+
+from mock_server import AGENT_STATE
+
+
+def make_body(log_size: int) -> bytes:
+    agent_state = copy.deepcopy(AGENT_STATE)
+    agent_state["hlp"]["log"] = [
+        {
+            "step": i,
+            "action": "call_function",
+            "fn_name": f"function_{i % 10}",
+            "feedback": f"Function number {i % 10} ran and returned a result worth logging. " * 2,
+        }
+        for i in range(log_size)
+    ]
+    return json.dumps({
+        "data": {
+            "action_type": "call_function",
+            "agent_state": agent_state,
+            "action_args": {"fn_name": "function_0", "fn_id": "1", "args": {"query": {"value": "q"}}},
+        }
+    }).encode("utf-8")
+
+
+def baseline(body: bytes) -> ActionResponse:
+    return ActionResponse.model_validate(json.loads(body)["data"])
+
+
+def fast(body: bytes) -> ActionResponse:
+    return ActionResponse.from_api(loads(body)["data"])
+
+
+def fast_hlp(body: bytes) -> ActionResponse:
+    response = fast(body)
+    response.agent_state.hlp
+    return response
+
+
+PATHS: Dict[str, Callable[[bytes], ActionResponse]] = {
+    "baseline": baseline,
+    "fast": fast,
+    "fast_hlp": fast_hlp,
+}
+
+
+def measure(parse: Callable[[bytes], ActionResponse], body: bytes, iterations: int) -> Dict[str, Any]:
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        parse(body)
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return {
+        "mean_us": statistics.mean(timings) * 1e6,
+        "p50_us": timings[len(timings) // 2] * 1e6,
+        "p99_us": timings[min(len(timings) - 1, int(len(timings) * 0.99))] * 1e6,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--log-sizes", type=int, nargs="+", default=[0, 10, 100, 1000, 5000],
+                        help="numbers of entries in the plan log")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--output", default=None, help="JSON file to write (default: stdout)")
+    args = parser.parse_args(argv)
+
+    results = []
+    for log_size in args.log_sizes:
+        body = make_body(log_size)
+        result = {"log_size": log_size, "body_bytes": len(body)}
+        for name, parse in PATHS.items():
+            result[name] = measure(parse, body, args.iterations)
+        result["speedup"] = result["baseline"]["mean_us"] / result["fast"]["mean_us"]
+        results.append(result)
+
+    output = json.dumps({"args": vars(args), "results": results}, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+    return {"results": results}
+
+
+if __name__ == "__main__":
+    main()
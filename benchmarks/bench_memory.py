@@ -0,0 +1,135 @@
+"""
+Long synthetic agent run against the mock GAME API, with and without a MemoryBudget.
+
+Every step calls a function returning a large `info` dict, and the state functions
+keep a history of every function result (feedback and info), like long-running agents
+tend to do. The memory traced by tracemalloc and the agent's memory report are
+sampled along the run: without a budget they grow with the number of steps, with a
+budget they level off.
+
+Usage:
+    python benchmarks/bench_memory.py --steps 2000 --info-bytes 20000 --output memory.json
+"""
+import argparse
+import contextlib
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional, Sequence
+
+from game_sdk.game.agent import Agent, WorkerConfig
+from game_sdk.game.custom_types import Argument, Function, FunctionResultStatus
+from game_sdk.game.memory import MemoryBudget
+
+from mock_server import MockGameServer
+
+
+def make_agent(transport, info_bytes: int, budget: Optional[MemoryBudget]) -> Agent:
+    def fetch(**kwargs):
+        return FunctionResultStatus.DONE, "Fetched the page", {"page": "x" * info_bytes, "args": kwargs}
+
+    def get_state(function_result, current_state):
+        history = list((current_state or {}).get("history", []))
+        if function_result is not None and function_result.action_id:
+            history.append({"feedback": function_result.feedback_message, "info": function_result.info})
+        return {"history": history}
+
+    worker = WorkerConfig(
+        id="fetcher",
+        worker_description="Fetches pages",
+        get_state_fn=get_state,
+        action_space=[
+            Function(
+                fn_name="fetch",
+                fn_description="Fetch a page",
+                args=[Argument(name="query", type="string", description="What to fetch")],
+                executable=fetch,
+            )
+        ],
+    )
+    agent = Agent(
+        api_key="apt-benchmark-key",
+        name="Memory Benchmark Agent",
+        agent_goal="Fetch pages forever",
+        agent_description="An agent that never stops fetching",
+        get_agent_state_fn=get_state,
+        workers=[worker],
+        transport=transport,
+        memory_budget=budget,
+    )
+    agent.compile()
+    return agent
+
+
+def run(server: MockGameServer, args: argparse.Namespace, budget: Optional[MemoryBudget]) -> Dict[str, Any]:
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    agent = make_agent(server.transport(), args.info_bytes, budget)
+
+    samples: List[Dict[str, Any]] = []
+    started = time.perf_counter()
+    for step in range(1, args.steps + 1):
+        agent.step()
+        if step % args.sample_every == 0 or step == args.steps:
+            report = agent.memory_report()
+            samples.append({
+                "step": step,
+                "traced_bytes": tracemalloc.get_traced_memory()[0] - baseline,
+                "held_bytes": report["total_bytes"],
+            })
+    elapsed = time.perf_counter() - started
+
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+    return {
+        "budget": budget is not None,
+        "steps_per_second": args.steps / elapsed,
+        "peak_traced_bytes": peak,
+        "final": agent.memory_report(),
+        "samples": samples,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--steps", type=int, default=1000)
+    parser.add_argument("--info-bytes", type=int, default=20_000, help="size of every function result info")
+    parser.add_argument("--max-state-bytes", type=int, default=200_000)
+    parser.add_argument("--max-info-bytes", type=int, default=4_000)
+    parser.add_argument("--sample-every", type=int, default=100)
+    parser.add_argument("--output", default=None, help="JSON file to write (default: stdout)")
+    args = parser.parse_args(argv)
+
+    results = []
+    with MockGameServer() as server, tempfile.TemporaryDirectory() as spill_dir:
+        for budget in (
+            None,
+            MemoryBudget(args.max_state_bytes, args.max_info_bytes, spill_dir=spill_dir),
+        ):
+            # the SDK's own step output is not part of the measure
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                result = run(server, args, budget)
+            results.append(result)
+            print(
+                f"budget={result['budget']}: {result['steps_per_second']:.0f} steps/s, "
+                f"held {result['final']['total_bytes']} bytes, "
+                f"peak traced {result['peak_traced_bytes']} bytes",
+                file=sys.stderr,
+            )
+
+    output = json.dumps({"args": vars(args), "results": results}, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+    return {"results": results}
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""
+Checks RateLimitedTransport against a local platform stand-in announcing rate limits.
+
+Each scenario sends calls through a RateLimitedTransport to a local server answering
+like a chat platform API, and checks how the transport follows the limits it
+announces:
+
+- `retry_after`: the first calls of a route get a 429 with `Retry-After`; they are
+  sent again after the delay and succeed
+- `window`: every response carries `X-RateLimit-Limit`, `X-RateLimit-Remaining` and
+  `X-RateLimit-Reset-After`; once `Remaining` is 0 the calls wait for the reset, so
+  the server never has to answer 429
+- `global`: a 429 with `X-RateLimit-Scope: global` on one route holds the calls of
+  the other routes as well
+- `max_wait`: a 429 asking for a longer wait than `max_wait` is returned at once
+  instead of being waited for
+
+The elapsed time, the calls received by the server and the transport stats are
+reported for each scenario; the run fails if a check does not hold.
+
+Usage:
+    python benchmarks/bench_rate_limit.py --output rate_limit.json
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from game_sdk.game.transport import HTTPTransport
+from game_sdk.hosted_game.rate_limit import RateLimitedTransport
+
+
+class PlatformServer:
+    """
+    Threaded HTTP server answering GET requests like a rate-limited platform API.
+
+    Routes:
+        `/retry-after/{name}`: 429 with `Retry-After: {retry_after}` for the first
+            `throttled` calls of the route, then 200.
+        `/window/{name}`: `limit` calls per window of `window` seconds, announced with
+            the X-RateLimit headers; calls over the limit get a 429 (counted in
+            `violations`).
+        `/global/{name}`: 200, or a 429 with `X-RateLimit-Scope: global` and
+            `Retry-After: {retry_after}` when the name is `trigger`.
+        `/too-long`: 429 with `Retry-After: {long_retry_after}`.
+
+    Args:
+        retry_after (float): Seconds asked by the 429 responses.
+        throttled (int): 429 responses of every `/retry-after/` route.
+        limit (int): Calls per window of the `/window/` routes.
+        window (float): Seconds of a window of the `/window/` routes.
+        long_retry_after (float): Seconds asked by `/too-long`.
+    """
+
+    def __init__(
+        self,
+        retry_after: float = 0.2,
+        throttled: int = 2,
+        limit: int = 5,
+        window: float = 0.5,
+        long_retry_after: float = 120.0,
+    ):
+        self.retry_after = retry_after
+        self.throttled = throttled
+        self.limit = limit
+        self.window = window
+        self.long_retry_after = long_retry_after
+
+        self.requests = 0
+        self.violations = 0
+        self._lock = threading.Lock()
+        self._calls: Dict[str, int] = {}
+        # route -> (start of the current window, calls in it)
+        self._windows: Dict[str, Tuple[float, int]] = {}
+
+        handler = type("Handler", (_Handler,), {"platform": self})
+        self._server = _Server(("127.0.0.1", 0), handler)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "PlatformServer":
+        threading.Thread(target=self._server.serve_forever, name="platform-server", daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def handle(self, path: str) -> Tuple[int, Dict[str, str]]:
+        """Returns the status and headers answering a request"""
+        with self._lock:
+            self.requests += 1
+            calls = self._calls[path] = self._calls.get(path, 0) + 1
+
+            if path.startswith("/retry-after/"):
+                if calls <= self.throttled:
+                    return 429, {"Retry-After": str(self.retry_after)}
+                return 200, {}
+
+            if path.startswith("/window/"):
+                now = time.monotonic()
+                started, used = self._windows.get(path, (now, 0))
+                if now - started >= self.window:
+                    started, used = now, 0
+                reset_after = f"{max(0.0, started + self.window - now):.3f}"
+                if used >= self.limit:
+                    self.violations += 1
+                    return 429, {"Retry-After": reset_after}
+                self._windows[path] = (started, used + 1)
+                return 200, {
+                    "X-RateLimit-Limit": str(self.limit),
+                    "X-RateLimit-Remaining": str(self.limit - used - 1),
+                    "X-RateLimit-Reset-After": reset_after,
+                }
+
+            if path.startswith("/global/"):
+                if path == "/global/trigger":
+                    return 429, {"Retry-After": str(self.retry_after), "X-RateLimit-Scope": "global"}
+                return 200, {}
+
+            if path == "/too-long":
+                return 429, {"Retry-After": str(self.long_retry_after)}
+
+        return 404, {}
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    platform: PlatformServer
+
+    def do_GET(self):
+        status, headers = self.platform.handle(self.path)
+        payload = json.dumps({"ok": status == 200}).encode("utf-8")
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: Any):
+        pass
+
+
+def retry_after(server: PlatformServer, transport: RateLimitedTransport, args) -> Dict[str, Any]:
+    statuses = [transport.request("get", f"{server.url}/retry-after/{i}").status_code for i in range(args.routes)]
+    return {
+        "statuses": statuses,
+        "checks": {
+            "succeeded": all(status == 200 for status in statuses),
+            # every route waited its retry_after after each of its 429s
+            "waited": transport.stats()["waited_seconds"] >= args.routes * server.throttled * server.retry_after * 0.9,
+            "throttled": transport.stats()["throttled"] == args.routes * server.throttled,
+        },
+    }
+
+
+def window(server: PlatformServer, transport: RateLimitedTransport, args) -> Dict[str, Any]:
+    calls = server.limit * args.windows
+    statuses = [transport.request("get", f"{server.url}/window/messages").status_code for _ in range(calls)]
+    return {
+        "statuses": statuses,
+        "checks": {
+            "succeeded": all(status == 200 for status in statuses),
+            # Remaining: 0 was followed, the platform never had to refuse a call
+            "no_violations": server.violations == 0,
+        },
+    }
+
+
+def global_scope(server: PlatformServer, transport: RateLimitedTransport, args) -> Dict[str, Any]:
+    # the other route is known to the transport before the global 429
+    transport.request("get", f"{server.url}/global/other")
+    triggered = transport.request("get", f"{server.url}/global/trigger")
+    started = time.monotonic()
+    other = transport.request("get", f"{server.url}/global/other")
+    held = time.monotonic() - started
+    return {
+        "statuses": [triggered.status_code, other.status_code],
+        "held_seconds": held,
+        "checks": {
+            "trigger_gave_up": triggered.status_code == 429,
+            "other_route_held": other.status_code == 200 and held >= server.retry_after * 0.9,
+        },
+    }
+
+
+def max_wait(server: PlatformServer, transport: RateLimitedTransport, args) -> Dict[str, Any]:
+    started = time.monotonic()
+    response = transport.request("get", f"{server.url}/too-long")
+    returned_in = time.monotonic() - started
+    return {
+        "statuses": [response.status_code],
+        "returned_in_seconds": returned_in,
+        "checks": {
+            "gave_up": response.status_code == 429,
+            "not_waited": returned_in < 1.0,
+            "single_call": transport.stats()["requests"] == 1,
+        },
+    }
+
+
+# scenario -> (function, RateLimitedTransport arguments)
+SCENARIOS: Dict[str, Tuple[Callable[..., Dict[str, Any]], Dict[str, Any]]] = {
+    "retry_after": (retry_after, {"rate": 100.0}),
+    "window": (window, {"rate": 100.0}),
+    # no retry, so the trigger call returns its 429 once every route is held
+    "global": (global_scope, {"rate": 100.0, "global_rate": 100.0, "max_retries": 0}),
+    "max_wait": (max_wait, {"rate": 100.0, "max_wait": 10.0}),
+}
+
+
+def main(argv: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--routes", type=int, default=3, help="routes of the retry_after scenario")
+    parser.add_argument("--windows", type=int, default=3, help="windows used up by the window scenario")
+    parser.add_argument("--output", default=None, help="JSON file to write (default: stdout)")
+    args = parser.parse_args(argv)
+
+    results: List[Dict[str, Any]] = []
+    http = HTTPTransport()
+    for name in args.scenarios:
+        run, options = SCENARIOS[name]
+        # a fresh server and transport, so the limits of a scenario do not carry over
+        with PlatformServer() as server:
+            transport = RateLimitedTransport(transport=http, **options)
+            started = time.monotonic()
+            # the SDK logs every 429 - keep that out of the report
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                result = run(server, transport, args)
+            result.update({
+                "scenario": name,
+                "elapsed_seconds": time.monotonic() - started,
+                "server_requests": server.requests,
+                "stats": transport.stats(),
+            })
+        results.append(result)
+        failed = [check for check, ok in result["checks"].items() if not ok]
+        print(
+            f"{name:<12} {result['elapsed_seconds']:6.2f}s  {server.requests:4d} requests  "
+            f"{'FAILED: ' + ', '.join(failed) if failed else 'ok'}",
+            file=sys.stderr,
+        )
+    http.close()
+
+    output = json.dumps({"args": vars(args), "results": results}, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+    if any(not ok for result in results for ok in result["checks"].values()):
+        sys.exit(1)
+    return {"results": results}
+
+
+if __name__ == "__main__":
+    main()
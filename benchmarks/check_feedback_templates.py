@@ -0,0 +1,107 @@
+"""
+Renders the feedback messages of the hosted platform clients with sample responses.
+
+For every function of DiscordClient, TelegramClient and FarcasterClient, the success
+and error feedback templates are rendered with a response holding a value at every
+path they use (`{{response.casts.[0].text}}`, sections, list lengths), and once more
+with an empty response to check that sections are left out. The run fails if a
+placeholder or section tag is left in a rendered message.
+
+Usage:
+    python benchmarks/check_feedback_templates.py
+"""
+import argparse
+import json
+import sys
+from typing import Any, Dict, List, Optional, Sequence
+
+from game_sdk.hosted_game.functions.discord import DiscordClient
+from game_sdk.hosted_game.functions.farcaster import FarcasterClient
+from game_sdk.hosted_game.functions.telegram import TelegramClient
+from game_sdk.hosted_game.templates import compile_template
+
+
+def _set_path(root: Dict[str, Any], keys: List[str], value: Any):
+    """Sets `value` at a path of `root`, creating the dicts and lists on the way"""
+    container: Any = root
+    for key, next_key in zip(keys, keys[1:] + [None]):
+        if next_key == "length":
+            # the length of a list is computed from its items
+            return
+        child: Any = [] if next_key is not None and next_key.isdigit() else {}
+        if isinstance(container, list):
+            index = int(key)
+            container.extend({} for _ in range(index + 1 - len(container)))
+            if not container[index]:
+                container[index] = value if next_key is None else child
+            container = container[index]
+        else:
+            if next_key is None:
+                container.setdefault(key, value)
+            else:
+                container.setdefault(key, child)
+            container = container[key]
+
+
+def sample_values(template: str, args: Sequence[str]) -> Dict[str, Any]:
+    """Returns values holding a sample for every placeholder of `template`"""
+    values: Dict[str, Any] = {name: f"<{name}>" for name in args}
+    response: Dict[str, Any] = {}
+    # deepest paths first, so a section path gets the container of the values under it
+    for placeholder in sorted(compile_template(template).placeholders, key=lambda p: -p.count(".")):
+        keys = [key.strip("[]") for key in placeholder.split(".")]
+        if keys[0] == "response":
+            _set_path(response, keys[1:], f"<{placeholder}>")
+    values["response"] = response
+    return values
+
+
+def check(client_name: str, client: Any) -> List[Dict[str, Any]]:
+    results = []
+    for fn_name, function in client._functions.items():
+        args = [arg.name for arg in function.args]
+        for kind in ("success_feedback", "error_feedback"):
+            template = getattr(function.config, kind)
+            if not template:
+                continue
+            full = function._interpolate_template(template, sample_values(template, args))
+            empty = function._interpolate_template(template, {"response": {}, **{name: "x" for name in args}})
+            section_tags = [p for p in compile_template(template).placeholders if "{{#" + p in template]
+            results.append({
+                "function": f"{client_name}.{fn_name}",
+                "feedback": kind,
+                "rendered": full,
+                "ok": "{{" not in full and not any("{{#" + tag in empty or "{{/" + tag in empty for tag in section_tags),
+            })
+    return results
+
+
+def main(argv: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", default=None, help="JSON file to write (default: stdout)")
+    args = parser.parse_args(argv)
+
+    clients = {
+        "discord": DiscordClient("bot-token"),
+        "telegram": TelegramClient("123456:bot-token"),
+        "farcaster": FarcasterClient("api-key", "signer-uuid"),
+    }
+    results = [result for name, client in clients.items() for result in check(name, client)]
+    failed = [result for result in results if not result["ok"]]
+    for result in failed:
+        print(f"FAILED {result['function']} {result['feedback']}: {result['rendered']}", file=sys.stderr)
+    print(f"{len(results) - len(failed)}/{len(results)} feedback templates rendered", file=sys.stderr)
+
+    output = json.dumps({"results": results}, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+    if failed:
+        sys.exit(1)
+    return {"results": results}
+
+
+if __name__ == "__main__":
+    main()
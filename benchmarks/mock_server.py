@@ -0,0 +1,257 @@
+"""
+Local stand-in for the GAME API, used by the benchmarks.
+
+Serves the v1 routes (`/api/accesses/tokens` and the `/prompts` proxy) and the v2 routes
+(`/v2/agents`, `/v2/maps`, `/v2/agents/{id}/actions`, `/v2/agents/{id}/tasks/...`,
+`/v2/conversation/...`) with canned responses: every action request selects the first
+function of the payload, every chat message calls the first function of the chat.
+Payloads encoded by a PayloadEncoder are rebuilt with a PayloadDecoder, so HASH and
+DELTA modes are checked end to end.
+"""
+import base64
+import itertools
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+
+from game_sdk.game.payload_encoding import PayloadDecoder
+from game_sdk.game.transport import HTTPTransport
+
+# public hosts of the GAME API, in the order they are matched
+GAME_HOSTS = (
+    "https://sdk.game.virtuals.io",
+    "https://game.virtuals.io",
+    "https://api.virtuals.io",
+)
+
+AGENT_STATE = {
+    "hlp": {
+        "plan_id": "plan-0",
+        "observation_reflection": "Nothing unexpected happened.",
+        "plan": ["Call the first function", "Repeat"],
+        "plan_reasoning": "The benchmark only measures SDK overhead.",
+        "current_state_of_execution": "Executing the plan",
+        "change_indicator": None,
+        "log": [],
+    },
+    "current_task": {
+        "task": "Benchmark task",
+        "task_reasoning": "Canned by the mock server",
+        "location_id": "*not provided*",
+        "llp": {
+            "plan_id": "llp-0",
+            "plan_reasoning": "Call the first function",
+            "situation_analysis": "Nothing to analyse",
+            "plan": ["Call the first function"],
+            "change_indicator": None,
+            "reflection": None,
+        },
+    },
+}
+
+
+def _make_access_token(ttl: float) -> str:
+    """Returns an unsigned JWT whose `exp` claim is `ttl` seconds from now"""
+
+    def encode(part: Dict[str, Any]) -> str:
+        return base64.urlsafe_b64encode(json.dumps(part).encode()).decode().rstrip("=")
+
+    return ".".join([
+        encode({"alg": "none", "typ": "JWT"}),
+        encode({"exp": int(time.time() + ttl)}),
+        "mock",
+    ])
+
+
+def _function_call(functions: Any, call_id: str) -> Optional[Dict[str, Any]]:
+    """Returns the call of the first function of a payload, with a value for every argument"""
+    if not functions:
+        return None
+    fn = functions[0]
+    return {
+        "fn_name": fn["fn_name"],
+        "fn_id": call_id,
+        "args": {
+            arg["name"]: {"value": f"mock {arg['name']}"} for arg in fn.get("args", [])
+        },
+    }
+
+
+class MockGameServer:
+    """
+    Threaded HTTP server answering GAME API requests with canned payloads.
+
+    Args:
+        host (str): Interface to listen on.
+        port (int): Port to listen on, 0 picks a free one.
+        latency (float): Seconds every response is delayed by, to simulate the network
+            and the model (0 measures the SDK overhead only).
+        token_ttl (float): Lifetime of the v1 access tokens in seconds.
+
+    Example:
+        ```python
+        with MockGameServer() as server:
+            agent = Agent(..., transport=server.transport())
+        ```
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0, token_ttl: float = 3600):
+        self.latency = latency
+        self.token_ttl = token_ttl
+
+        self.requests = 0
+        self.decode_errors = 0
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._decoder = PayloadDecoder()
+
+        handler = type("Handler", (_Handler,), {"mock": self})
+        self._server = _Server((host, port), handler)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockGameServer":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="mock-game-server", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "MockGameServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def transport(self, **kwargs: Any) -> "RedirectTransport":
+        """Returns a transport sending the GAME API requests of a client to this server"""
+        return RedirectTransport(self.url, **kwargs)
+
+    def _next_id(self, prefix: str) -> str:
+        with self._lock:
+            return f"{prefix}-{next(self._ids)}"
+
+    def _decode(self, stream_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            with self._lock:
+                return self._decoder.decode(stream_id, data)
+        except ValueError:
+            with self._lock:
+                self.decode_errors += 1
+            raise
+
+    def handle(self, path: str, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """Returns the status and JSON body answering a request"""
+        with self._lock:
+            self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        if path == "/api/accesses/tokens":
+            return 200, {"data": {"accessToken": _make_access_token(self.token_ttl)}}
+
+        if path == "/prompts":
+            # v1 proxy: the v2 route and payload are wrapped in the request body
+            proxied = body["data"]
+            return self._route(proxied["route"], proxied.get("data") or {})
+
+        return self._route(path, body.get("data") or {})
+
+    def _route(self, route: str, data: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        parts = route.strip("/").split("/")
+        if parts[:1] == ["v2"]:
+            parts = parts[1:]
+
+        try:
+            if parts == ["agents"]:
+                return 200, {"data": {"id": self._next_id("agent")}}
+            if parts == ["maps"]:
+                return 200, {"data": {"id": self._next_id("map")}}
+            if len(parts) == 3 and parts[0] == "agents" and parts[2] == "tasks":
+                return 200, {"data": {"submission_id": self._next_id("submission")}}
+            if len(parts) == 5 and parts[0] == "agents" and parts[4] == "next":
+                return 200, {"data": self._action(parts[1], data)}
+            if len(parts) == 3 and parts[0] == "agents" and parts[2] == "actions":
+                return 200, {"data": self._action(parts[1], data)}
+            if parts == ["conversation"]:
+                return 200, {"data": {"conversation_id": self._next_id("conversation")}}
+            if len(parts) == 3 and parts[0] == "conversation" and parts[2] == "next":
+                call = _function_call(data.get("functions"), self._next_id("call"))
+                return 200, {"data": {
+                    "message": None if call else "Mock reply",
+                    "is_finished": False,
+                    "function_call": call and {
+                        "fn_name": call["fn_name"],
+                        "args": call["args"],
+                        "id": call["fn_id"],
+                    },
+                }}
+            if len(parts) == 4 and parts[0] == "conversation" and parts[2:] == ["function", "result"]:
+                return 200, {"data": {"message": "Mock reply after the function call"}}
+            if len(parts) == 3 and parts[0] == "conversation" and parts[2] == "end":
+                return 200, {"data": {}}
+        except ValueError as e:
+            return 400, {"error": str(e)}
+
+        return 404, {"error": f"Unknown route: {route}"}
+
+    def _action(self, agent_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        data = self._decode(agent_id, data)
+        call = _function_call(data.get("functions"), self._next_id("action"))
+        if call is None:
+            return {"action_type": "wait", "agent_state": AGENT_STATE, "action_args": None}
+        return {"action_type": "call_function", "agent_state": AGENT_STATE, "action_args": call}
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # many agents connect at once when the benchmark starts
+    request_queue_size = 1024
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the GAME API
+    # headers and body are written separately - without this, delayed ACKs add ~40ms per request
+    disable_nagle_algorithm = True
+    mock: MockGameServer
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}")
+
+        status, response = self.mock.handle(self.path, body)
+
+        payload = json.dumps(response).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: Any):
+        pass
+
+
+class RedirectTransport(HTTPTransport):
+    """HTTPTransport that sends the requests for the GAME API hosts to `base_url` instead"""
+
+    def __init__(self, base_url: str, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.base_url = base_url.rstrip("/")
+
+    def request(self, method: str, url: str, **kwargs: Any):
+        for host in GAME_HOSTS:
+            if url.startswith(host):
+                url = self.base_url + url[len(host):]
+                break
+        return super().request(method, url, **kwargs)
@@ -0,0 +1,283 @@
+"""
+Measures the overhead of the GAME SDK against a local mock of the GAME API.
+
+For every number of concurrent agents, runs the Agent.step, Worker.step and Chat.next
+loops and reports their throughput and latency percentiles, the cost of building and
+serializing an action request, and the memory held per agent. Results are written as
+JSON so they can be compared across commits.
+
+Usage:
+    python benchmarks/run_benchmarks.py --agents 1 10 100 1000 --output results.json
+"""
+import argparse
+import contextlib
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from game_sdk.game.agent import Agent, Session, WorkerConfig
+from game_sdk.game.chat_agent import Chat, ChatAgent
+from game_sdk.game.custom_types import Argument, Function, FunctionResultStatus
+from game_sdk.game.payload_encoding import PayloadEncoder, PayloadMode
+from game_sdk.game.serialization import dumps_bytes
+from game_sdk.game.worker import Worker
+
+from mock_server import MockGameServer
+
+SCENARIOS = ("agent_step", "worker_step", "chat_next")
+
+API_KEYS = {
+    "v1": "benchmark-key",
+    "v2": "apt-benchmark-key",
+}
+
+
+def _executable(**kwargs):
+    return FunctionResultStatus.DONE, "Done", {"args": kwargs}
+
+
+def make_action_space(num_functions: int) -> List[Function]:
+    return [
+        Function(
+            fn_name=f"function_{i}",
+            fn_description=f"Benchmark function number {i}, which does nothing useful.",
+            args=[
+                Argument(name="query", type="string", description="What to look for"),
+                Argument(name="limit", type="integer", description="Maximum number of results", optional=True),
+                Argument(name="reason", type="string", description="Why the function is called"),
+            ],
+            hint="Call it whenever you like.",
+            executable=_executable,
+        )
+        for i in range(num_functions)
+    ]
+
+
+def make_state_fn(state_size: int) -> Callable[..., Dict[str, Any]]:
+    """Returns a state function whose state has `state_size` keys, one changing every step"""
+
+    def get_state(function_result, current_state):
+        if current_state is None:
+            current_state = {f"key_{i}": f"value {i} " * 4 for i in range(state_size)}
+        return dict(current_state, step=current_state.get("step", 0) + 1)
+
+    return get_state
+
+
+def make_agent(api_key: str, transport, args, encoder: Optional[PayloadEncoder]) -> Agent:
+    state_fn = make_state_fn(args.state_size)
+    workers = [
+        WorkerConfig(
+            id=f"worker_{i}",
+            worker_description=f"Benchmark worker number {i}",
+            get_state_fn=state_fn,
+            action_space=make_action_space(args.functions),
+        )
+        for i in range(2)
+    ]
+    agent = Agent(
+        api_key=api_key,
+        name="Benchmark Agent",
+        agent_goal="Measure the SDK overhead",
+        agent_description="An agent that calls the first function it is given",
+        get_agent_state_fn=state_fn,
+        workers=workers,
+        transport=transport,
+        payload_encoder=encoder,
+    )
+    agent.compile()
+    agent._session = Session()
+    return agent
+
+
+def make_worker(api_key: str, transport, args, encoder: Optional[PayloadEncoder]) -> Worker:
+    worker = Worker(
+        api_key=api_key,
+        description="A worker that calls the first function it is given",
+        get_state_fn=make_state_fn(args.state_size),
+        action_space=make_action_space(args.functions),
+        transport=transport,
+        payload_encoder=encoder,
+    )
+    worker.set_task("Measure the SDK overhead")
+    return worker
+
+
+def make_chat(api_key: str, transport, args, encoder: Optional[PayloadEncoder]) -> Chat:
+    chat_agent = ChatAgent(api_key, "You are a benchmark.", transport=transport)
+    state_fn = make_state_fn(args.state_size)
+    return chat_agent.create_chat(
+        partner_id="benchmark",
+        partner_name="Benchmark",
+        action_space=make_action_space(args.functions),
+        get_state_fn=lambda: state_fn(None, None),
+    )
+
+
+FACTORIES = {
+    "agent_step": (make_agent, lambda agent: agent.step()),
+    "worker_step": (make_worker, lambda worker: worker.step()),
+    "chat_next": (make_chat, lambda chat: chat.next("Hello")),
+}
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile of sorted values"""
+    index = max(0, min(len(sorted_values) - 1, round(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize_latencies(latencies: List[float]) -> Dict[str, float]:
+    latencies = sorted(latencies)
+    return {
+        "mean_ms": statistics.mean(latencies) * 1000,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "max_ms": latencies[-1] * 1000,
+    }
+
+
+def build_targets(scenario: str, count: int, api_key: str, server: MockGameServer, args, encoder):
+    """Creates `count` agents, workers or chats and returns them with the memory they hold"""
+    factory, _ = FACTORIES[scenario]
+    transport = server.transport(pool_maxsize=min(count, args.threads))
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    with ThreadPoolExecutor(max_workers=min(count, args.threads)) as pool:
+        targets = list(pool.map(lambda _: factory(api_key, transport, args, encoder), range(count)))
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    return targets, transport, held
+
+
+def run_scenario(scenario: str, count: int, api: str, server: MockGameServer, args) -> Dict[str, Any]:
+    encoder = PayloadEncoder(args.payload_mode) if scenario != "chat_next" else None
+    targets, transport, held = build_targets(scenario, count, API_KEYS[api], server, args, encoder)
+    _, step = FACTORIES[scenario]
+
+    def loop(target) -> List[float]:
+        latencies = []
+        for _ in range(args.steps):
+            started = time.perf_counter()
+            step(target)
+            latencies.append(time.perf_counter() - started)
+        return latencies
+
+    requests_before = server.requests
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=min(count, args.threads)) as pool:
+        latencies = [lat for result in pool.map(loop, targets) for lat in result]
+    wall = time.perf_counter() - started
+    transport.close()
+
+    result = {
+        "scenario": scenario,
+        "api": api,
+        "agents": count,
+        "threads": min(count, args.threads),
+        "steps": len(latencies),
+        "wall_seconds": wall,
+        "steps_per_second": len(latencies) / wall,
+        "requests": server.requests - requests_before,
+        "memory_bytes_per_agent": held / count,
+        **summarize_latencies(latencies),
+    }
+    if encoder is not None:
+        result["payload_encoding"] = encoder.stats()
+    return result
+
+
+def measure_serialization(api: str, server: MockGameServer, args) -> Dict[str, Any]:
+    """Measures building and serializing one action request, without the network"""
+    transport = server.transport()
+    agent = make_agent(API_KEYS[api], transport, args, None)
+    worker = make_worker(API_KEYS[api], transport, args, None)
+    transport.close()
+
+    results = {}
+    for name, target in (("agent", agent), ("worker", worker)):
+        timings = []
+        size = 0
+        for _ in range(args.serialization_iterations):
+            started = time.perf_counter()
+            body = dumps_bytes({"data": target._build_action_data(None)})
+            timings.append(time.perf_counter() - started)
+            size = len(body)
+        results[name] = {"payload_bytes": size, **summarize_latencies(timings)}
+    return results
+
+
+def main(argv: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--agents", type=int, nargs="+", default=[1, 10, 100, 1000],
+                        help="numbers of concurrent agents to measure")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--api", nargs="+", choices=sorted(API_KEYS), default=["v2"],
+                        help="API versions to measure (v1 goes through the /prompts proxy)")
+    parser.add_argument("--steps", type=int, default=20, help="steps per agent")
+    parser.add_argument("--threads", type=int, default=64,
+                        help="maximum number of threads stepping the agents")
+    parser.add_argument("--functions", type=int, default=10, help="functions per action space")
+    parser.add_argument("--state-size", type=int, default=50, help="keys per agent/worker state")
+    parser.add_argument("--payload-mode", choices=[m.value for m in PayloadMode], default=PayloadMode.FULL.value)
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="seconds the mock server waits before answering")
+    parser.add_argument("--serialization-iterations", type=int, default=1000)
+    parser.add_argument("--output", default=None, help="JSON file to write (default: stdout)")
+    args = parser.parse_args(argv)
+
+    report: Dict[str, Any] = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "args": vars(args),
+        },
+        "results": [],
+        "serialization": {},
+    }
+
+    with MockGameServer(latency=args.latency) as server:
+        # the SDK prints every step - keep that out of the measurements
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            for api in args.api:
+                report["serialization"][api] = measure_serialization(api, server, args)
+                for scenario in args.scenarios:
+                    if scenario == "chat_next" and api == "v1":
+                        continue  # ChatAgent requires a V2 API key
+                    for count in args.agents:
+                        result = run_scenario(scenario, count, api, server, args)
+                        report["results"].append(result)
+                        print(
+                            f"{api} {scenario:<12} agents={count:<5} "
+                            f"{result['steps_per_second']:9.1f} steps/s  "
+                            f"p50={result['p50_ms']:7.2f}ms  p99={result['p99_ms']:7.2f}ms  "
+                            f"mem/agent={result['memory_bytes_per_agent'] / 1024:7.1f}KiB",
+                            file=sys.stderr,
+                        )
+        report["meta"]["decode_errors"] = server.decode_errors
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
-import asyncio
 import json
 from typing import Dict, List, Optional, Tuple
 from game_sdk.game.custom_types import Argument, Function, FunctionResultStatus
+from game_sdk.game.execution import run_coroutine_sync
 from allora_sdk.v2.api_client import (
     AlloraAPIClient,
     ChainSlug,
@@ -58,7 +58,7 @@ class AlloraPlugin:
                 fn_description="Get all the topics available on Allora Network.",
                 args=[],
                 hint="This function is used to get all the topics available on Allora Network.",
-                executable=self.get_all_topics,
+                executable=self.aget_all_topics,
             ),
             "get_inference_by_topic_id": Function(
                 fn_name="get_inference_by_topic_id",
@@ -71,7 +71,7 @@ class AlloraPlugin:
                     )
                 ],
                 hint="This function is used to get the inference by topic id. For obtaining the topic id associated to a certain inference/price inference, use the get_all_topics function.",
-                executable=self.get_inference_by_topic_id,
+                executable=self.aget_inference_by_topic_id,
             ),
             "get_price_inference": Function(
                 fn_name="get_price_inference",
@@ -89,7 +89,7 @@ class AlloraPlugin:
                     ),
                 ],
                 hint="This function is used to get the price inference for a given crypto asset and timeframe.",
-                executable=self.get_price_inference,
+                executable=self.aget_price_inference,
             ),
         }
 
@@ -118,13 +118,29 @@ class AlloraPlugin:
         return self._functions[fn_name]
 
     def get_all_topics(self, **kwargs) -> Tuple[FunctionResultStatus, str, dict]:
+        """Synchronous wrapper of `aget_all_topics`, run on the background event loop of the SDK."""
+        return run_coroutine_sync(self.aget_all_topics(**kwargs))
+
+    def get_inference_by_topic_id(
+        self, topic_id: int, **kwargs
+    ) -> Tuple[FunctionResultStatus, str, dict]:
+        """Synchronous wrapper of `aget_inference_by_topic_id`, run on the background event loop of the SDK."""
+        return run_coroutine_sync(self.aget_inference_by_topic_id(topic_id, **kwargs))
+
+    def get_price_inference(
+        self, asset: PriceInferenceToken, timeframe: PriceInferenceTimeframe, **kwargs
+    ) -> Tuple[FunctionResultStatus, str, dict]:
+        """Synchronous wrapper of `aget_price_inference`, run on the background event loop of the SDK."""
+        return run_coroutine_sync(self.aget_price_inference(asset, timeframe, **kwargs))
+
+    async def aget_all_topics(self, **kwargs) -> Tuple[FunctionResultStatus, str, dict]:
         """Get all topics available on Allora Network.
 
         Returns:
             Tuple[FunctionResultStatus, str, dict]: The status of the function, the feedback message, and the dictionary with the topics retrieved.
         """
         try:
-            topics = asyncio.run(self.allora_api_client.get_all_topics())
+            topics = await self.allora_api_client.get_all_topics()
             topics_dict = [topic.__dict__ for topic in topics]
             topics_json = json.dumps(topics_dict, indent=4)
             return (
@@ -141,7 +157,7 @@ class AlloraPlugin:
                 {},
             )
 
-    def get_inference_by_topic_id(
+    async def aget_inference_by_topic_id(
         self, topic_id: int, **kwargs
     ) -> Tuple[FunctionResultStatus, str, dict]:
         """Get inference by topic id.
@@ -150,8 +166,8 @@ class AlloraPlugin:
             Tuple[FunctionResultStatus, str, dict]: The status of the function, the feedback message, and the dictionary with the inference details.
         """
         try:
-            inference_res = asyncio.run(
-                self.allora_api_client.get_inference_by_topic_id(topic_id)
+            inference_res = await self.allora_api_client.get_inference_by_topic_id(
+                topic_id
             )
             normalized_inference = (
                 inference_res.inference_data.network_inference_normalized
@@ -173,7 +189,7 @@ class AlloraPlugin:
                 },
             )
 
-    def get_price_inference(
+    async def aget_price_inference(
         self, asset: PriceInferenceToken, timeframe: PriceInferenceTimeframe, **kwargs
     ) -> Tuple[FunctionResultStatus, str, dict]:
         """Get price inference of a given asset for a given timeframe.
@@ -221,11 +237,9 @@ class AlloraPlugin:
             timeframe_enum_key = timeframe_enum_key[0]
 
         try:
-            price_inference = asyncio.run(
-                self.allora_api_client.get_price_inference(
-                    PriceInferenceToken[asset_enum_key],
-                    PriceInferenceTimeframe[timeframe_enum_key],
-                )
+            price_inference = await self.allora_api_client.get_price_inference(
+                PriceInferenceToken[asset_enum_key],
+                PriceInferenceTimeframe[timeframe_enum_key],
             )
             normalized_price_inference = (
                 price_inference.inference_data.network_inference_normalized
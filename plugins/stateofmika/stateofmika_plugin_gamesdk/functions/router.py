@@ -1,6 +1,6 @@
-import asyncio
 from typing import Dict, Any, Tuple
 from game_sdk.game.custom_types import Function, Argument, FunctionResultStatus
+from game_sdk.game.execution import run_coroutine_sync
 import aiohttp
 
 
@@ -62,10 +62,11 @@ class SOMRouter:
         """
         Synchronous wrapper for the asynchronous _execute_query_async function.
 
-        Ensures the function can be called synchronously.
+        Ensures the function can be called synchronously. The query runs on the
+        background event loop of the SDK, so no loop is created per call.
         """
         try:
-            return asyncio.run(self._execute_query_async(query))
+            return run_coroutine_sync(self._execute_query_async(query))
         except Exception as e:
             return (
                 FunctionResultStatus.FAILED,
@@ -85,5 +86,5 @@ class SOMRouter:
                 ),
             ],
             hint="This function is used to route a natural language query to appropriate tools and process responses.",
-            executable=self._execute_query,
+            executable=self._execute_query_async,
         )
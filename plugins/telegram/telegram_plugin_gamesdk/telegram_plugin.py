@@ -2,19 +2,21 @@ import asyncio
 from typing import List, Union
 from telegram import Bot
 from telegram.ext import ApplicationBuilder
+from game_sdk.game.execution import run_coroutine_sync
 
 
 def _run_async(coro):
     """
     Runs an async function safely.
     - If an event loop is running, it schedules the coroutine with `asyncio.create_task()`.
-    - Otherwise, it starts a new event loop with `asyncio.run()`.
+    - Otherwise, it runs it on the long-lived background event loop of the SDK and waits
+      for the result (instead of starting a new event loop for every call).
     """
     try:
-        loop = asyncio.get_running_loop()
+        asyncio.get_running_loop()
         return asyncio.create_task(coro)
     except RuntimeError:
-        return asyncio.run(coro)
+        return run_coroutine_sync(coro)
 
 
 class TelegramPlugin:
@@ -1,9 +1,19 @@
-from typing import List, Optional, Callable, Dict
+from typing import Any, List, Optional, Callable, Dict, Tuple
 import uuid
 from game_sdk.game.worker import Worker
-from game_sdk.game.custom_types import Function, FunctionResult, FunctionResultStatus, ActionResponse, ActionType
+from game_sdk.game.custom_types import Function, FunctionResult, FunctionResultStatus, ActionResponse, ActionType, get_function_defs_json
 from game_sdk.game.api import GAMEClient
 from game_sdk.game.api_v2 import GAMEClientV2
+from game_sdk.game.transport import Transport
+from game_sdk.game.payload_encoding import PayloadEncoder
+from game_sdk.game.tracing import Tracer, get_tracer
+from game_sdk.game.sessions import AgentSnapshot, SessionStore, agent_config_hash, workers_config_hash
+from game_sdk.game.id_cache import RemoteIdCache
+from game_sdk.game.execution import in_thread_pool, submit_to_thread_pool
+from game_sdk.game.memory import MemoryBudget, json_size
+from game_sdk.log import get_logger, log_fields
+
+logger = get_logger(__name__)
 
 class Session:
     """
@@ -91,6 +101,28 @@ class Agent:
         agent_goal (str): High-level goal or purpose of the agent.
         agent_description (str): Detailed description of the agent's capabilities.
         get_agent_state_fn (Callable): Function to retrieve agent's current state.
+        workers (Optional[List[WorkerConfig]]): Workers available to the agent.
+        model_name (str): Name of the model used by the GAME API.
+        transport (Optional[Transport]): Transport to use for API calls (e.g. a sized
+            HTTPTransport or a ResilientTransport).
+            Defaults to the process-wide shared transport.
+        payload_encoder (Optional[PayloadEncoder]): Encoder applied to action request
+            payloads (e.g. to send only state deltas to a backend that supports it).
+        tracer (Optional[Tracer]): Tracer recording the spans of every step.
+            Defaults to the process-wide tracer (disabled unless configured).
+        session_store (Optional[SessionStore]): Store the agent is snapshotted to after
+            `compile()` and every step. An agent whose snapshot was saved with the same
+            name, description, goal and API key is resumed from it instead of being
+            created again, and `compile()` reuses its workers if they did not change.
+        session_key (Optional[str]): Key of the agent snapshot, defaults to the agent name.
+        id_cache (Optional[RemoteIdCache]): Cache of remote agent and worker map ids by
+            configuration, so an agent (or its workers) constructed with the same
+            configuration again reuses them instead of creating new ones.
+        concurrent_state (bool): After a function call, run the state function of the
+            current worker and the agent state function concurrently instead of one
+            after the other (they must not depend on each other).
+        memory_budget (Optional[MemoryBudget]): Limits on the size of the agent and
+            worker states and of function result infos, for long-running agents.
 
     The Agent class serves as the primary interface for:
     - Managing worker configurations
@@ -106,14 +138,27 @@ class Agent:
                  get_agent_state_fn: Callable,
                  workers: Optional[List[WorkerConfig]] = None,
                  model_name: str = "Llama-3.3-70B-Instruct",
+                 transport: Optional[Transport] = None,
+                 payload_encoder: Optional[PayloadEncoder] = None,
+                 tracer: Optional[Tracer] = None,
+                 session_store: Optional[SessionStore] = None,
+                 session_key: Optional[str] = None,
+                 id_cache: Optional[RemoteIdCache] = None,
+                 concurrent_state: bool = False,
+                 memory_budget: Optional[MemoryBudget] = None,
                  ):
 
-        if api_key.startswith("apt-"):
-            self.client = GAMEClientV2(api_key)
-        else:
-            self.client = GAMEClient(api_key)
+        self.client = self._create_client(api_key, transport)
 
         self._api_key: str = api_key
+        self._transport: Optional[Transport] = transport
+        self._payload_encoder: Optional[PayloadEncoder] = payload_encoder
+        self._tracer: Optional[Tracer] = tracer
+        self._session_store: Optional[SessionStore] = session_store
+        self._session_key: str = session_key or name
+        self._id_cache: Optional[RemoteIdCache] = id_cache
+        self._concurrent_state: bool = concurrent_state
+        self._memory_budget: Optional[MemoryBudget] = memory_budget
 
         self._model_name: str = model_name
 
@@ -123,6 +168,7 @@ class Agent:
 
         # initialize session
         self._session = Session()
+        self._session_restored = False
 
         self.name = name
         self.agent_goal = agent_goal
@@ -134,6 +180,10 @@ class Agent:
         else:
             self.workers = {}
         self.current_worker_id = None
+        # standalone workers built by get_worker, by worker id
+        self._standalone_workers: Dict[str, Worker] = {}
+        self._map_id: Optional[str] = None
+        self._workers_hash: Optional[str] = None
 
         # get agent/task generator state function
         self.get_agent_state_fn = get_agent_state_fn
@@ -144,20 +194,139 @@ class Agent:
         # initialize observation
         self.observation = None
 
-        # create agent
-        self.agent_id = self.client.create_agent(
-            self.name, self.agent_description, self.agent_goal
+        # resume the agent from its snapshot or create it
+        self._agent_hash = agent_config_hash(api_key, name, agent_description, agent_goal)
+        self._snapshot = self._load_snapshot()
+        if self._snapshot is not None:
+            self._restore_session(self._snapshot)
+        else:
+            self.agent_id = self._create_remote_agent()
+
+    def _create_client(self, api_key: str, transport: Optional[Transport]):
+        """Create the GAME API client matching the API key version"""
+        if api_key.startswith("apt-"):
+            return GAMEClientV2(api_key, transport=transport)
+        return GAMEClient(api_key, transport=transport)
+
+    def _create_remote_agent(self) -> Optional[str]:
+        """Create the agent instance on the GAME API (or reuse a cached one) and return its id"""
+        return self._get_or_create_remote_id(
+            f"agent:{self._agent_hash}",
+            lambda: self.client.create_agent(
+                self.name, self.agent_description, self.agent_goal
+            ),
         )
 
+    def _get_or_create_remote_id(self, fingerprint: str, create: Callable[[], str]) -> str:
+        """Look a remote id up in the id cache, if any, calling `create` when missing"""
+        if self._id_cache is None:
+            return create()
+        return self._id_cache.get_or_create(fingerprint, create)
+
     def compile(self):
         """ Compile the workers for the agent - i.e. set up task generator"""
         if not self.workers:
             raise ValueError("No workers added to the agent")
 
-        workers_list = list(self.workers.values())
+        if not self._restore_workers():
+            workers_list = list(self.workers.values())
+            self._workers_hash = workers_config_hash(self._api_key, workers_list)
+            self._map_id = self._get_or_create_remote_id(
+                f"map:{self._workers_hash}",
+                lambda: self.client.create_workers(workers_list),
+            )
+            self._init_worker_states()
+
+        self.save_session()
+
+        return self._map_id
+
+    def _load_snapshot(self) -> Optional[AgentSnapshot]:
+        """Return the stored snapshot of this agent, unless its configuration changed since"""
+        if self._session_store is None:
+            return None
+
+        snapshot = self._session_store.load(self._session_key)
+        if snapshot is None:
+            return None
+        if snapshot.agent_hash != self._agent_hash:
+            logger.info(
+                "Agent configuration changed, not resuming session %s",
+                self._session_key,
+                extra=log_fields(session_key=self._session_key, agent_id=snapshot.agent_id),
+            )
+            return None
+        return snapshot
+
+    def _restore_session(self, snapshot: AgentSnapshot):
+        """Restore the remote agent id, agent state, observation and session of a snapshot"""
+        self.agent_id = snapshot.agent_id
+        self.agent_state = snapshot.agent_state
+        self.observation = snapshot.observation
+        if snapshot.session_id is not None:
+            self._session.id = snapshot.session_id
+        if snapshot.function_result is not None:
+            self._session.function_result = FunctionResult.model_validate(snapshot.function_result)
+        self._session_restored = True
+
+        logger.info(
+            "Resumed agent %s from session %s",
+            self.agent_id,
+            self._session_key,
+            extra=log_fields(session_key=self._session_key, agent_id=self.agent_id),
+        )
+
+    def _restore_workers(self) -> bool:
+        """
+        Restore the worker map and worker states of the snapshot the agent was resumed
+        from, if the workers did not change. Returns whether they were restored.
+        """
+        snapshot, self._snapshot = self._snapshot, None
+        if snapshot is None or snapshot.map_id is None:
+            return False
+
+        workers_hash = workers_config_hash(self._api_key, self.workers.values())
+        if snapshot.workers_hash != workers_hash:
+            return False
+
+        self._map_id = snapshot.map_id
+        self._workers_hash = workers_hash
+        self.current_worker_id = snapshot.current_worker_id
+        self.worker_states = snapshot.worker_states
+        return True
+
+    def save_session(self) -> Optional[AgentSnapshot]:
+        """
+        Save a snapshot of the agent to its session store (done automatically after
+        `compile()` and every step).
 
-        self._map_id = self.client.create_workers(workers_list)
-        self.current_worker_id = next(iter(self.workers.values())).id
+        Returns:
+            Optional[AgentSnapshot]: The saved snapshot, None without a session store.
+        """
+        if self._session_store is None:
+            return None
+
+        function_result = self._session.function_result
+        snapshot = AgentSnapshot(
+            key=self._session_key,
+            agent_hash=self._agent_hash,
+            agent_id=self.agent_id,
+            workers_hash=self._workers_hash,
+            map_id=self._map_id,
+            current_worker_id=self.current_worker_id,
+            worker_states=getattr(self, "worker_states", {}),
+            agent_state=self.agent_state,
+            observation=self.observation,
+            session_id=self._session.id,
+            function_result=function_result.model_dump(mode="json") if function_result else None,
+        )
+        self._session_store.save(snapshot)
+        return snapshot
+
+    def _init_worker_states(self):
+        """Select the first worker and set up the initial state of every worker"""
+        workers_list = list(self.workers.values())
+        self.current_worker_id = workers_list[0].id
 
         # initialize and set up worker states
         worker_states = {}
@@ -173,8 +342,6 @@ class Agent:
 
         self.worker_states = worker_states
 
-        return self._map_id
-
     def reset(self):
         """ Reset the agent session"""
         self._session.reset()
@@ -182,6 +349,7 @@ class Agent:
     def add_worker(self, worker_config: WorkerConfig):
         """Add worker to worker dict for the agent"""
         self.workers[worker_config.id] = worker_config
+        self._standalone_workers.pop(worker_config.id, None)
         return self.workers
 
     def get_worker_config(self, worker_id: str):
@@ -189,6 +357,17 @@ class Agent:
         return self.workers[worker_id]
 
     def get_worker(self, worker_id: str):
+        """
+        Get a working interactable standalone worker. The worker is created on the
+        first call and returned by the next ones, until its config is replaced with
+        `add_worker`.
+        """
+        worker = self._standalone_workers.get(worker_id)
+        if worker is None:
+            worker = self._standalone_workers[worker_id] = self._create_worker(worker_id)
+        return worker
+
+    def _create_worker(self, worker_id: str) -> Worker:
         """Initialize a working interactable standalone worker"""
         worker_config = self.get_worker_config(worker_id)
         return Worker(
@@ -198,12 +377,22 @@ class Agent:
             instruction=worker_config.instruction,
             get_state_fn=worker_config.get_state_fn,
             action_space=worker_config.action_space,
+            transport=self._transport,
+            payload_encoder=self._payload_encoder,
+            tracer=self._tracer,
+            id_cache=self._id_cache,
+            memory_budget=self._memory_budget,
+            worker_id=worker_id,
         )
 
-    def _get_action(
+    def _get_tracer(self) -> Tracer:
+        return self._tracer or get_tracer()
+
+    def _build_action_data(
         self,
         function_result: Optional[FunctionResult] = None
-    ) -> ActionResponse:
+    ) -> Dict:
+        """Build the payload for the next agent action request"""
 
         # dummy function result if None is provided - for get_state_fn to take the same input all the time
         if function_result is None:
@@ -219,10 +408,9 @@ class Agent:
             "location": self.current_worker_id,
             "map_id": self._map_id,
             "environment": self.worker_states[self.current_worker_id],
-            "functions": [
-                f.get_function_def()
-                for f in self.workers[self.current_worker_id].action_space.values()
-            ],
+            "functions": get_function_defs_json(
+                self.workers[self.current_worker_id].action_space.values()
+            ),
             "events": {},
             "agent_state": self.agent_state,
             "current_action": (
@@ -233,82 +421,168 @@ class Agent:
             "version": "v2",
         }
 
-        # make API call
-        response = self.client.get_agent_action(
-            agent_id=self.agent_id,
-            data=data,
-            model_name=self._model_name
-        )
+        if self._payload_encoder is not None:
+            data = self._payload_encoder.encode(self.agent_id, data)
 
-        return ActionResponse.model_validate(response)
+        return data
 
-    def step(self):
+    def _get_action(
+        self,
+        function_result: Optional[FunctionResult] = None
+    ) -> ActionResponse:
 
-        # get next task/action from GAME API
-        action_response = self._get_action(self._session.function_result)
+        tracer = self._get_tracer()
+
+        with tracer.span("agent.build_request"):
+            data = self._build_action_data(function_result)
+
+        # make API call
+        try:
+            with tracer.span("agent.api_call", model_name=self._model_name):
+                response = self.client.get_agent_action(
+                    agent_id=self.agent_id,
+                    data=data,
+                    model_name=self._model_name,
+                    # full payloads can be resent, encoded ones refer to the previous payload
+                    idempotent=self._payload_encoder is None or self._payload_encoder.idempotent,
+                )
+        except Exception:
+            # the backend may not have seen this payload - next one is sent in full
+            if self._payload_encoder is not None:
+                self._payload_encoder.reset(self.agent_id)
+            raise
+
+        with tracer.span("agent.validate_response"):
+            return ActionResponse.from_api(response)
+
+    def _get_selected_function(self, action_response: ActionResponse) -> Optional[Function]:
+        """
+        Report the action response and return the function GAME selected for execution,
+        or None if the action does not call a function
+        """
         action_type = action_response.action_type
+        current_task = action_response.agent_state.current_task
+        fields = log_fields(
+            agent_id=self.agent_id,
+            worker_id=self.current_worker_id,
+            action_type=action_type.value,
+            task=current_task.task if current_task else None,
+        )
 
-        print("#" * 50)
-        print("STEP")
-        print(f"Current Task: {action_response.agent_state.current_task}")
-        print(f"Action response: {action_response}")
-        print(f"Action type: {action_type}")
+        logger.info("Step: %s", action_type.value, extra=fields)
+        logger.debug("Action response: %r", action_response, extra=fields)
 
         # if new task is updated/generated
-        if (
-            action_response.agent_state.hlp
-            and action_response.agent_state.hlp.change_indicator
-        ):
-            print("New task generated")
-            print(f"Task: {action_response.agent_state.current_task}")
-
-        # execute action
-        if action_type in [
+        if action_response.agent_state.hlp_changed:
+            logger.info("New task generated: %s", fields["game"]["task"], extra=fields)
+
+        if action_type not in [
             ActionType.CALL_FUNCTION,
             ActionType.CONTINUE_FUNCTION,
         ]:
-            print(f"Action Selected: {action_response.action_args['fn_name']}")
-            print(f"Action Args: {action_response.action_args['args']}")
+            return None
 
-            if not action_response.action_args:
-                raise ValueError("No function information provided by GAME")
+        if not action_response.action_args:
+            raise ValueError("No function information provided by GAME")
 
-            self._session.function_result = (
-                self.workers[self.current_worker_id]
-                .action_space[action_response.action_args["fn_name"]]
-                .execute(**action_response.action_args)
-            )
+        fields = log_fields(**fields["game"], fn_name=action_response.action_args["fn_name"])
+        logger.info("Action selected: %s", action_response.action_args["fn_name"], extra=fields)
+        logger.debug("Action args: %s", action_response.action_args["args"], extra=fields)
 
-            print(f"Function result: {self._session.function_result}")
+        return (
+            self.workers[self.current_worker_id]
+            .action_space[action_response.action_args["fn_name"]]
+        )
 
-            # update worker states
-            updated_worker_state = self.workers[self.current_worker_id].get_state_fn(
-                self._session.function_result, self.worker_states[self.current_worker_id])
-            self.worker_states[self.current_worker_id] = updated_worker_state
+    def _apply_action(self, action_response: ActionResponse):
+        """
+        Update worker states, current worker, agent state and observation after an action
+        (and its function execution, if any) has been carried out
+        """
+        update_observation, update_worker_state = self._record_action(action_response)
+
+        worker_state_future = None
+        if update_worker_state:
+            # update worker states (alongside the agent state, if concurrent)
+            # (not from a thread of the SDK pool, which must not wait on its own pool)
+            if self._concurrent_state and not in_thread_pool():
+                worker_state_future = submit_to_thread_pool(self._update_worker_state)
+            else:
+                self._update_worker_state()
+
+        try:
+            self._update_agent_state()
+        finally:
+            if worker_state_future is not None:
+                worker_state_future.result()
 
-            update_observation = "worker"
+        with self._get_tracer().span("agent.update_observation"):
+            self._update_observation(update_observation)
+
+    def _record_action(self, action_response: ActionResponse) -> Tuple[str, bool]:
+        """
+        Logs an action and moves to the worker it selects. Returns the observation to
+        update and whether the state of the current worker must be updated.
+        """
+        if action_response.action_type in [
+            ActionType.CALL_FUNCTION,
+            ActionType.CONTINUE_FUNCTION,
+        ]:
+            function_result = self._session.function_result
+            logger.info(
+                "Function result: %s",
+                function_result.action_status.value,
+                extra=log_fields(
+                    agent_id=self.agent_id,
+                    worker_id=self.current_worker_id,
+                    action_id=function_result.action_id,
+                    status=function_result.action_status.value,
+                ),
+            )
+            logger.debug("Function result: %r", function_result)
+            return "worker", True
 
         elif action_response.action_type == ActionType.WAIT:
-            print("Task ended completed or ended (not possible with current actions)")
-            update_observation = "task"
+            logger.info(
+                "Task ended completed or ended (not possible with current actions)",
+                extra=log_fields(agent_id=self.agent_id, worker_id=self.current_worker_id),
+            )
+            return "task", False
 
         elif action_response.action_type == ActionType.GO_TO:
             if not action_response.action_args:
                 raise ValueError("No location information provided by GAME")
 
             next_worker = action_response.action_args["location_id"]
-            print(f"Next worker selected: {next_worker}")
+            logger.info(
+                "Next worker selected: %s",
+                next_worker,
+                extra=log_fields(agent_id=self.agent_id, worker_id=next_worker),
+            )
             self.current_worker_id = next_worker
-            
-            update_observation = "worker"
-        else:
-            raise ValueError(
-                f"Unknown action type: {action_response.action_type}")
+            return "worker", False
+
+        raise ValueError(
+            f"Unknown action type: {action_response.action_type}")
+
+    def _update_agent_state(self):
+        with self._get_tracer().span("agent.agent_state"):
+            agent_state = self.get_agent_state_fn(
+                self._session.function_result, self.agent_state)
+            if self._memory_budget is not None:
+                agent_state = self._memory_budget.limit_state(agent_state, f"agent {self.agent_id}")
+            self.agent_state = agent_state
 
-        # update agent state
-        self.agent_state = self.get_agent_state_fn(
-            self._session.function_result, self.agent_state)
-        
+    def _update_worker_state(self):
+        with self._get_tracer().span("agent.worker_state", worker_id=self.current_worker_id):
+            updated_worker_state = self.workers[self.current_worker_id].get_state_fn(
+                self._session.function_result, self.worker_states[self.current_worker_id])
+            if self._memory_budget is not None:
+                updated_worker_state = self._memory_budget.limit_state(
+                    updated_worker_state, f"worker {self.current_worker_id} of agent {self.agent_id}")
+        self.worker_states[self.current_worker_id] = updated_worker_state
+
+    def _update_observation(self, update_observation: str):
         # update observation (saved state) - no interruptions (is_global should always be False)
         if update_observation == "task":
             if "observations" in self.agent_state:
@@ -332,9 +606,68 @@ class Agent:
         else:
             self.observation = None
 
+    def _limit_function_result(self, function_result: FunctionResult) -> FunctionResult:
+        if self._memory_budget is None:
+            return function_result
+        return self._memory_budget.limit_function_result(function_result)
+
+    def memory_report(self) -> Dict[str, Any]:
+        """
+        Returns the size (as serialized JSON) of what the agent holds between steps:
+        agent state, observation, last function result info and the state of every
+        worker, with the stats of the memory budget, if any
+        """
+        function_result = self._session.function_result
+        report: Dict[str, Any] = {
+            "agent_id": self.agent_id,
+            "agent_state_bytes": json_size(self.agent_state),
+            "observation_bytes": json_size(self.observation),
+            "function_result_info_bytes": json_size(function_result.info) if function_result else 0,
+            "workers": {
+                worker_id: {"state_bytes": json_size(state)}
+                for worker_id, state in getattr(self, "worker_states", {}).items()
+            },
+        }
+        report["total_bytes"] = (
+            report["agent_state_bytes"]
+            + report["observation_bytes"]
+            + report["function_result_info_bytes"]
+            + sum(worker["state_bytes"] for worker in report["workers"].values())
+        )
+        if self._memory_budget is not None:
+            report["budget"] = self._memory_budget.stats()
+        return report
+
+    def step(self):
+        tracer = self._get_tracer()
+
+        with tracer.span("agent.step", agent_id=self.agent_id) as step_span:
+            # get next task/action from GAME API
+            with tracer.span("agent.get_action"):
+                action_response = self._get_action(self._session.function_result)
+            step_span.set_attribute("action_type", action_response.action_type.value)
+
+            # execute action
+            function = self._get_selected_function(action_response)
+            if function is not None:
+                with tracer.span("function.execute", fn_name=function.fn_name) as execute_span:
+                    self._session.function_result = self._limit_function_result(
+                        function.execute(**action_response.action_args))
+                    execute_span.set_attribute(
+                        "status", self._session.function_result.action_status.value)
+
+            self._apply_action(action_response)
+
+            if self._session_store is not None:
+                with tracer.span("agent.save_session"):
+                    self.save_session()
+
         return action_response, self._session.function_result
 
     def run(self):
-        self._session = Session()
+        # a session resumed from the store is continued, otherwise a new one starts
+        if not self._session_restored:
+            self._session = Session()
+        self._session_restored = False
         while True:
             self.step()
@@ -1,46 +1,82 @@
 import requests
 from typing import List, Dict, Optional
+from game_sdk.game.token_cache import AccessTokenCache
+from game_sdk.game.transport import Transport, get_default_transport
+from game_sdk.game.serialization import dumps_bytes, loads
 
 
 class GAMEClient:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, transport: Optional[Transport] = None):
         self.api_key = api_key
         self.base_url = "https://game.virtuals.io"
-        
+        self.transport = transport or get_default_transport()
+        # access tokens are reused across calls and refreshed ahead of expiry
+        self.token_cache = AccessTokenCache(self._get_access_token)
+
     def _get_access_token(self) -> str:
         """
         Internal method to get access token
         """
-        response = requests.post(
+        response = self.transport.post(
             "https://api.virtuals.io/api/accesses/tokens",
             json={"data": {}},
             headers={"x-api-key": self.api_key},
+            idempotent=True,
         )
 
         if response.status_code != 200:
             raise ValueError(f"Failed to get token (status {response.status_code}). Response: {response.text}")
 
-        response_json = response.json()
+        response_json = loads(response.content)
         return response_json["data"]["accessToken"]
 
     def _post(
-        self, endpoint: str, data: dict, extra_headers: Optional[Dict[str, str]] = None
+        self,
+        endpoint: str,
+        data: dict,
+        extra_headers: Optional[Dict[str, str]] = None,
+        idempotent: bool = False,
     ) -> dict:
         """
         Internal method to post data
         """
-        access_token = self._get_access_token()
+        access_token = self.token_cache.get_token()
+        response = self._post_with_token(access_token, endpoint, data, extra_headers, idempotent)
+
+        # token revoked or expired early - drop it and retry once with a fresh one
+        if response.status_code == 401:
+            self.token_cache.invalidate(access_token)
+            access_token = self.token_cache.get_token()
+            response = self._post_with_token(access_token, endpoint, data, extra_headers, idempotent)
+
+        if response.status_code != 200:
+            raise ValueError(f"Failed to post data (status {response.status_code}). Response: {response.text}")
+
+        response_json = loads(response.content)
+        return response_json["data"]
 
+    def _post_with_token(
+        self,
+        access_token: str,
+        endpoint: str,
+        data: dict,
+        extra_headers: Optional[Dict[str, str]] = None,
+        idempotent: bool = False,
+    ) -> requests.Response:
         # Default headers with Authorization
-        headers = {"Authorization": f"Bearer {access_token}"}
+        headers = {
+            "Authorization": f"Bearer {access_token}",
+            "Content-Type": "application/json",
+        }
 
         # Merge additional headers if provided
         if extra_headers:
             headers.update(extra_headers)
 
-        response = requests.post(
+        # data may hold pre-serialized fragments (e.g. function definitions)
+        return self.transport.post(
             f"{self.base_url}/prompts",
-            json={
+            data=dumps_bytes({
                 "data": {
                     "method": "post",
                     "headers": {
@@ -49,16 +85,11 @@ class GAMEClient:
                     "route": endpoint,
                     "data": data,
                 },
-            },
+            }),
             headers=headers,
+            idempotent=idempotent,
         )
 
-        if response.status_code != 200:
-            raise ValueError(f"Failed to post data (status {response.status_code}). Response: {response.text}")
-
-        response_json = response.json()
-        return response_json["data"]
-
     def create_agent(self, name: str, description: str, goal: str) -> str:
         """
         Create an agent instance (worker or agent with task generator)
@@ -105,22 +136,28 @@ class GAMEClient:
         submission_id: str,
         data: dict,
         model_name: str,
+        idempotent: bool = True,
     ) -> Dict:
         """
         Get worker actions (for standalone worker)
+
+        `idempotent` tells a retrying transport whether the request can be sent again:
+        true for full payloads, false for HASH/DELTA encoded ones.
         """
         return self._post(
             endpoint=f"/v2/agents/{agent_id}/tasks/{submission_id}/next",
             data=data,
             extra_headers={"model_name": model_name},
+            idempotent=idempotent,
         )
 
-    def get_agent_action(self, agent_id: str, data: dict, model_name: str) -> Dict:
+    def get_agent_action(self, agent_id: str, data: dict, model_name: str, idempotent: bool = True) -> Dict:
         """
-        Get agent actions/next step (for agent)
+        Get agent actions/next step (for agent), see `get_worker_action` for `idempotent`
         """
         return self._post(
             endpoint=f"/v2/agents/{agent_id}/actions",
             data=data,
             extra_headers={"model_name": model_name},
+            idempotent=idempotent,
         )
\ No newline at end of file
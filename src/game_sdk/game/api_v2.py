@@ -1,9 +1,12 @@
 import requests
-from typing import List, Dict
+from typing import List, Dict, Optional
+from game_sdk.game.transport import Transport, get_default_transport
+from game_sdk.game.serialization import dumps_bytes, loads
 
 class GAMEClientV2:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, transport: Optional[Transport] = None):
         self.api_key = api_key
+        self.transport = transport or get_default_transport()
         self.base_url = "https://sdk.game.virtuals.io/v2"
         self.headers = {
             "Content-Type": "application/json",
@@ -22,10 +25,10 @@ class GAMEClientV2:
             }
         }
 
-        response = requests.post(
+        response = self.transport.post(
             f"{self.base_url}/agents",
             headers=self.headers,
-            json=payload
+            data=dumps_bytes(payload)
         )
 
         return self._get_response_body(response)["id"]
@@ -43,10 +46,10 @@ class GAMEClientV2:
             }
         }
 
-        response = requests.post(
+        response = self.transport.post(
             f"{self.base_url}/maps",
             headers=self.headers,
-            json=payload
+            data=dumps_bytes(payload)
         )
 
         return self._get_response_body(response)["id"]
@@ -61,59 +64,67 @@ class GAMEClientV2:
             }
         }
 
-        response = requests.post(
+        response = self.transport.post(
             f"{self.base_url}/agents/{agent_id}/tasks",
             headers=self.headers,
-            json=payload
+            data=dumps_bytes(payload)
         )
 
         return self._get_response_body(response)
 
-    def get_worker_action(self, agent_id: str, submission_id: str, data: dict, model_name: str) -> Dict:
+    def get_worker_action(
+        self, agent_id: str, submission_id: str, data: dict, model_name: str, idempotent: bool = True
+    ) -> Dict:
         """
         API call to get worker actions (for standalone worker)
+
+        `idempotent` tells a retrying transport whether the request can be sent again:
+        true for full payloads, false for HASH/DELTA encoded ones.
         """
-        response = requests.post(
+        response = self.transport.post(
             f"{self.base_url}/agents/{agent_id}/tasks/{submission_id}/next",
             headers=self.headers | {"model_name": model_name},
-            json={
+            data=dumps_bytes({
                 "data": data
-            }
+            }),
+            idempotent=idempotent,
         )
 
         if response.status_code != 200:
             raise ValueError(f"Failed to get worker action (status {response.status_code}). Response: {response.text}")
 
-        response_json = response.json()
+        response_json = loads(response.content)
 
         return response_json["data"]
 
-    def get_agent_action(self, agent_id: str, data: dict, model_name: str) -> Dict:
+    def get_agent_action(self, agent_id: str, data: dict, model_name: str, idempotent: bool = True) -> Dict:
         """
-        API call to get agent actions/next step (for agent)
+        API call to get agent actions/next step (for agent), see `get_worker_action`
+        for `idempotent`
         """
-        response = requests.post(
+        response = self.transport.post(
             f"{self.base_url}/agents/{agent_id}/actions",
             headers=self.headers | {"model_name": model_name},
-            json={
+            data=dumps_bytes({
                 "data": data
-            }
+            }),
+            idempotent=idempotent,
         )
 
         if response.status_code != 200:
             raise ValueError(f"Failed to get agent action (status {response.status_code}). Response: {response.text}")
 
-        response_json = response.json()
+        response_json = loads(response.content)
 
         return response_json["data"]
     
     def create_chat(self, data: dict) -> str:
-        response = requests.post(
+        response = self.transport.post(
             f"{self.base_url}/conversation",
             headers=self.headers,
-            json={
+            data=dumps_bytes({
                 "data": data
-            }
+            })
         )
         
         chat_id = self._get_response_body(response).get("conversation_id")
@@ -122,39 +133,39 @@ class GAMEClientV2:
         return chat_id
     
     def update_chat(self, conversation_id: str, data: dict) -> dict:
-        response = requests.post(
+        response = self.transport.post(
             f"{self.base_url}/conversation/{conversation_id}/next",
             headers=self.headers,
-            json={
+            data=dumps_bytes({
                 "data": data
-            }
+            })
         )
         
         if response.status_code != 200:
             raise ValueError(f"Failed to update conversation (status {response.status_code}). Response: {response.text}")
 
-        response_json = response.json()
+        response_json = loads(response.content)
 
         return response_json["data"]
     
     def report_function(self, conversation_id: str, data: dict) -> dict:
-        response = requests.post(
+        response = self.transport.post(
             f"{self.base_url}/conversation/{conversation_id}/function/result",
             headers=self.headers,
-            json={
+            data=dumps_bytes({
                 "data": data
-            }
+            })
         )
 
         return self._get_response_body(response)
     
     def end_chat(self, conversation_id: str, data: dict) -> dict:
-        response = requests.post(
+        response = self.transport.post(
             f"{self.base_url}/conversation/{conversation_id}/end",
             headers=self.headers,
-            json={
+            data=dumps_bytes({
                 "data": data
-            }
+            })
         )
 
         return self._get_response_body(response)
@@ -163,6 +174,6 @@ class GAMEClientV2:
         if response.status_code != 200:
             raise ValueError(f"Failed to get response body (status {response.status_code}). Response: {response.text}")
 
-        response_json = response.json()
+        response_json = loads(response.content)
 
         return response_json["data"]
\ No newline at end of file
@@ -0,0 +1,230 @@
+import asyncio
+from typing import Awaitable, List, Optional, Callable
+from game_sdk.game.agent import Agent, WorkerConfig, Session
+from game_sdk.game.async_worker import AsyncWorker
+from game_sdk.game.custom_types import FunctionResult, ActionResponse
+from game_sdk.game.execution import in_thread_pool, submit_to_thread_pool
+from game_sdk.game.async_api_v2 import AsyncGAMEClientV2
+from game_sdk.game.payload_encoding import PayloadEncoder
+from game_sdk.game.tracing import Tracer
+from game_sdk.game.sessions import SessionStore, workers_config_hash
+from game_sdk.game.id_cache import RemoteIdCache
+from game_sdk.game.memory import MemoryBudget
+
+
+class AsyncAgent(Agent):
+    """
+    asyncio variant of Agent.
+
+    AsyncAgent awaits the GAME API instead of blocking on it, and awaits coroutine
+    executables directly (regular executables are run in the loop's default executor),
+    so a single event loop can drive many agents concurrently. State functions are
+    shared with Agent and are called synchronously.
+
+    Only V2 API keys are supported. The remote agent is created in `compile()`,
+    since it cannot be awaited in the constructor.
+
+    Args:
+        api_key (str): Authentication key for API access (V2 key starting with "apt-").
+        name (str): Name of the agent.
+        agent_goal (str): High-level goal or purpose of the agent.
+        agent_description (str): Detailed description of the agent's capabilities.
+        get_agent_state_fn (Callable): Function to retrieve agent's current state.
+        workers (Optional[List[WorkerConfig]]): Workers available to the agent.
+        model_name (str): Name of the model used by the GAME API.
+        http_client (Optional[httpx.AsyncClient]): Shared http client to send requests with.
+        payload_encoder (Optional[PayloadEncoder]): Encoder applied to action request payloads.
+        tracer (Optional[Tracer]): Tracer recording the spans of every step.
+        session_store (Optional[SessionStore]): Store the agent is snapshotted to and
+            resumed from (see Agent). Snapshots are saved synchronously.
+        session_key (Optional[str]): Key of the agent snapshot, defaults to the agent name.
+        id_cache (Optional[RemoteIdCache]): Cache of remote agent and worker map ids by configuration.
+        concurrent_state (bool): Run the worker and agent state functions concurrently (see Agent).
+        memory_budget (Optional[MemoryBudget]): Limits on the size of states and function result infos.
+
+    Example:
+        ```python
+        agent = AsyncAgent(api_key="apt-...", ...)
+        await agent.compile()
+        await agent.run()
+        ```
+    """
+    def __init__(self,
+                 api_key: str,
+                 name: str,
+                 agent_goal: str,
+                 agent_description: str,
+                 get_agent_state_fn: Callable,
+                 workers: Optional[List[WorkerConfig]] = None,
+                 model_name: str = "Llama-3.3-70B-Instruct",
+                 http_client=None,
+                 payload_encoder: Optional[PayloadEncoder] = None,
+                 tracer: Optional[Tracer] = None,
+                 session_store: Optional[SessionStore] = None,
+                 session_key: Optional[str] = None,
+                 id_cache: Optional[RemoteIdCache] = None,
+                 concurrent_state: bool = False,
+                 memory_budget: Optional[MemoryBudget] = None,
+                 ):
+        self._http_client = http_client
+
+        super().__init__(
+            api_key=api_key,
+            name=name,
+            agent_goal=agent_goal,
+            agent_description=agent_description,
+            get_agent_state_fn=get_agent_state_fn,
+            workers=workers,
+            model_name=model_name,
+            payload_encoder=payload_encoder,
+            tracer=tracer,
+            session_store=session_store,
+            session_key=session_key,
+            id_cache=id_cache,
+            concurrent_state=concurrent_state,
+            memory_budget=memory_budget,
+        )
+
+    def _create_client(self, api_key: str, transport=None) -> AsyncGAMEClientV2:
+        if not api_key.startswith("apt-"):
+            raise Exception("Please use V2 API key to use AsyncAgent")
+        return AsyncGAMEClientV2(api_key, http_client=self._http_client)
+
+    def _create_remote_agent(self) -> Optional[str]:
+        # created in compile(), which can await the API
+        return None
+
+    async def compile(self):
+        """ Create the agent and compile the workers for the agent - i.e. set up task generator"""
+        if not self.workers:
+            raise ValueError("No workers added to the agent")
+
+        if self.agent_id is None:
+            self.agent_id = await self._aget_or_create_remote_id(
+                f"agent:{self._agent_hash}",
+                lambda: self.client.create_agent(
+                    self.name, self.agent_description, self.agent_goal
+                ),
+            )
+
+        if not self._restore_workers():
+            workers_list = list(self.workers.values())
+            self._workers_hash = workers_config_hash(self._api_key, workers_list)
+            self._map_id = await self._aget_or_create_remote_id(
+                f"map:{self._workers_hash}",
+                lambda: self.client.create_workers(workers_list),
+            )
+            self._init_worker_states()
+
+        self.save_session()
+
+        return self._map_id
+
+    async def _aget_or_create_remote_id(self, fingerprint: str, create: Callable[[], Awaitable[str]]) -> str:
+        """Look a remote id up in the id cache, if any, awaiting `create` when missing"""
+        if self._id_cache is None:
+            return await create()
+        return await self._id_cache.aget_or_create(fingerprint, create)
+
+    def _create_worker(self, worker_id: str) -> AsyncWorker:
+        """Initialize a working interactable standalone async worker"""
+        worker_config = self.get_worker_config(worker_id)
+        return AsyncWorker(
+            api_key=self._api_key,
+            description=self.agent_description,
+            instruction=worker_config.instruction,
+            get_state_fn=worker_config.get_state_fn,
+            action_space=worker_config.action_space,
+            http_client=self._http_client,
+            payload_encoder=self._payload_encoder,
+            tracer=self._tracer,
+            id_cache=self._id_cache,
+            memory_budget=self._memory_budget,
+            worker_id=worker_id,
+        )
+
+    async def _get_action(
+        self,
+        function_result: Optional[FunctionResult] = None
+    ) -> ActionResponse:
+
+        tracer = self._get_tracer()
+
+        with tracer.span("agent.build_request"):
+            data = self._build_action_data(function_result)
+
+        try:
+            with tracer.span("agent.api_call", model_name=self._model_name):
+                response = await self.client.get_agent_action(
+                    agent_id=self.agent_id,
+                    data=data,
+                    model_name=self._model_name
+                )
+        except Exception:
+            if self._payload_encoder is not None:
+                self._payload_encoder.reset(self.agent_id)
+            raise
+
+        with tracer.span("agent.validate_response"):
+            return ActionResponse.from_api(response)
+
+    async def step(self):
+        tracer = self._get_tracer()
+
+        with tracer.span("agent.step", agent_id=self.agent_id) as step_span:
+            # get next task/action from GAME API
+            with tracer.span("agent.get_action"):
+                action_response = await self._get_action(self._session.function_result)
+            step_span.set_attribute("action_type", action_response.action_type.value)
+
+            # execute action
+            function = self._get_selected_function(action_response)
+            if function is not None:
+                with tracer.span("function.execute", fn_name=function.fn_name) as execute_span:
+                    self._session.function_result = self._limit_function_result(
+                        await function.aexecute(**action_response.action_args))
+                    execute_span.set_attribute(
+                        "status", self._session.function_result.action_status.value)
+
+            await self._aapply_action(action_response)
+
+            if self._session_store is not None:
+                with tracer.span("agent.save_session"):
+                    self.save_session()
+
+        return action_response, self._session.function_result
+
+    async def _aapply_action(self, action_response: ActionResponse):
+        """
+        Like `_apply_action`, with the state functions run in the SDK thread pool and
+        awaited, so the event loop is not blocked while the states are updated
+        """
+        if in_thread_pool():
+            # a loop running on a thread of the SDK pool must not wait on its own pool
+            self._apply_action(action_response)
+            return
+
+        update_observation, update_worker_state = self._record_action(action_response)
+
+        worker_state = None
+        if update_worker_state:
+            worker_state = asyncio.wrap_future(submit_to_thread_pool(self._update_worker_state))
+            if not self._concurrent_state:
+                await worker_state
+                worker_state = None
+
+        try:
+            await asyncio.wrap_future(submit_to_thread_pool(self._update_agent_state))
+        finally:
+            if worker_state is not None:
+                await worker_state
+
+        with self._get_tracer().span("agent.update_observation"):
+            self._update_observation(update_observation)
+
+    async def run(self):
+        if not self._session_restored:
+            self._session = Session()
+        self._session_restored = False
+        while True:
+            await self.step()
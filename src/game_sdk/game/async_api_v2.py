@@ -0,0 +1,169 @@
+from typing import Any, List, Dict, Optional
+from game_sdk.game.serialization import dumps_bytes, loads
+from game_sdk.game import tracing
+
+try:
+    import httpx
+except ImportError:  # httpx is only needed for the asyncio API
+    httpx = None
+
+
+class AsyncGAMEClientV2:
+    """
+    asyncio counterpart of GAMEClientV2, with the same methods as coroutines.
+
+    All requests go through one `httpx.AsyncClient`, so a single event loop can drive
+    many agents over a shared pool of keep-alive connections. Pass the same
+    `http_client` to several clients (or agents) to share the pool between them.
+
+    Args:
+        api_key (str): V2 API key (starting with "apt-").
+        http_client (Optional[httpx.AsyncClient]): Client to send requests with.
+            A new one is created (and owned by this client) if not provided.
+        max_connections (int): Connection limit of the created http client.
+        max_keepalive_connections (int): Keep-alive limit of the created http client.
+        timeout (Optional[float]): Request timeout of the created http client
+            (None waits indefinitely, like the synchronous client).
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        http_client: Optional["httpx.AsyncClient"] = None,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        timeout: Optional[float] = None,
+    ):
+        if httpx is None:
+            raise ImportError(
+                "AsyncGAMEClientV2 requires httpx. Install it with `pip install game_sdk[async]`"
+            )
+
+        self.api_key = api_key
+        self.base_url = "https://sdk.game.virtuals.io/v2"
+        self.headers = {
+            "Content-Type": "application/json",
+            "x-api-key": self.api_key
+        }
+
+        self._owns_http_client = http_client is None
+        self.http_client = http_client or httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+            timeout=timeout,
+        )
+
+    async def _post(self, path: str, data: Any, extra_headers: Optional[Dict[str, str]] = None) -> "httpx.Response":
+        headers = dict(self.headers, **extra_headers) if extra_headers else self.headers
+        content = dumps_bytes({
+            "data": data
+        })
+        url = f"{self.base_url}{path}"
+        with tracing.span("http.request", method="POST", url=url) as span:
+            response = await self.http_client.post(url, headers=headers, content=content)
+            span.set_attribute("status_code", response.status_code)
+        return response
+
+    async def create_agent(self, name: str, description: str, goal: str) -> str:
+        """
+        API call to create an agent instance (worker or agent with task generator)
+        """
+        response = await self._post("/agents", {
+            "name": name,
+            "goal": goal,
+            "description": description
+        })
+
+        return self._get_response_body(response)["id"]
+
+    async def create_workers(self, workers: List) -> str:
+        """
+        API call to create workers and worker description for the task generator (agent)
+        """
+        response = await self._post("/maps", {
+            "locations": [
+                {"id": w.id, "name": w.id, "description": w.worker_description}
+                for w in workers
+            ]
+        })
+
+        return self._get_response_body(response)["id"]
+
+    async def set_worker_task(self, agent_id: str, task: str) -> Dict:
+        """
+        API call to set worker task (for standalone worker)
+        """
+        response = await self._post(f"/agents/{agent_id}/tasks", {"task": task})
+
+        return self._get_response_body(response)
+
+    async def get_worker_action(self, agent_id: str, submission_id: str, data: dict, model_name: str) -> Dict:
+        """
+        API call to get worker actions (for standalone worker)
+        """
+        response = await self._post(
+            f"/agents/{agent_id}/tasks/{submission_id}/next",
+            data,
+            {"model_name": model_name},
+        )
+
+        if response.status_code != 200:
+            raise ValueError(f"Failed to get worker action (status {response.status_code}). Response: {response.text}")
+
+        return loads(response.content)["data"]
+
+    async def get_agent_action(self, agent_id: str, data: dict, model_name: str) -> Dict:
+        """
+        API call to get agent actions/next step (for agent)
+        """
+        response = await self._post(
+            f"/agents/{agent_id}/actions",
+            data,
+            {"model_name": model_name},
+        )
+
+        if response.status_code != 200:
+            raise ValueError(f"Failed to get agent action (status {response.status_code}). Response: {response.text}")
+
+        return loads(response.content)["data"]
+
+    async def create_chat(self, data: dict) -> str:
+        response = await self._post("/conversation", data)
+
+        chat_id = self._get_response_body(response).get("conversation_id")
+        if not chat_id:
+            raise Exception("Agent did not return a conversation_id for the chat.")
+        return chat_id
+
+    async def update_chat(self, conversation_id: str, data: dict) -> dict:
+        response = await self._post(f"/conversation/{conversation_id}/next", data)
+
+        if response.status_code != 200:
+            raise ValueError(f"Failed to update conversation (status {response.status_code}). Response: {response.text}")
+
+        return loads(response.content)["data"]
+
+    async def report_function(self, conversation_id: str, data: dict) -> dict:
+        response = await self._post(f"/conversation/{conversation_id}/function/result", data)
+
+        return self._get_response_body(response)
+
+    async def end_chat(self, conversation_id: str, data: dict) -> dict:
+        response = await self._post(f"/conversation/{conversation_id}/end", data)
+
+        return self._get_response_body(response)
+
+    async def aclose(self):
+        """Closes the underlying http client if it was created by this client"""
+        if self._owns_http_client:
+            await self.http_client.aclose()
+
+    def _get_response_body(self, response: "httpx.Response") -> dict:
+        if response.status_code != 200:
+            raise ValueError(f"Failed to get response body (status {response.status_code}). Response: {response.text}")
+
+        response_json = loads(response.content)
+
+        return response_json["data"]
@@ -0,0 +1,95 @@
+from typing import Any, Callable, Dict, List, Optional
+from game_sdk.game.chat_agent import Chat, ChatAgent
+from game_sdk.game.custom_types import (
+    ChatResponse,
+    FunctionResult,
+    GameChatResponse,
+    Function,
+)
+from game_sdk.game.async_api_v2 import AsyncGAMEClientV2
+
+
+class AsyncChat(Chat):
+    """
+    asyncio variant of Chat, returned by AsyncChatAgent.create_chat().
+
+    API calls are awaited and coroutine executables are awaited directly; regular
+    executables are run in the loop's default executor.
+    """
+
+    async def next(self, message: str) -> ChatResponse:
+
+        convo_response = await self._update_conversation(message)
+
+        # execute functions/actions if present
+        fn_to_call = self._get_function_to_call(convo_response)
+        if fn_to_call:
+            result = await fn_to_call.aexecute(
+                **{
+                    "fn_id": convo_response.function_call.id,
+                    "args": convo_response.function_call.args,
+                }
+            )
+            response_message = await self._report_function_result(result)
+        else:
+            result = None
+            response_message = convo_response.message or ""
+
+        return self._build_chat_response(convo_response, response_message, result)
+
+    async def end(self, message: Optional[str] = None):
+        await self.client.end_chat(
+            self.chat_id,
+            {
+                "message": message,
+            },
+        )
+
+    async def _update_conversation(self, message: str) -> GameChatResponse:
+        data = self._build_conversation_data(message)
+        result = await self.client.update_chat(self.chat_id, data)
+        return GameChatResponse.model_validate(result)
+
+    async def _report_function_result(self, result: FunctionResult) -> str:
+        data = self._build_function_report(result)
+        response = await self.client.report_function(self.chat_id, data)
+        return self._get_report_message(response)
+
+
+class AsyncChatAgent(ChatAgent):
+    """
+    asyncio variant of ChatAgent. Only V2 API keys are supported.
+
+    Args:
+        api_key (str): V2 API key (starting with "apt-").
+        prompt (str): Prompt of the chat agent.
+        http_client (Optional[httpx.AsyncClient]): Shared http client to send requests with.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        prompt: str,
+        http_client=None,
+    ):
+        self._api_key = api_key
+        self.prompt = prompt
+
+        if api_key.startswith("apt-"):
+            self.client = AsyncGAMEClientV2(api_key, http_client=http_client)
+        else:
+            raise Exception("Please use V2 API key to use AsyncChatAgent")
+
+    async def create_chat(
+        self,
+        partner_id: str,
+        partner_name: str,
+        action_space: Optional[List[Function]] = None,
+        get_state_fn: Optional[Callable[[], Dict[str, Any]]] = None,
+    ) -> AsyncChat:
+
+        chat_id = await self.client.create_chat(
+            self._build_chat_data(partner_id, partner_name),
+        )
+
+        return AsyncChat(chat_id, self.client, action_space, get_state_fn)
@@ -0,0 +1,237 @@
+import asyncio
+from typing import AsyncIterator, Awaitable, Callable, Iterable, List, Optional
+from game_sdk.game.worker import Worker
+from game_sdk.game.custom_types import Function, FunctionResult, ActionResponse, TaskResult, TaskStatus
+from game_sdk.game.async_api_v2 import AsyncGAMEClientV2
+from game_sdk.game.payload_encoding import PayloadEncoder
+from game_sdk.game.tracing import Tracer
+from game_sdk.game.id_cache import RemoteIdCache
+from game_sdk.game.memory import MemoryBudget
+
+
+class AsyncWorker(Worker):
+    """
+    asyncio variant of Worker.
+
+    AsyncWorker awaits the GAME API and coroutine executables instead of blocking
+    on them (regular executables are run in the loop's default executor). Only V2
+    API keys are supported. The remote agent backing the worker is created on the
+    first call to `set_task()`.
+
+    Args:
+        api_key (str): Authentication key for API access (V2 key starting with "apt-").
+        description (str): Detailed description of the worker's role and capabilities.
+        get_state_fn (Callable): Function to retrieve and manage worker state.
+        action_space (List[Function]): List of functions available to the worker.
+        instruction (Optional[str]): Additional specific instructions for the worker.
+        model_name (str): Name of the model used by the GAME API.
+        http_client (Optional[httpx.AsyncClient]): Shared http client to send requests with.
+        payload_encoder (Optional[PayloadEncoder]): Encoder applied to action request payloads.
+        tracer (Optional[Tracer]): Tracer recording the spans of every step.
+        id_cache (Optional[RemoteIdCache]): Cache of remote agent ids by configuration.
+        memory_budget (Optional[MemoryBudget]): Limits on the size of the state and function result infos.
+        worker_id (Optional[str]): Id of the worker config the worker is created from.
+
+    Example:
+        ```python
+        worker = AsyncWorker(api_key="apt-...", ...)
+        await worker.run("Bring me some fruits")
+        ```
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        description: str,
+        get_state_fn: Callable,
+        action_space: List[Function],
+        instruction: Optional[str] = "",
+        model_name: str = "Llama-3.3-70B-Instruct",
+        http_client=None,
+        payload_encoder: Optional[PayloadEncoder] = None,
+        tracer: Optional[Tracer] = None,
+        id_cache: Optional[RemoteIdCache] = None,
+        memory_budget: Optional[MemoryBudget] = None,
+        worker_id: Optional[str] = None,
+    ):
+        self._http_client = http_client
+
+        super().__init__(
+            api_key=api_key,
+            description=description,
+            get_state_fn=get_state_fn,
+            action_space=action_space,
+            instruction=instruction,
+            model_name=model_name,
+            payload_encoder=payload_encoder,
+            tracer=tracer,
+            id_cache=id_cache,
+            memory_budget=memory_budget,
+            worker_id=worker_id,
+        )
+
+    def _create_client(self, api_key: str, transport=None) -> AsyncGAMEClientV2:
+        if not api_key.startswith("apt-"):
+            raise Exception("Please use V2 API key to use AsyncWorker")
+        return AsyncGAMEClientV2(api_key, http_client=self._http_client)
+
+    def _create_remote_agent(self) -> Optional[str]:
+        # created in set_task(), which can await the API
+        return None
+
+    async def _ensure_remote_agent(self):
+        if self._agent_id is None:
+            def create() -> Awaitable[str]:
+                return self.client.create_agent("StandaloneWorker", self.description, "N/A")
+
+            if self._id_cache is None:
+                self._agent_id = await create()
+            else:
+                self._agent_id = await self._id_cache.aget_or_create(self._remote_agent_fingerprint(), create)
+
+    async def set_task(self, task: str):
+        """
+        Sets the task for the agent
+        """
+        await self._ensure_remote_agent()
+
+        set_task_response = await self.client.set_worker_task(self._agent_id, task)
+
+        # task ID
+        self._submission_id = set_task_response["submission_id"]
+
+        return self._submission_id
+
+    async def _get_action(
+        self,
+        function_result: Optional[FunctionResult] = None
+    ) -> ActionResponse:
+        """
+        Gets the agent action from the GAME API
+        """
+        tracer = self._get_tracer()
+
+        with tracer.span("worker.build_request"):
+            data = self._build_action_data(function_result)
+
+        try:
+            with tracer.span("worker.api_call", model_name=self._model_name):
+                response = await self.client.get_worker_action(
+                    self._agent_id,
+                    self._submission_id,
+                    data,
+                    model_name=self._model_name
+                )
+        except Exception:
+            if self._payload_encoder is not None:
+                self._payload_encoder.reset(self._agent_id)
+            raise
+
+        with tracer.span("worker.validate_response"):
+            return ActionResponse.from_api(response)
+
+    async def step(self):
+        """
+        Execute the next step in the task - requires a task ID (i.e. task ID)
+        """
+        if not self._submission_id:
+            raise ValueError("No task set")
+
+        tracer = self._get_tracer()
+
+        with tracer.span("worker.step", agent_id=self._agent_id) as step_span:
+            # get action from GAME API (Agent)
+            with tracer.span("worker.get_action"):
+                action_response = await self._get_action(self._function_result)
+            step_span.set_attribute("action_type", action_response.action_type.value)
+
+            # execute action
+            function = self._get_selected_function(action_response)
+            if function is not None:
+                with tracer.span("function.execute", fn_name=function.fn_name) as execute_span:
+                    self._function_result = self._limit_function_result(
+                        await function.aexecute(**action_response.action_args))
+                    execute_span.set_attribute("status", self._function_result.action_status.value)
+
+            self._apply_action(action_response)
+
+        return action_response, self._function_result.model_copy() if self._function_result else None
+
+    async def run(self, task: str):
+        """
+        Gets the agent to complete the task on its own autonomously
+        """
+
+        await self.set_task(task)
+        while self._submission_id:
+            await self.step()
+
+    async def _run_task(self, index: int, task: str, max_steps: Optional[int]) -> TaskResult:
+        worker = self._fork()
+        steps = 0
+        submission_id = None
+        try:
+            submission_id = await worker.set_task(task)
+            while worker._submission_id:
+                if max_steps is not None and steps >= max_steps:
+                    return worker._result(index, task, TaskStatus.MAX_STEPS, steps, submission_id)
+                await worker.step()
+                steps += 1
+        except Exception as e:
+            return worker._result(index, task, TaskStatus.FAILED, steps, submission_id, e)
+        return worker._result(index, task, TaskStatus.DONE, steps, submission_id)
+
+    async def run_many(
+        self,
+        tasks: Iterable[str],
+        concurrency: int = 8,
+        max_steps: Optional[int] = None,
+    ) -> AsyncIterator[TaskResult]:
+        """
+        Runs many tasks concurrently on the worker's remote agent, yielding their
+        results as they finish (see Worker.run_many). `concurrency` bounds the tasks
+        in flight on the event loop.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        # created once here, so the forks do not each create one
+        await self._ensure_remote_agent()
+
+        task_iter = enumerate(tasks)
+        pending = set()
+
+        def submit_next() -> bool:
+            for index, task in task_iter:
+                pending.add(asyncio.ensure_future(self._run_task(index, task, max_steps)))
+                return True
+            return False
+
+        for _ in range(concurrency):
+            if not submit_next():
+                break
+
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    pending.discard(future)
+                    submit_next()
+                    yield future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+            # wait for the cancelled tasks to unwind, so none outlives the generator
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def map(
+        self,
+        tasks: Iterable[str],
+        concurrency: int = 8,
+        max_steps: Optional[int] = None,
+    ) -> List[TaskResult]:
+        """Runs many tasks concurrently like `run_many` and returns their results in the order of `tasks`"""
+        results = [
+            result async for result in self.run_many(tasks, concurrency=concurrency, max_steps=max_steps)
+        ]
+        return sorted(results, key=lambda result: result.index)
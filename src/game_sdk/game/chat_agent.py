@@ -6,8 +6,10 @@ from game_sdk.game.custom_types import (
     GameChatResponse,
     Function,
     AgentMessage,
+    get_function_defs_json,
 )
 from game_sdk.game.api_v2 import GAMEClientV2
+from game_sdk.game.transport import Transport
 
 
 class Chat:
@@ -30,18 +32,8 @@ class Chat:
         convo_response = self._update_conversation(message)
 
         # execute functions/actions if present
-        if convo_response.function_call:
-            if not self.action_space:
-                raise Exception("No functions provided")
-
-            fn_name = convo_response.function_call.fn_name
-
-            fn_to_call = self.action_space.get(fn_name)
-            if not fn_to_call:
-                raise Exception(
-                    f"Function {fn_name}, returned by the agent, not found in action space"
-                )
-
+        fn_to_call = self._get_function_to_call(convo_response)
+        if fn_to_call:
             result = fn_to_call.execute(
                 **{
                     "fn_id": convo_response.function_call.id,
@@ -49,13 +41,49 @@ class Chat:
                 }
             )
             response_message = self._report_function_result(result)
+        else:
+            result = None
+            response_message = convo_response.message or ""
+
+        return self._build_chat_response(convo_response, response_message, result)
+
+    def end(self, message: Optional[str] = None):
+        self.client.end_chat(
+            self.chat_id,
+            {
+                "message": message,
+            },
+        )
+
+    def _get_function_to_call(self, convo_response: GameChatResponse) -> Optional[Function]:
+        if not convo_response.function_call:
+            return None
+
+        if not self.action_space:
+            raise Exception("No functions provided")
+
+        fn_name = convo_response.function_call.fn_name
+
+        fn_to_call = self.action_space.get(fn_name)
+        if not fn_to_call:
+            raise Exception(
+                f"Function {fn_name}, returned by the agent, not found in action space"
+            )
+        return fn_to_call
+
+    def _build_chat_response(
+        self,
+        convo_response: GameChatResponse,
+        response_message: str,
+        result: Optional[FunctionResult],
+    ) -> ChatResponse:
+        if result is not None:
             function_call_response = FunctionCallResponse(
-                fn_name=fn_name,
+                fn_name=convo_response.function_call.fn_name,
                 fn_args=convo_response.function_call.args,
                 result=result,
             )
         else:
-            response_message = convo_response.message or ""
             function_call_response = None
 
         return ChatResponse(
@@ -64,29 +92,24 @@ class Chat:
             function_call=function_call_response,
         )
 
-    def end(self, message: Optional[str] = None):
-        self.client.end_chat(
-            self.chat_id,
-            {
-                "message": message,
-            },
-        )
-
-    def _update_conversation(self, message: str) -> GameChatResponse:
-        data = {
+    def _build_conversation_data(self, message: str) -> Dict[str, Any]:
+        return {
             "message": message,
             "state": self.get_state_fn() if self.get_state_fn else None,
             "functions": (
-                [f.get_function_def() for f in self.action_space.values()]
+                get_function_defs_json(self.action_space.values())
                 if self.action_space
                 else None
             ),
         }
+
+    def _update_conversation(self, message: str) -> GameChatResponse:
+        data = self._build_conversation_data(message)
         result = self.client.update_chat(self.chat_id, data)
         return GameChatResponse.model_validate(result)
 
-    def _report_function_result(self, result: FunctionResult) -> str:
-        data = {
+    def _build_function_report(self, result: FunctionResult) -> Dict[str, Any]:
+        return {
             "fn_id": result.action_id,
             "result": (
                 f"{result.action_status.value}: {result.feedback_message}"
@@ -94,25 +117,31 @@ class Chat:
                 else result.action_status.value
             ),
         }
-        response = self.client.report_function(self.chat_id, data)
 
+    def _get_report_message(self, response: dict) -> str:
         message = response.get("message")
         if not message:
             raise Exception("Agent did not return a message for the function report.")
         return message
 
+    def _report_function_result(self, result: FunctionResult) -> str:
+        data = self._build_function_report(result)
+        response = self.client.report_function(self.chat_id, data)
+        return self._get_report_message(response)
+
 
 class ChatAgent:
     def __init__(
         self,
         api_key: str,
         prompt: str,
+        transport: Optional[Transport] = None,
     ):
         self._api_key = api_key
         self.prompt = prompt
 
         if api_key.startswith("apt-"):
-            self.client = GAMEClientV2(api_key)
+            self.client = GAMEClientV2(api_key, transport=transport)
         else:
             raise Exception("Please use V2 API key to use ChatAgent")
 
@@ -125,11 +154,14 @@ class ChatAgent:
     ) -> Chat:
 
         chat_id = self.client.create_chat(
-            {
-                "prompt": self.prompt,
-                "partner_id": partner_id,
-                "partner_name": partner_name,
-            },
+            self._build_chat_data(partner_id, partner_name),
         )
 
         return Chat(chat_id, self.client, action_space, get_state_fn)
+
+    def _build_chat_data(self, partner_id: str, partner_name: str) -> Dict[str, Any]:
+        return {
+            "prompt": self.prompt,
+            "partner_id": partner_id,
+            "partner_name": partner_name,
+        }
@@ -0,0 +1,359 @@
+import asyncio
+import collections
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from game_sdk.game.async_chat_agent import AsyncChatAgent
+from game_sdk.game.chat_agent import Chat, ChatAgent
+from game_sdk.game.custom_types import ChatResponse, Function
+from game_sdk.log import get_logger, log_fields
+
+logger = get_logger(__name__)
+
+
+class ChatServerBusy(Exception):
+    """Raised when a message is sent while `max_queued` messages are already waiting"""
+
+
+class _ChatEntry:
+    """A live conversation of the server and the messages waiting for it"""
+
+    __slots__ = ("partner_id", "partner_name", "chat", "creating", "pending", "in_flight", "scheduled", "last_used")
+
+    def __init__(self, partner_id: str, partner_name: str):
+        self.partner_id = partner_id
+        self.partner_name = partner_name
+        self.chat: Optional[Chat] = None
+        self.creating = asyncio.Lock()
+        self.pending: Deque[Tuple[str, "asyncio.Future[ChatResponse]"]] = collections.deque()
+        # messages being processed, and messages handed to the ready queue
+        self.in_flight = 0
+        self.scheduled = 0
+        self.last_used = time.monotonic()
+
+    @property
+    def idle(self) -> bool:
+        return not self.pending and not self.in_flight and not self.scheduled
+
+
+class ChatServer:
+    """
+    Serves many conversations of a ChatAgent from one asyncio event loop.
+
+    Messages are queued per conversation (partner) and processed by a pool of
+    `max_in_flight` asyncio workers, so at most `max_in_flight` messages are in flight
+    at once, and at most `max_per_chat` per conversation (1 by default, which keeps the
+    messages of a conversation in order). The chat of a partner is created on their
+    first message and kept in a registry, from which idle chats are evicted when they
+    were not used for `idle_ttl` seconds or when there are more than `max_chats` of
+    them (least recently used first). A message to an evicted partner starts a new chat.
+
+    With an AsyncChatAgent the API calls are awaited; with a ChatAgent they run in a
+    thread pool of `max_in_flight` threads, so the loop is never blocked.
+
+    Args:
+        chat_agent (ChatAgent): Chat agent creating the chats (ChatAgent or AsyncChatAgent).
+        action_space (Optional[List[Function]]): Functions available in every chat.
+        get_state_fn (Optional[Callable[[str], Dict[str, Any]]]): Called with the partner
+            id to get the state sent with each message of their chat.
+        max_in_flight (int): Messages processed at the same time, over all chats.
+        max_per_chat (int): Messages of one chat processed at the same time.
+        max_chats (int): Chats kept in the registry.
+        idle_ttl (Optional[float]): Seconds after which an idle chat is evicted (None to
+            keep chats until `max_chats` is reached).
+        max_queued (int): Messages waiting to be processed, over all chats, above which
+            `send` raises ChatServerBusy.
+        end_evicted (bool): End the conversation on the GAME API when a chat is evicted.
+
+    Example:
+        ```python
+        server = ChatServer(AsyncChatAgent(api_key, prompt), action_space=[...], max_in_flight=64)
+        async with server:
+            response = await server.send(user_id, text, partner_name=username)
+        ```
+    """
+
+    def __init__(
+        self,
+        chat_agent: ChatAgent,
+        action_space: Optional[List[Function]] = None,
+        get_state_fn: Optional[Callable[[str], Dict[str, Any]]] = None,
+        max_in_flight: int = 32,
+        max_per_chat: int = 1,
+        max_chats: int = 10000,
+        idle_ttl: Optional[float] = 1800.0,
+        max_queued: int = 10000,
+        end_evicted: bool = True,
+    ):
+        if max_in_flight < 1 or max_per_chat < 1 or max_chats < 1 or max_queued < 1:
+            raise ValueError("max_in_flight, max_per_chat, max_chats and max_queued must be at least 1")
+        if idle_ttl is not None and idle_ttl <= 0:
+            raise ValueError("idle_ttl must be positive (or None to never expire)")
+
+        self.chat_agent = chat_agent
+        self.action_space = action_space
+        self.get_state_fn = get_state_fn
+        self.max_in_flight = max_in_flight
+        self.max_per_chat = max_per_chat
+        self.max_chats = max_chats
+        self.idle_ttl = idle_ttl
+        self.max_queued = max_queued
+        self.end_evicted = end_evicted
+
+        self._is_async = isinstance(chat_agent, AsyncChatAgent)
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        # partner id -> entry, least recently used first
+        self._chats: "collections.OrderedDict[str, _ChatEntry]" = collections.OrderedDict()
+        self._ready: Optional["asyncio.Queue[_ChatEntry]"] = None
+        self._workers: List["asyncio.Task[None]"] = []
+        self._sweeper: Optional["asyncio.Task[None]"] = None
+        self._background: set = set()
+        self._idle: Optional[asyncio.Event] = None
+        self._queued = 0
+        self._in_flight = 0
+
+        self.created = 0
+        self.evicted = 0
+        self.processed = 0
+        self.failed = 0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    async def start(self):
+        """Starts the workers (and the eviction of idle chats) on the running loop"""
+        if self.running:
+            return
+        if not self._is_async:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix="game-sdk-chat")
+        self._ready = asyncio.Queue()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._workers = [asyncio.ensure_future(self._work()) for _ in range(self.max_in_flight)]
+        if self.idle_ttl is not None:
+            self._sweeper = asyncio.ensure_future(self._sweep())
+
+    async def stop(self, drain: bool = True, end_chats: bool = False):
+        """
+        Stops the server.
+
+        Args:
+            drain (bool): Process the queued messages first. Otherwise their senders
+                get a CancelledError.
+            end_chats (bool): End every live conversation on the GAME API.
+        """
+        if not self.running:
+            return
+
+        if drain:
+            await self._idle.wait()
+
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        for entry in self._chats.values():
+            for _, future in entry.pending:
+                future.cancel()
+            entry.pending.clear()
+        self._queued = 0
+
+        if end_chats:
+            for entry in list(self._chats.values()):
+                self._evict(entry, end=True)
+        if self._background:
+            await asyncio.gather(*self._background, return_exceptions=True)
+        self._chats.clear()
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def __aenter__(self) -> "ChatServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.stop()
+
+    async def send(self, partner_id: str, message: str, partner_name: Optional[str] = None) -> ChatResponse:
+        """
+        Queues a message of a partner and returns the chat agent's response once it
+        was processed (creating the partner's chat first if needed).
+
+        Raises:
+            ChatServerBusy: If `max_queued` messages are already waiting.
+            RuntimeError: If the server is not started.
+        """
+        if not self.running:
+            raise RuntimeError("ChatServer is not started")
+        if self._queued >= self.max_queued:
+            raise ChatServerBusy(f"{self._queued} messages are already queued")
+
+        entry = self._chats.get(partner_id)
+        if entry is None:
+            entry = self._chats[partner_id] = _ChatEntry(partner_id, partner_name or partner_id)
+        else:
+            self._chats.move_to_end(partner_id)
+        entry.last_used = time.monotonic()
+
+        future: "asyncio.Future[ChatResponse]" = asyncio.get_running_loop().create_future()
+        entry.pending.append((message, future))
+        self._queued += 1
+        # once the message is queued, so the new chat is not idle and stays
+        self._evict_overflow()
+        self._idle.clear()
+        self._schedule(entry)
+        return await future
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the number of live chats, queued and in-flight messages, and counters"""
+        return {
+            "chats": len(self._chats),
+            "queued": self._queued,
+            "in_flight": self._in_flight,
+            "created": self.created,
+            "evicted": self.evicted,
+            "processed": self.processed,
+            "failed": self.failed,
+        }
+
+    def _schedule(self, entry: _ChatEntry):
+        """Hands the chat to the workers once per message it can process now"""
+        while len(entry.pending) > entry.scheduled and entry.in_flight + entry.scheduled < self.max_per_chat:
+            entry.scheduled += 1
+            self._ready.put_nowait(entry)
+
+    async def _work(self):
+        while True:
+            entry = await self._ready.get()
+            entry.scheduled -= 1
+            if not entry.pending:
+                # its messages were moved to the next chat of the partner
+                self._done(entry)
+                continue
+            message, future = entry.pending.popleft()
+            self._queued -= 1
+            if future.cancelled():
+                # the sender gave up before the message was processed
+                self._done(entry)
+                continue
+
+            entry.in_flight += 1
+            self._in_flight += 1
+            try:
+                response = await self._process(entry, message)
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as e:
+                self.failed += 1
+                logger.warning(
+                    "Message of %s failed: %s",
+                    entry.partner_id,
+                    e,
+                    extra=log_fields(partner_id=entry.partner_id),
+                )
+                if not future.cancelled():
+                    future.set_exception(e)
+            else:
+                self.processed += 1
+                if response.is_finished and self._chats.get(entry.partner_id) is entry:
+                    # the conversation is over, the next message starts a new one
+                    self._start_next_chat(entry)
+                if not future.cancelled():
+                    future.set_result(response)
+            finally:
+                entry.in_flight -= 1
+                self._in_flight -= 1
+                entry.last_used = time.monotonic()
+                if self._chats.get(entry.partner_id) is entry:
+                    self._chats.move_to_end(entry.partner_id)
+                self._done(entry)
+
+    def _start_next_chat(self, entry: _ChatEntry):
+        """Replaces a finished chat, moving the messages still queued for it to the new one"""
+        del self._chats[entry.partner_id]
+        if not entry.pending:
+            return
+        successor = self._chats[entry.partner_id] = _ChatEntry(entry.partner_id, entry.partner_name)
+        successor.pending, entry.pending = entry.pending, successor.pending
+        self._schedule(successor)
+
+    def _done(self, entry: _ChatEntry):
+        self._schedule(entry)
+        if not self._queued and not self._in_flight:
+            self._idle.set()
+
+    async def _call(self, fn: Callable, *args: Any) -> Any:
+        """Awaits a chat agent or chat method, in the thread pool if it is blocking"""
+        if self._is_async:
+            return await fn(*args)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, functools.partial(fn, *args))
+
+    async def _process(self, entry: _ChatEntry, message: str) -> ChatResponse:
+        async with entry.creating:
+            if entry.chat is None:
+                get_state_fn = (
+                    functools.partial(self.get_state_fn, entry.partner_id)
+                    if self.get_state_fn is not None else None
+                )
+                entry.chat = await self._call(
+                    self.chat_agent.create_chat,
+                    entry.partner_id,
+                    entry.partner_name,
+                    self.action_space,
+                    get_state_fn,
+                )
+                self.created += 1
+        return await self._call(entry.chat.next, message)
+
+    def _evict(self, entry: _ChatEntry, end: bool):
+        if self._chats.get(entry.partner_id) is entry:
+            del self._chats[entry.partner_id]
+        self.evicted += 1
+        if end and entry.chat is not None:
+            task = asyncio.ensure_future(self._end_chat(entry))
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+
+    async def _end_chat(self, entry: _ChatEntry):
+        try:
+            await self._call(entry.chat.end)
+        except Exception as e:
+            logger.warning(
+                "Could not end the chat of %s: %s",
+                entry.partner_id,
+                e,
+                extra=log_fields(partner_id=entry.partner_id, chat_id=entry.chat.chat_id),
+            )
+
+    def _evict_overflow(self):
+        """Evicts the least recently used idle chats while there are too many"""
+        if len(self._chats) <= self.max_chats:
+            return
+        for entry in list(self._chats.values()):
+            if len(self._chats) <= self.max_chats:
+                break
+            if entry.idle:
+                self._evict(entry, self.end_evicted)
+
+    async def _sweep(self):
+        interval = min(self.idle_ttl / 2, 30.0)
+        while True:
+            await asyncio.sleep(interval)
+            expired_before = time.monotonic() - self.idle_ttl
+            for entry in list(self._chats.values()):
+                # least recently used first: the rest was used more recently
+                if entry.last_used > expired_before:
+                    break
+                if entry.idle:
+                    self._evict(entry, self.end_evicted)
@@ -1,8 +1,15 @@
-from typing import Any, Dict, Optional, List, Union, Sequence, Callable, Tuple
-from pydantic import BaseModel, Field
+import asyncio
+import concurrent.futures
+import functools
+import inspect
+import time
+from typing import Any, Awaitable, Dict, Iterable, Optional, List, Union, Sequence, Callable, Tuple
+from pydantic import BaseModel, Field, PrivateAttr, TypeAdapter
 from enum import Enum
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
+from game_sdk.game.serialization import RawJSON
+from game_sdk.game.execution import ExecutionPolicy, record_execution, submit_coroutine
 
 
 class Argument(BaseModel):
@@ -20,6 +27,14 @@ class Argument(BaseModel):
     type: Optional[Union[List[str], str]] = None
     optional: Optional[bool] = False
 
+    # bumped on every field assignment, so cached function definitions can detect changes
+    _version: int = PrivateAttr(default=0)
+
+    def __setattr__(self, name: str, value: Any):
+        super().__setattr__(name, value)
+        if name in type(self).model_fields:
+            self._version += 1
+
 class FunctionResultStatus(str, Enum):
     """
     Enum representing the possible status outcomes of a function execution.
@@ -58,7 +73,10 @@ class Function(BaseModel):
         fn_description (str): Detailed description of what the function does.
         args (List[Argument]): List of arguments the function accepts.
         hint (Optional[str]): Optional usage hint or example.
-        executable (Callable): The actual function implementation to be called.
+        executable (Callable): The actual function implementation to be called. May be
+            a coroutine function (`async def`).
+        execution_policy (Optional[ExecutionPolicy]): Timeout and executor to run the
+            executable with. Runs inline without a timeout if not set.
     """
     fn_name: str
     fn_description: str
@@ -66,18 +84,56 @@ class Function(BaseModel):
     hint: Optional[str] = None
     
     # Make executable required but with a default value
-    executable: Callable[..., Tuple[FunctionResultStatus, str, dict]] = Field(
+    executable: Callable[
+        ...,
+        Union[Tuple[FunctionResultStatus, str, dict], Awaitable[Tuple[FunctionResultStatus, str, dict]]]
+    ] = Field(
         default_factory=lambda: Function._default_executable
     )
 
+    execution_policy: Optional[ExecutionPolicy] = None
+
+    # serialized function definition, reused until the definition changes
+    _def_cache_key: Optional[tuple] = PrivateAttr(default=None)
+    _function_def: Optional[dict] = PrivateAttr(default=None)
+    _function_def_json: Optional[str] = PrivateAttr(default=None)
+
+    def _update_def_cache(self):
+        # holding the Argument objects in the key keeps their ids stable, and tuple
+        # comparison short-circuits on identity, so the check is cheap when nothing changed
+        key = (
+            self.fn_name,
+            self.fn_description,
+            self.hint,
+            tuple((arg, arg._version) for arg in self.args),
+        )
+        if key != self._def_cache_key:
+            self._function_def = self.model_dump(exclude={'executable', 'execution_policy'})
+            self._function_def_json = self.model_dump_json(exclude={'executable', 'execution_policy'})
+            self._def_cache_key = key
+
     def get_function_def(self):
         """
         Returns the function definition without the executable component.
 
+        The definition is cached and rebuilt only when the function or its arguments
+        change, so the returned dict must not be modified.
+
         Returns:
             dict: Function metadata excluding the executable field.
         """
-        return self.model_dump(exclude={'executable'})
+        self._update_def_cache()
+        return self._function_def
+
+    def get_function_def_json(self) -> str:
+        """
+        Returns the function definition serialized as JSON (cached like `get_function_def`).
+
+        Returns:
+            str: JSON function metadata excluding the executable field.
+        """
+        self._update_def_cache()
+        return self._function_def_json
 
     @staticmethod
     def _default_executable(**kwargs) -> Tuple[FunctionResultStatus, str, dict]:
@@ -89,10 +145,28 @@ class Function(BaseModel):
         """
         return FunctionResultStatus.DONE, "Default implementation - no action taken", {}
     
+    @staticmethod
+    def _process_args(args: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Extracts argument values from the nested dictionary structure returned by GAME.
+        """
+        processed_args = {}
+        for arg_name, arg_value in args.items():
+            if isinstance(arg_value, dict) and 'value' in arg_value:
+                processed_args[arg_name] = arg_value['value']
+            else:
+                processed_args[arg_name] = arg_value
+        return processed_args
+
     def execute(self, **kwds: Any) -> FunctionResult:
         """
         Executes the function with the provided arguments.
 
+        The executable runs as configured by `execution_policy` (inline by default).
+        Coroutine executables run on the long-lived background event loop of the SDK
+        (see `execution.get_background_loop`), whatever the policy executor.
+        The execution time is recorded in the histogram of `fn_name`.
+
         Args:
             **kwds: Keyword arguments including:
                 - fn_id: Function identifier
@@ -103,36 +177,136 @@ class Function(BaseModel):
 
         Raises:
             Any exceptions from the executable are caught and returned as a FAILED FunctionResult.
+            A timeout is returned as a FAILED FunctionResult as well.
         """
         fn_id = kwds.get('fn_id')
         args = kwds.get('args', {})
+        policy = self.execution_policy
+        started = time.perf_counter()
 
         try:
             # Extract values from the nested dictionary structure
-            processed_args = {}
-            for arg_name, arg_value in args.items():
-                if isinstance(arg_value, dict) and 'value' in arg_value:
-                    processed_args[arg_name] = arg_value['value']
-                else:
-                    processed_args[arg_name] = arg_value
-                    
+            processed_args = self._process_args(args)
+
             # print("Processed args: ", processed_args)
             # execute the function provided
-            status, feedback, info = self.executable(**processed_args)
-
-            return FunctionResult(
+            if inspect.iscoroutinefunction(self.executable):
+                future = submit_coroutine(self.executable(**processed_args))
+            elif policy is None or policy.is_inline:
+                future = None
+                status, feedback, info = self.executable(**processed_args)
+            else:
+                future = policy.get_executor().submit(self.executable, **processed_args)
+
+            if future is not None:
+                try:
+                    status, feedback, info = future.result(
+                        timeout=policy.timeout if policy is not None else None
+                    )
+                except concurrent.futures.TimeoutError:
+                    future.cancel()
+                    return self._timeout_result(fn_id, started)
+
+            result = FunctionResult(
                 action_id=fn_id,
                 action_status=status,
                 feedback_message=feedback,
                 info=info,
             )
         except Exception as e:
-            return FunctionResult(
+            result = self._failed_result(fn_id, e)
+
+        self._record_execution(result, started)
+        return result
+
+    async def aexecute(self, **kwds: Any) -> FunctionResult:
+        """
+        Asynchronous counterpart of `execute`.
+
+        Coroutine executables are awaited directly; regular executables are run in the
+        executor `execute` would use (`ExecutionPolicy.get_executor()`), or in the event
+        loop's default executor when `execute` would run them inline, so they do not
+        block other agents on the loop. The policy timeout applies to both.
+
+        Args:
+            **kwds: Same keyword arguments as `execute`.
+
+        Returns:
+            FunctionResult: Result of the function execution including status and feedback.
+        """
+        fn_id = kwds.get('fn_id')
+        args = kwds.get('args', {})
+        policy = self.execution_policy
+        started = time.perf_counter()
+
+        try:
+            processed_args = self._process_args(args)
+
+            if inspect.iscoroutinefunction(self.executable):
+                pending = self.executable(**processed_args)
+            else:
+                # the executor `execute` would use (an inline policy with a timeout runs in
+                # the shared thread pool); inline ones in the loop's default executor
+                executor = policy.get_executor() if policy is not None and not policy.is_inline else None
+                pending = asyncio.get_running_loop().run_in_executor(
+                    executor, functools.partial(self.executable, **processed_args)
+                )
+
+            try:
+                status, feedback, info = await asyncio.wait_for(
+                    pending, policy.timeout if policy is not None else None
+                )
+            except asyncio.TimeoutError:
+                return self._timeout_result(fn_id, started)
+
+            result = FunctionResult(
                 action_id=fn_id,
-                action_status=FunctionResultStatus.FAILED,
-                feedback_message=f"Error executing function: {str(e)}",
-                info={},
+                action_status=status,
+                feedback_message=feedback,
+                info=info,
             )
+        except Exception as e:
+            result = self._failed_result(fn_id, e)
+
+        self._record_execution(result, started)
+        return result
+
+    @staticmethod
+    def _failed_result(fn_id: Optional[str], e: Exception) -> FunctionResult:
+        return FunctionResult(
+            action_id=fn_id,
+            action_status=FunctionResultStatus.FAILED,
+            feedback_message=f"Error executing function: {str(e)}",
+            info={},
+        )
+
+    def _timeout_result(self, fn_id: Optional[str], started: float) -> FunctionResult:
+        elapsed = time.perf_counter() - started
+        record_execution(self.fn_name, elapsed, failed=True, timed_out=True)
+        return FunctionResult(
+            action_id=fn_id,
+            action_status=FunctionResultStatus.FAILED,
+            feedback_message=f"Function timed out after {self.execution_policy.timeout} seconds",
+            info={
+                "timed_out": True,
+                "timeout": self.execution_policy.timeout,
+                "elapsed": elapsed,
+            },
+        )
+
+    def _record_execution(self, result: FunctionResult, started: float):
+        record_execution(
+            self.fn_name,
+            time.perf_counter() - started,
+            failed=result.action_status == FunctionResultStatus.FAILED,
+        )
+
+def get_function_defs_json(functions: Iterable[Function]) -> RawJSON:
+    """
+    Returns the definitions of an action space as a pre-serialized JSON array,
+    built from the cached definition of each function.
+    """
+    return RawJSON("[" + ",".join(f.get_function_def_json() for f in functions) + "]")
 
 # Different ActionTypes returned by the GAME API
 class ActionType(Enum):
@@ -225,6 +399,81 @@ class AgentStateResponse:
     hlp: Optional[HLPResponse] = None
     current_task: Optional[CurrentTaskResponse] = None
 
+    @property
+    def hlp_changed(self) -> bool:
+        """Whether GAME generated a new high-level plan (and task) in this step"""
+        return bool(self.hlp and self.hlp.change_indicator)
+
+
+_hlp_adapter = TypeAdapter(Optional[HLPResponse])
+_current_task_adapter = TypeAdapter(Optional[CurrentTaskResponse])
+
+
+class LazyAgentStateResponse(AgentStateResponse):
+    """
+    AgentStateResponse that builds the plan log of `hlp` only when `hlp` is first
+    accessed.
+
+    The plan log grows over a session, while most steps never read it, so the
+    steady-state step skips building it. The rest of the agent state is validated
+    when the response is parsed (and the log checked to be a list of objects), so a
+    malformed response raises a pydantic ValidationError right away. It compares
+    equal to the AgentStateResponse with the same fields, and `dataclasses.replace`
+    works on it.
+
+    Args:
+        hlp (Optional[HLPResponse]): High-Level Plan response.
+        current_task (Optional[CurrentTaskResponse]): Current task response.
+    """
+
+    def __init__(self, hlp: Optional[HLPResponse] = None, current_task: Optional[CurrentTaskResponse] = None):
+        # frozen dataclass - bypass the generated __setattr__
+        object.__setattr__(self, "_hlp", hlp)
+        object.__setattr__(self, "_current_task", current_task)
+        object.__setattr__(self, "_log", None)
+
+    @classmethod
+    def from_raw(cls, raw: Dict[str, Any]) -> "LazyAgentStateResponse":
+        """
+        Builds the agent state from the `agent_state` object of an action response.
+
+        Raises:
+            pydantic.ValidationError: If the agent state is malformed.
+        """
+        hlp = raw.get("hlp")
+        log = hlp.get("log") if isinstance(hlp, dict) else None
+        if isinstance(log, list) and all(isinstance(entry, dict) for entry in log):
+            hlp = {key: value for key, value in hlp.items() if key != "log"}
+        else:
+            # no log, or a malformed one left to the validation
+            log = None
+
+        state = cls(_hlp_adapter.validate_python(hlp), _current_task_adapter.validate_python(raw.get("current_task")))
+        object.__setattr__(state, "_log", log)
+        return state
+
+    @property
+    def hlp(self) -> Optional[HLPResponse]:
+        if self._log is not None:
+            object.__setattr__(self, "_hlp", replace(self._hlp, log=list(self._log)))
+            object.__setattr__(self, "_log", None)
+        return self._hlp
+
+    @property
+    def current_task(self) -> Optional[CurrentTaskResponse]:
+        return self._current_task
+
+    @property
+    def hlp_changed(self) -> bool:
+        return bool(self._hlp and self._hlp.change_indicator)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, AgentStateResponse):
+            return NotImplemented
+        return (self.hlp, self.current_task) == (other.hlp, other.current_task)
+
+    __hash__ = AgentStateResponse.__hash__
+
 # ActionResponse format returned from GAME API call
 class ActionResponse(BaseModel):
     """
@@ -239,6 +488,34 @@ class ActionResponse(BaseModel):
     agent_state: AgentStateResponse
     action_args: Optional[Dict[str, Any]] = None
 
+    @classmethod
+    def from_api(cls, data: Dict[str, Any]) -> "ActionResponse":
+        """
+        Builds an ActionResponse from the `data` of a GAME API action response.
+
+        Faster than `model_validate` for the usual response shape: the agent state is a
+        LazyAgentStateResponse, which does not build the plan log up front. Other
+        shapes fall back to `model_validate`.
+        """
+        agent_state = data.get("agent_state")
+        action_args = data.get("action_args")
+        if (
+            not isinstance(agent_state, dict)
+            or not (action_args is None or isinstance(action_args, dict))
+        ):
+            return cls.model_validate(data)
+
+        try:
+            action_type = ActionType(data.get("action_type"))
+        except ValueError:
+            return cls.model_validate(data)  # raises a ValidationError
+
+        return cls.model_construct(
+            action_type=action_type,
+            agent_state=LazyAgentStateResponse.from_raw(agent_state),
+            action_args=action_args,
+        )
+
 
 class ChatActionRequest(BaseModel):
     fn_name: str
@@ -263,3 +540,44 @@ class ChatResponse(BaseModel):
     message: str
     is_finished: bool
     function_call: Optional[FunctionCallResponse] = None
+
+
+class TaskStatus(str, Enum):
+    """
+    Enum representing how a task submitted with `Worker.run_many` ended.
+
+    Values:
+        DONE: GAME ended the task
+        MAX_STEPS: The task was stopped after `max_steps` steps
+        FAILED: A step raised an exception
+        CANCELLED: `run_many` was closed before the task ended
+    """
+    DONE = "done"
+    MAX_STEPS = "max_steps"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+@dataclass(frozen=True)
+class TaskResult:
+    """
+    Result of a task run by `Worker.run_many` or `Worker.map`.
+
+    Attributes:
+        index (int): Position of the task in the submitted tasks.
+        task (str): The task.
+        status (TaskStatus): How the task ended.
+        steps (int): Number of steps taken.
+        submission_id (Optional[str]): Submission id of the task on the GAME API.
+        function_result (Optional[FunctionResult]): Result of the last function executed.
+        state (Optional[dict]): Worker state at the end of the task.
+        error (Optional[BaseException]): Exception raised by the failed step.
+    """
+    index: int
+    task: str
+    status: TaskStatus
+    steps: int
+    submission_id: Optional[str] = None
+    function_result: Optional[FunctionResult] = None
+    state: Optional[dict] = None
+    error: Optional[BaseException] = None
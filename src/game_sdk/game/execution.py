@@ -0,0 +1,250 @@
+import asyncio
+import bisect
+import concurrent.futures
+import contextvars
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+
+
+# upper bounds (seconds) of the execution time histogram buckets
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_shared_executors: Dict[str, Executor] = {}
+_shared_executors_lock = threading.Lock()
+
+# shared thread pools by kind: "thread" runs function executables and the work the
+# agents offload, "state" runs the state sources of ConcurrentState
+_THREAD_POOL_PREFIXES = {"thread": "game-sdk-function", "state": "game-sdk-state"}
+
+# kind of the shared thread pool the current thread belongs to, if any
+_pool_thread = threading.local()
+
+
+def _mark_pool_thread(kind: str):
+    _pool_thread.kind = kind
+
+
+def _get_shared_executor(kind: str) -> Executor:
+    with _shared_executors_lock:
+        executor = _shared_executors.get(kind)
+        if executor is None:
+            if kind in _THREAD_POOL_PREFIXES:
+                executor = ThreadPoolExecutor(
+                    thread_name_prefix=_THREAD_POOL_PREFIXES[kind],
+                    initializer=_mark_pool_thread,
+                    initargs=(kind,),
+                )
+            elif kind == "process":
+                executor = ProcessPoolExecutor()
+            else:
+                raise ValueError(f"Unknown executor: {kind}")
+            _shared_executors[kind] = executor
+        return executor
+
+
+def in_thread_pool(pool: str = "thread") -> bool:
+    """
+    Whether the caller runs on a thread of the shared thread pool `pool`. Such a
+    thread must not wait on work submitted to the same pool: once every thread of the
+    pool waits, the work never runs.
+    """
+    return getattr(_pool_thread, "kind", None) == pool
+
+
+def submit_to_thread_pool(fn: Callable[..., T], *args: Any, pool: str = "thread") -> "concurrent.futures.Future[T]":
+    """
+    Runs `fn(*args)` on a shared thread pool of the SDK ("thread" or "state"), in a
+    copy of the caller's context (so tracing spans opened by `fn` nest under the
+    caller's span)
+    """
+    if pool not in _THREAD_POOL_PREFIXES:
+        raise ValueError(f"Unknown thread pool: {pool}")
+    context = contextvars.copy_context()
+    return _get_shared_executor(pool).submit(context.run, fn, *args)
+
+
+_background_loop: Optional[asyncio.AbstractEventLoop] = None
+_background_loop_lock = threading.Lock()
+
+
+def get_background_loop() -> asyncio.AbstractEventLoop:
+    """
+    Returns the long-lived event loop of the SDK, started on a daemon thread on first use.
+
+    Coroutine executables called through the synchronous `Function.execute` (and the
+    async-backed plugins) run on this loop, instead of creating a new loop per call.
+    """
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None or _background_loop.is_closed():
+            loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=loop.run_forever, name="game-sdk-event-loop", daemon=True
+            ).start()
+            _background_loop = loop
+        return _background_loop
+
+
+def in_background_loop() -> bool:
+    """Whether the caller runs on the thread of the background event loop"""
+    loop = _background_loop
+    if loop is None:
+        return False
+    try:
+        return asyncio.get_running_loop() is loop
+    except RuntimeError:
+        return False
+
+
+def submit_coroutine(coro: Awaitable[T]) -> "concurrent.futures.Future[T]":
+    """Schedules a coroutine on the background event loop and returns its future"""
+    if in_background_loop():
+        coro.close()
+        raise RuntimeError(
+            "Cannot wait for a coroutine from the background event loop itself, await it instead"
+        )
+    return asyncio.run_coroutine_threadsafe(coro, get_background_loop())
+
+
+def run_coroutine_sync(coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+    """
+    Runs a coroutine on the background event loop and blocks until it completes.
+
+    Unlike `asyncio.run`, this works whether or not the calling thread already runs an
+    event loop, and reuses one loop (and the connections bound to it) for every call.
+
+    Raises:
+        concurrent.futures.TimeoutError: If the coroutine did not complete within
+            `timeout` seconds. The coroutine is cancelled.
+    """
+    future = submit_coroutine(coro)
+    try:
+        return future.result(timeout=timeout)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise
+
+
+@dataclass
+class ExecutionPolicy:
+    """
+    Controls how a Function's executable is run.
+
+    Attributes:
+        timeout (Optional[float]): Seconds after which the execution is abandoned and a
+            FAILED FunctionResult is returned. A timed out executable cannot be
+            interrupted: if it already started, it finishes in the background and its
+            result is discarded; if it is still queued, it is cancelled.
+        executor (Any): Where the executable runs - "inline" (in the calling thread),
+            "thread" or "process" (shared pools of the SDK), or any
+            `concurrent.futures.Executor`. Process pools require a picklable executable.
+            An inline executable with a timeout runs in the shared thread pool.
+
+    Example:
+        ```python
+        search = Function(
+            fn_name="search_tweets",
+            ...,
+            execution_policy=ExecutionPolicy(timeout=20, executor="thread"),
+        )
+        ```
+    """
+    timeout: Optional[float] = None
+    executor: Any = "inline"
+
+    @property
+    def is_inline(self) -> bool:
+        return self.executor == "inline" and self.timeout is None
+
+    def get_executor(self) -> Executor:
+        """Returns the executor the executable is submitted to"""
+        if isinstance(self.executor, Executor):
+            return self.executor
+        if self.executor == "inline":
+            return _get_shared_executor("thread")
+        return _get_shared_executor(self.executor)
+
+
+class ExecutionHistogram:
+    """
+    Bucketed histogram of the execution times of one function.
+
+    Attributes:
+        buckets (Sequence[float]): Upper bounds of the buckets in seconds (plus an implicit +inf bucket).
+        counts (List[int]): Number of executions per bucket.
+        count (int): Total number of executions.
+        total (float): Sum of the execution times.
+        max (float): Longest execution time.
+        failures (int): Number of executions that returned FAILED.
+        timeouts (int): Number of executions that timed out.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts: List[int] = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.failures = 0
+        self.timeouts = 0
+
+    def observe(self, seconds: float, failed: bool = False, timed_out: bool = False):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.failures += failed
+        self.timeouts += timed_out
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Returns the upper bound of the bucket holding the q-th percentile (0 < q <= 100)"""
+        if not self.count:
+            return None
+        rank = q / 100 * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return self.buckets[i] if i < len(self.buckets) else self.max
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "p50": self.percentile(50),
+            "p99": self.percentile(99),
+            "max": self.max,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "buckets": dict(zip([*map(str, self.buckets), "+inf"], self.counts)),
+        }
+
+
+_histograms: Dict[str, ExecutionHistogram] = {}
+_histograms_lock = threading.Lock()
+
+
+def record_execution(fn_name: str, seconds: float, failed: bool = False, timed_out: bool = False):
+    """Records the execution time of a function in its histogram"""
+    with _histograms_lock:
+        histogram = _histograms.get(fn_name)
+        if histogram is None:
+            histogram = _histograms[fn_name] = ExecutionHistogram()
+        histogram.observe(seconds, failed, timed_out)
+
+
+def get_execution_stats() -> Dict[str, Dict[str, Any]]:
+    """Returns the execution time histograms of all functions, keyed by fn_name"""
+    with _histograms_lock:
+        return {fn_name: h.to_dict() for fn_name, h in _histograms.items()}
+
+
+def reset_execution_stats():
+    """Clears all execution time histograms"""
+    with _histograms_lock:
+        _histograms.clear()
@@ -0,0 +1,182 @@
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+
+class RemoteIdCache:
+    """
+    Thread-safe cache of the ids of remote agents and worker maps, keyed by the
+    fingerprint of the configuration they were created from.
+
+    Agents and workers constructed with an identical configuration (same API key,
+    name, description, goal or worker descriptions) then look their remote id up
+    instead of creating it again. Concurrent lookups of a missing fingerprint wait on
+    a single creation.
+
+    Agents sharing a cached id share the remote agent: give the agents that run at
+    the same time distinct names, or do not share a cache between them.
+
+    Args:
+        path (Optional[str]): JSON file the cache is loaded from and saved to, so ids
+            survive restarts. None keeps the cache in memory.
+        ttl (Optional[float]): Seconds after which a cached id is created again.
+            None keeps ids until they are invalidated.
+
+    Attributes:
+        hits (int): Number of lookups served from the cache.
+        misses (int): Number of lookups that created a remote id.
+
+    Example:
+        ```python
+        id_cache = RemoteIdCache("remote_ids.json", ttl=7 * 24 * 3600)
+        agent = Agent(..., id_cache=id_cache)
+        agent.compile()  # no API call if this agent and its workers were created before
+        ```
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: Optional[float] = None):
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be positive (or None to never expire)")
+
+        self.path = path
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        # fingerprint -> {"id": remote id, "created_at": unix time}
+        self._entries: Dict[str, Dict] = {}
+        self._creating: Dict[str, threading.Lock] = {}
+        # creations awaited by `aget_or_create`, resolved with the remote id
+        self._acreating: Dict[str, "asyncio.Future[str]"] = {}
+
+        self.hits = 0
+        self.misses = 0
+
+        if path is not None and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self._entries = json.load(f)
+
+    def _is_fresh(self, entry: Dict) -> bool:
+        return self.ttl is None or time.time() - entry["created_at"] < self.ttl
+
+    def get(self, fingerprint: str) -> Optional[str]:
+        """Returns the remote id cached for `fingerprint`, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry is None or not self._is_fresh(entry):
+                return None
+            self.hits += 1
+            return entry["id"]
+
+    def put(self, fingerprint: str, remote_id: str):
+        """Caches the remote id created for `fingerprint`"""
+        with self._lock:
+            self._entries[fingerprint] = {"id": remote_id, "created_at": time.time()}
+            self._save()
+
+    def get_or_create(self, fingerprint: str, create: Callable[[], str]) -> str:
+        """
+        Returns the remote id cached for `fingerprint`, calling `create` (once, even
+        for concurrent callers) to create it if missing or expired.
+        """
+        remote_id = self.get(fingerprint)
+        if remote_id is not None:
+            return remote_id
+
+        with self._lock:
+            creating = self._creating.setdefault(fingerprint, threading.Lock())
+
+        with creating:
+            # created by the caller that held the lock before us
+            remote_id = self.get(fingerprint)
+            if remote_id is not None:
+                return remote_id
+
+            remote_id = create()
+            with self._lock:
+                self._created(fingerprint, remote_id)
+                self._creating.pop(fingerprint, None)
+            return remote_id
+
+    async def aget_or_create(self, fingerprint: str, create: Callable[[], Awaitable[str]]) -> str:
+        """
+        Asynchronous counterpart of `get_or_create`: awaits `create` (once, even for
+        concurrent coroutines of the event loop) if the remote id is missing or expired.
+        """
+        remote_id = self.get(fingerprint)
+        if remote_id is not None:
+            return remote_id
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            creating = self._acreating.get(fingerprint)
+            if creating is None or creating.get_loop() is not loop:
+                creating = None
+                future = self._acreating[fingerprint] = loop.create_future()
+
+        if creating is not None:
+            try:
+                return await asyncio.shield(creating)
+            except asyncio.CancelledError:
+                if not creating.cancelled():
+                    raise
+                # the creating coroutine was cancelled, not this one: create it here
+                return await self.aget_or_create(fingerprint, create)
+
+        try:
+            # created by `get_or_create` in the meantime
+            remote_id = self.get(fingerprint)
+            if remote_id is None:
+                remote_id = await create()
+                with self._lock:
+                    self._created(fingerprint, remote_id)
+            future.set_result(remote_id)
+            return remote_id
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # raised here - the waiting coroutines, if any, get it as well
+            future.exception()
+            raise
+        finally:
+            with self._lock:
+                if self._acreating.get(fingerprint) is future:
+                    del self._acreating[fingerprint]
+
+    def _created(self, fingerprint: str, remote_id: str):
+        # called with the lock held
+        self.misses += 1
+        self._entries[fingerprint] = {"id": remote_id, "created_at": time.time()}
+        self._save()
+
+    def invalidate(self, fingerprint: Optional[str] = None):
+        """
+        Drops the id cached for `fingerprint` (e.g. after the remote agent was deleted),
+        or every cached id if None
+        """
+        with self._lock:
+            if fingerprint is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(fingerprint, None)
+            self._save()
+
+    def _save(self):
+        # called with the lock held; the file is replaced atomically
+        if self.path is None:
+            return
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
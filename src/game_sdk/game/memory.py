@@ -0,0 +1,243 @@
+import collections
+import json
+import logging
+import os
+import tempfile
+import threading
+import uuid
+from typing import Any, Deque, Dict, Optional, Set, Tuple
+
+from game_sdk.game.custom_types import FunctionResult
+from game_sdk.log import get_logger, log_fields
+
+logger = get_logger(__name__)
+
+# key of the handle left in place of a spilled `info` dict
+SPILLED_KEY = "$spilled"
+TRUNCATED_MARKER = "...[truncated]"
+
+# strings shorter than this are never truncated
+_MIN_STRING_LENGTH = 64
+
+
+def json_size(value: Any) -> int:
+    """Returns the size of `value` serialized as JSON (what it weighs in an action request)"""
+    return len(json.dumps(value, default=str, separators=(",", ":")))
+
+
+def is_spilled(info: Any) -> bool:
+    """Whether `info` is the handle of a spilled function result info"""
+    return isinstance(info, dict) and SPILLED_KEY in info
+
+
+def load_spilled(handle: Dict[str, Any]) -> Any:
+    """
+    Loads a spilled function result info back from disk.
+
+    Raises:
+        FileNotFoundError: If the spill file was already removed (see `max_spill_files`).
+    """
+    with open(handle[SPILLED_KEY], "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _largest(value: Any, path: Tuple = ()) -> Tuple[int, Optional[Tuple]]:
+    """Returns the size and path of the largest list or string of `value` that can be shrunk"""
+    best_size, best_path = 0, None
+    if isinstance(value, dict):
+        children = value.items()
+    elif isinstance(value, list):
+        if len(value) > 1:
+            best_size, best_path = json_size(value), path
+        children = enumerate(value)
+    else:
+        if isinstance(value, str) and len(value) > _MIN_STRING_LENGTH:
+            return json_size(value), path
+        return 0, None
+
+    for key, child in children:
+        size, child_path = _largest(child, path + (key,))
+        # a child is only preferred when strictly larger, so outer lists are shrunk first
+        if child_path is not None and size > best_size:
+            best_size, best_path = size, child_path
+    return best_size, best_path
+
+
+def _replace(value: Any, path: Tuple, new: Any) -> Any:
+    """Returns a copy of `value` with the node at `path` replaced (only the path is copied)"""
+    if not path:
+        return new
+    copied = dict(value) if isinstance(value, dict) else list(value)
+    copied[path[0]] = _replace(value[path[0]], path[1:], new)
+    return copied
+
+
+def _get(value: Any, path: Tuple) -> Any:
+    for key in path:
+        value = value[key]
+    return value
+
+
+def truncate(value: Any, max_bytes: int) -> Tuple[Any, bool]:
+    """
+    Shrinks `value` until it weighs at most `max_bytes` of JSON, by repeatedly halving
+    its largest list (dropping the oldest, first items) or string (keeping the start).
+
+    The value is not modified: the truncated value is a copy sharing the untouched
+    parts. It may still exceed `max_bytes` if nothing is left to shrink.
+
+    Returns:
+        Tuple[Any, bool]: The (possibly) truncated value and whether it was truncated.
+    """
+    truncated = False
+    while json_size(value) > max_bytes:
+        _, path = _largest(value)
+        if path is None:
+            break
+        node = _get(value, path)
+        if isinstance(node, list):
+            shrunk = node[len(node) // 2:]
+        else:
+            shrunk = node[:len(node) // 2] + TRUNCATED_MARKER
+        value = _replace(value, path, shrunk)
+        truncated = True
+    return value, truncated
+
+
+class MemoryBudget:
+    """
+    Bounds the memory held by long-running agents and workers.
+
+    Function results with a large `info` dict have it written to a spill file, and
+    the state functions receive a small handle instead (`{"$spilled": path, "bytes": n}`,
+    see `is_spilled` and `load_spilled`). Agent and worker states larger than
+    `max_state_bytes` are truncated (largest lists first, keeping the newest items),
+    so histories accumulated by state functions cannot grow forever. Sizes are
+    measured as serialized JSON, i.e. as sent to the GAME API.
+
+    A budget can be shared by several agents and workers.
+
+    Args:
+        max_state_bytes (Optional[int]): Size above which states are truncated.
+        max_info_bytes (Optional[int]): Size above which function result infos are spilled.
+        spill_dir (Optional[str]): Directory of the spill files, a new temporary
+            directory by default.
+        max_spill_files (int): Number of spill files kept; the oldest are removed.
+
+    Attributes:
+        spilled (int): Number of function result infos spilled.
+        spilled_bytes (int): Total size of the spilled infos.
+        truncated (int): Number of states truncated.
+
+    Example:
+        ```python
+        budget = MemoryBudget(max_state_bytes=64_000, max_info_bytes=16_000)
+        agent = Agent(..., memory_budget=budget)
+        ```
+    """
+
+    def __init__(
+        self,
+        max_state_bytes: Optional[int] = None,
+        max_info_bytes: Optional[int] = None,
+        spill_dir: Optional[str] = None,
+        max_spill_files: int = 1000,
+    ):
+        if max_state_bytes is not None and max_state_bytes <= 0:
+            raise ValueError("max_state_bytes must be positive")
+        if max_info_bytes is not None and max_info_bytes <= 0:
+            raise ValueError("max_info_bytes must be positive")
+        if max_spill_files < 1:
+            raise ValueError("max_spill_files must be at least 1")
+
+        self.max_state_bytes = max_state_bytes
+        self.max_info_bytes = max_info_bytes
+        self.max_spill_files = max_spill_files
+        self._spill_dir = spill_dir
+
+        self._lock = threading.Lock()
+        self._spill_files: Deque[str] = collections.deque()
+        # owners already warned about, later truncations are only logged at DEBUG
+        self._warned: Set[str] = set()
+
+        self.spilled = 0
+        self.spilled_bytes = 0
+        self.truncated = 0
+
+    @property
+    def spill_dir(self) -> str:
+        with self._lock:
+            if self._spill_dir is None:
+                self._spill_dir = tempfile.mkdtemp(prefix="game-sdk-spill-")
+            else:
+                os.makedirs(self._spill_dir, exist_ok=True)
+            return self._spill_dir
+
+    def limit_function_result(self, function_result: Optional[FunctionResult]) -> Optional[FunctionResult]:
+        """Returns the function result with its `info` spilled to disk if it is too large"""
+        if (
+            self.max_info_bytes is None
+            or function_result is None
+            or not function_result.info
+            or is_spilled(function_result.info)
+        ):
+            return function_result
+
+        data = json.dumps(function_result.info, default=str)
+        if len(data) <= self.max_info_bytes:
+            return function_result
+
+        path = os.path.join(self.spill_dir, f"{uuid.uuid4().hex}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(data)
+
+        with self._lock:
+            self.spilled += 1
+            self.spilled_bytes += len(data)
+            self._spill_files.append(path)
+            expired = []
+            while len(self._spill_files) > self.max_spill_files:
+                expired.append(self._spill_files.popleft())
+        for expired_path in expired:
+            try:
+                os.remove(expired_path)
+            except FileNotFoundError:
+                pass
+
+        logger.debug(
+            "Function result info spilled to %s (%d bytes)",
+            path,
+            len(data),
+            extra=log_fields(action_id=function_result.action_id, bytes=len(data)),
+        )
+        return function_result.model_copy(update={"info": {SPILLED_KEY: path, "bytes": len(data)}})
+
+    def limit_state(self, state: Any, owner: str) -> Any:
+        """Returns the state, truncated if it is larger than `max_state_bytes`"""
+        if self.max_state_bytes is None:
+            return state
+
+        state, truncated = truncate(state, self.max_state_bytes)
+        if truncated:
+            with self._lock:
+                self.truncated += 1
+                first = owner not in self._warned
+                self._warned.add(owner)
+            logger.log(
+                logging.WARNING if first else logging.DEBUG,
+                "State of %s truncated to %d bytes",
+                owner,
+                self.max_state_bytes,
+                extra=log_fields(owner=owner, max_state_bytes=self.max_state_bytes),
+            )
+        return state
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the number and size of the spilled infos and the number of truncated states"""
+        with self._lock:
+            return {
+                "spilled": self.spilled,
+                "spilled_bytes": self.spilled_bytes,
+                "spill_files": len(self._spill_files),
+                "truncated": self.truncated,
+            }
@@ -0,0 +1,244 @@
+import hashlib
+import json
+import threading
+import time
+from enum import Enum
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from game_sdk.game.serialization import RawJSON
+
+
+class PayloadMode(str, Enum):
+    """
+    Encoding of the large sections of action request payloads.
+
+    Values:
+        FULL: Always send every section in full (what the GAME API expects by default).
+        HASH: Send a content hash instead of a section that did not change.
+        DELTA: Like HASH, and send only the changed keys of a dict section that changed.
+    """
+    FULL = "full"
+    HASH = "hash"
+    DELTA = "delta"
+
+
+# sections of the agent/worker action payloads that can be large and rarely change
+DEFAULT_SECTIONS = ("environment", "agent_state", "observations", "functions")
+
+
+def _digest(section_json: str) -> str:
+    return hashlib.blake2b(section_json.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _serialize_section(value: Any) -> Tuple[str, Optional[Dict[str, str]]]:
+    """
+    Returns the JSON of a section and, for dicts with string keys, the JSON of each value
+    (so the section is serialized only once, whatever the encoding).
+    """
+    if isinstance(value, RawJSON):
+        return value.json, None
+    if isinstance(value, dict) and all(isinstance(k, str) for k in value):
+        items = {k: json.dumps(v, allow_nan=False) for k, v in value.items()}
+        return _join_items(items), items
+    return json.dumps(value, allow_nan=False), None
+
+
+def _join_items(items: Dict[str, str]) -> str:
+    return "{" + ",".join(f"{json.dumps(k)}:{v}" for k, v in items.items()) + "}"
+
+
+class _SectionState:
+    __slots__ = ("digest", "items")
+
+    def __init__(self, digest: str, items: Optional[Dict[str, str]]):
+        self.digest = digest
+        self.items = items
+
+
+class PayloadEncoder:
+    """
+    Client-side encoder that avoids resending unchanged payload sections.
+
+    The encoder remembers the last payload sent on each stream (one stream per agent or
+    worker). In HASH mode an unchanged section is replaced by `{"$hash": <digest>}`;
+    in DELTA mode a changed dict section is sent as
+    `{"$delta": {"base": <previous digest>, "hash": <new digest>, "set": {...}, "unset": [...]}}`
+    when that is smaller than the full section. Encoded payloads carry a
+    `payload_encoding` field (with the digests of the sections sent in full) and can be
+    rebuilt with PayloadDecoder.
+
+    Only use HASH or DELTA with a backend that supports them. FULL mode sends
+    unmodified payloads and only records the size and timing metrics.
+
+    Args:
+        mode (PayloadMode): Encoding of the tracked sections.
+        sections (Sequence[str]): Payload keys that are tracked.
+
+    Example:
+        ```python
+        encoder = PayloadEncoder(PayloadMode.DELTA)
+        agent = Agent(..., payload_encoder=encoder)
+        ...
+        print(encoder.stats())  # full vs. sent bytes and encoding time
+        ```
+    """
+
+    def __init__(self, mode: PayloadMode = PayloadMode.FULL, sections: Sequence[str] = DEFAULT_SECTIONS):
+        self.mode = PayloadMode(mode)
+        self.sections = tuple(sections)
+
+        self._lock = threading.Lock()
+        self._streams: Dict[str, Dict[str, _SectionState]] = {}
+
+        self.requests = 0
+        self.full_bytes = 0
+        self.sent_bytes = 0
+        self.encode_seconds = 0.0
+
+    @property
+    def idempotent(self) -> bool:
+        """
+        Whether an encoded payload can be sent again (FULL mode). HASH and DELTA
+        payloads refer to the previous ones, so a resent payload may desync the stream.
+        """
+        return self.mode == PayloadMode.FULL
+
+    def encode(self, stream_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Returns a copy of `data` with the tracked sections pre-serialized (as RawJSON)
+        and, depending on the mode, replaced by a hash or a delta.
+        """
+        started = time.perf_counter()
+        encoded = dict(data)
+        full_bytes = sent_bytes = 0
+        # digests of the sections sent in full, so the backend does not need to rehash them
+        hashes: Dict[str, str] = {}
+
+        with self._lock:
+            previous = self._streams.setdefault(stream_id, {})
+
+        for name in self.sections:
+            if name not in data:
+                continue
+
+            section_json, items = _serialize_section(data[name])
+            out = section_json
+
+            if self.mode != PayloadMode.FULL:
+                digest = _digest(section_json)
+                prev = previous.get(name)
+                if prev is not None and prev.digest == digest:
+                    out = json.dumps({"$hash": digest})
+                elif (
+                    self.mode == PayloadMode.DELTA
+                    and prev is not None
+                    and items is not None
+                    and prev.items is not None
+                ):
+                    changed = {k: v for k, v in items.items() if prev.items.get(k) != v}
+                    removed = [k for k in prev.items if k not in items]
+                    delta = (
+                        f'{{"$delta":{{"base":"{prev.digest}","hash":"{digest}",'
+                        f'"set":{_join_items(changed)},"unset":{json.dumps(removed)}}}}}'
+                    )
+                    if len(delta) < len(section_json):
+                        out = delta
+                if out is section_json:
+                    hashes[name] = digest
+                previous[name] = _SectionState(digest, items)
+
+            encoded[name] = RawJSON(out)
+            full_bytes += len(section_json)
+            sent_bytes += len(out)
+
+        if self.mode != PayloadMode.FULL:
+            encoded["payload_encoding"] = {
+                "version": 1,
+                "mode": self.mode.value,
+                "hashes": hashes,
+            }
+
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.requests += 1
+            self.full_bytes += full_bytes
+            self.sent_bytes += sent_bytes
+            self.encode_seconds += elapsed
+
+        return encoded
+
+    def reset(self, stream_id: Optional[str] = None):
+        """
+        Forgets the last payload of a stream (or of all streams), so the next payload is
+        sent in full. Call it when a request may not have reached the backend.
+        """
+        with self._lock:
+            if stream_id is None:
+                self._streams.clear()
+            else:
+                self._streams.pop(stream_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the size (in characters of JSON) and timing metrics of the tracked sections"""
+        with self._lock:
+            return {
+                "mode": self.mode.value,
+                "requests": self.requests,
+                "full_bytes": self.full_bytes,
+                "sent_bytes": self.sent_bytes,
+                "saved_ratio": (
+                    1 - self.sent_bytes / self.full_bytes if self.full_bytes else 0.0
+                ),
+                "encode_seconds": self.encode_seconds,
+            }
+
+
+class PayloadDecoder:
+    """
+    Rebuilds full payloads from the output of PayloadEncoder (backend side).
+
+    Useful in a local mock server to check that the full state can be reconstructed.
+    """
+
+    def __init__(self):
+        self._streams: Dict[str, Dict[str, Tuple[str, Any]]] = {}
+
+    def decode(self, stream_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Returns `data` with every hashed or delta-encoded section replaced by its full value.
+
+        Raises:
+            ValueError: If a section refers to a payload this decoder has not seen.
+        """
+        if "payload_encoding" not in data:
+            return data
+
+        decoded = dict(data)
+        hashes = decoded.pop("payload_encoding").get("hashes", {})
+        previous = self._streams.setdefault(stream_id, {})
+
+        for name, value in data.items():
+            if name == "payload_encoding":
+                continue
+
+            prev = previous.get(name)
+            if isinstance(value, dict) and set(value) == {"$hash"}:
+                if prev is None or prev[0] != value["$hash"]:
+                    raise ValueError(f"Unknown base for section '{name}' of stream '{stream_id}'")
+                decoded[name] = prev[1]
+                continue
+
+            if isinstance(value, dict) and set(value) == {"$delta"}:
+                delta = value["$delta"]
+                if prev is None or prev[0] != delta["base"]:
+                    raise ValueError(f"Unknown base for section '{name}' of stream '{stream_id}'")
+                rebuilt = {k: v for k, v in prev[1].items() if k not in delta["unset"]}
+                rebuilt.update(delta["set"])
+                decoded[name] = rebuilt
+                previous[name] = (delta["hash"], rebuilt)
+                continue
+
+            if name in hashes:
+                previous[name] = (hashes[name], value)
+
+        return decoded
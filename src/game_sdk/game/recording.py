@@ -0,0 +1,241 @@
+import collections
+import gzip
+import json
+import threading
+import time
+from typing import Any, Deque, Dict, IO, Optional, Tuple
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from game_sdk.game.transport import Transport, get_default_transport
+
+REDACTED = "<redacted>"
+
+# headers and JSON keys (compared lowercased) whose values are never written to a recording
+SECRET_HEADERS = frozenset({"x-api-key", "authorization", "cookie", "set-cookie"})
+SECRET_KEYS = frozenset({"accesstoken", "apikey", "api_key", "x-api-key", "authorization", "password", "secret"})
+
+
+class ReplayError(Exception):
+    """Raised when a replayed request has no recorded response left"""
+
+
+def _open(path: str, mode: str) -> IO[str]:
+    # gzip files can be appended to: each session adds a gzip member
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _redact(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {
+            k: REDACTED if k.lower() in SECRET_KEYS else _redact(v)
+            for k, v in value.items()
+        }
+    if isinstance(value, list):
+        return [_redact(v) for v in value]
+    return value
+
+
+def _redact_headers(headers: Any) -> Dict[str, str]:
+    return {
+        k: REDACTED if k.lower() in SECRET_HEADERS else v
+        for k, v in (headers or {}).items()
+    }
+
+
+def _decode_body(body: Any) -> Tuple[str, Any]:
+    """Returns a recorded body as ("json", value), ("text", str) or ("none", None)"""
+    if body is None or body == b"":
+        return "none", None
+    if isinstance(body, bytes):
+        try:
+            body = body.decode("utf-8")
+        except UnicodeDecodeError:
+            return "text", body.decode("latin-1")
+    if isinstance(body, str):
+        try:
+            return "json", _redact(json.loads(body))
+        except ValueError:
+            return "text", body
+    return "json", _redact(body)
+
+
+def _request_key(method: str, url: str, body: Any) -> Tuple[str, str, Optional[str]]:
+    """
+    Key matching a request to its recorded responses: method, URL and, for the v1
+    `/prompts` proxy (where every call has the same URL), the proxied route.
+    """
+    route = None
+    if isinstance(body, dict) and isinstance(body.get("data"), dict):
+        route = body["data"].get("route")
+    return method.upper(), url, route
+
+
+class RecordingTransport(Transport):
+    """
+    Transport that records every exchange with the GAME API into an append-only
+    JSON lines file, for ReplayTransport.
+
+    Each line holds the request (method, URL, headers, body), the response (status,
+    headers, body) and the latency. API keys, authorization headers and access tokens
+    are replaced by "<redacted>". Paths ending with ".gz" are gzip-compressed.
+
+    Args:
+        path (str): File the exchanges are appended to.
+        transport (Optional[Transport]): Transport sending the requests,
+            defaults to the process-wide shared transport.
+
+    Example:
+        ```python
+        with RecordingTransport("session.jsonl.gz") as transport:
+            agent = Agent(..., transport=transport)
+            agent.compile()
+            for _ in range(10):
+                agent.step()
+        ```
+    """
+
+    def __init__(self, path: str, transport: Optional[Transport] = None):
+        self.path = path
+        self.transport = transport or get_default_transport()
+
+        self._lock = threading.Lock()
+        self._file = _open(path, "a")
+
+    def request(self, method: str, url: str, idempotent: Optional[bool] = None, **kwargs: Any) -> requests.Response:
+        started_at = time.time()
+        started = time.perf_counter()
+        response = self.transport.request(method, url, idempotent=idempotent, **kwargs)
+        elapsed = time.perf_counter() - started
+
+        body = kwargs.get("json") if kwargs.get("json") is not None else kwargs.get("data")
+        request_format, request_body = _decode_body(body)
+        response_format, response_body = _decode_body(response.content)
+
+        entry = {
+            "time": started_at,
+            "elapsed": elapsed,
+            "method": method.upper(),
+            "url": url,
+            "request": {
+                "headers": _redact_headers(kwargs.get("headers")),
+                "format": request_format,
+                "body": request_body,
+            },
+            "response": {
+                "status": response.status_code,
+                "reason": response.reason,
+                "headers": {"Content-Type": response.headers.get("Content-Type", "")},
+                "format": response_format,
+                "body": response_body,
+            },
+        }
+        line = json.dumps(entry, separators=(",", ":"), default=str)
+
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+        return response
+
+    def close(self):
+        """Closes the recording file (the wrapped transport is left open)"""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+class ReplayTransport(Transport):
+    """
+    Transport that answers requests with the responses of a recording, without any network.
+
+    Requests are matched to the recorded exchanges by method and URL (and route, for
+    the v1 `/prompts` proxy), and each match returns the next recorded response in
+    order. Since the ids returned when the agents were created are replayed too,
+    a replayed Agent, Worker or ChatAgent sends the same sequence of requests as the
+    recorded one.
+
+    Args:
+        path (str): Recording written by RecordingTransport.
+        speed (Optional[float]): None replays instantly; otherwise each response is
+            delayed by its recorded latency divided by `speed` (1.0 is real time).
+        loop (bool): Start over from the first recorded response of a request once all
+            of them were replayed, instead of raising ReplayError (e.g. for load tests).
+
+    Example:
+        ```python
+        agent = Agent(..., transport=ReplayTransport("session.jsonl.gz", speed=10))
+        ```
+    """
+
+    def __init__(self, path: str, speed: Optional[float] = None, loop: bool = False):
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be positive (or None to replay instantly)")
+
+        self.path = path
+        self.speed = speed
+        self.loop = loop
+
+        self._lock = threading.Lock()
+        self._recorded: Dict[Tuple[str, str, Optional[str]], list] = collections.defaultdict(list)
+        self._pending: Dict[Tuple[str, str, Optional[str]], Deque[Dict[str, Any]]] = {}
+
+        with _open(path, "r") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                key = _request_key(entry["method"], entry["url"], entry["request"]["body"])
+                self._recorded[key].append(entry)
+
+        for key, entries in self._recorded.items():
+            self._pending[key] = collections.deque(entries)
+
+    def request(self, method: str, url: str, idempotent: Optional[bool] = None, **kwargs: Any) -> requests.Response:
+        body = kwargs.get("json") if kwargs.get("json") is not None else kwargs.get("data")
+        _, request_body = _decode_body(body)
+        key = _request_key(method, url, request_body)
+
+        with self._lock:
+            pending = self._pending.get(key)
+            if not pending and self.loop and self._recorded.get(key):
+                pending = self._pending[key] = collections.deque(self._recorded[key])
+            if not pending:
+                raise ReplayError(f"No recorded response left for {method.upper()} {url}" + (
+                    f" (route {key[2]})" if key[2] else ""
+                ))
+            entry = pending.popleft()
+
+        if self.speed is not None:
+            time.sleep(entry["elapsed"] / self.speed)
+
+        return self._build_response(url, entry["response"])
+
+    def remaining(self) -> int:
+        """Returns the number of recorded responses not replayed yet"""
+        with self._lock:
+            return sum(len(pending) for pending in self._pending.values())
+
+    def close(self):
+        """Nothing to release - the recording is read when the transport is created"""
+
+    @staticmethod
+    def _build_response(url: str, recorded: Dict[str, Any]) -> requests.Response:
+        response = requests.Response()
+        response.status_code = recorded["status"]
+        response.reason = recorded.get("reason")
+        response.headers = CaseInsensitiveDict(recorded.get("headers") or {})
+        response.url = url
+        response.encoding = "utf-8"
+
+        body = recorded.get("body")
+        if recorded.get("format") == "json":
+            response._content = json.dumps(body).encode("utf-8")
+        elif body is not None:
+            response._content = body.encode("utf-8")
+        else:
+            response._content = b""
+        return response
@@ -0,0 +1,466 @@
+import email.utils
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Optional
+from urllib.parse import urlsplit
+
+import requests
+import urllib3
+
+from game_sdk.game.transport import Transport, get_default_transport
+from game_sdk.log import get_logger, log_fields
+
+logger = get_logger(__name__)
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is refused because the circuit of its host is open"""
+
+
+class RateLimitTimeout(Exception):
+    """Raised when no rate limiter token became available within the timeout"""
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Returns the delay in seconds of a Retry-After header (seconds or HTTP date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date is None:
+        return None
+    return max(0.0, date.timestamp() - time.time())
+
+
+def _is_connect_error(error: BaseException) -> bool:
+    """Whether the request failed before it was sent (so it is safe to retry any request)"""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    if isinstance(error, requests.exceptions.ConnectionError):
+        reason = getattr(error.args[0], "reason", None) if error.args else None
+        # includes its subclasses, e.g. NameResolutionError
+        return isinstance(reason, urllib3.exceptions.NewConnectionError)
+    return False
+
+
+class RetryPolicy:
+    """
+    When and how long to wait before retrying a failed request.
+
+    Idempotent requests are retried on the `retry_statuses` and on connection errors.
+    Other requests are only retried when they cannot have been processed: on 429 and
+    when the connection could not be established.
+
+    Args:
+        max_retries (int): Retries after the first attempt.
+        backoff_base (float): Delay in seconds before the first retry (doubled for every
+            further retry).
+        backoff_max (float): Upper bound of the backoff delay.
+        jitter (bool): Draw each delay uniformly between 0 and the backoff ("full
+            jitter"), so that clients failing together do not retry together.
+        retry_statuses (Iterable[int]): Response statuses that are retried.
+        respect_retry_after (bool): Wait as long as the Retry-After header of a 429/503
+            response asks (up to `max_retry_after`).
+        max_retry_after (float): Longest Retry-After delay honoured, in seconds.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        jitter: bool = True,
+        retry_statuses: Iterable[int] = (429, 500, 502, 503, 504),
+        respect_retry_after: bool = True,
+        max_retry_after: float = 60.0,
+    ):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.retry_statuses: FrozenSet[int] = frozenset(retry_statuses)
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after = max_retry_after
+
+    def should_retry(
+        self,
+        attempt: int,
+        idempotent: bool,
+        response: Optional[requests.Response] = None,
+        error: Optional[BaseException] = None,
+    ) -> bool:
+        """Whether to retry after the given (0-based) attempt failed"""
+        if attempt >= self.max_retries:
+            return False
+        if error is not None:
+            if idempotent:
+                return isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+            return _is_connect_error(error)
+        if response is None or response.status_code not in self.retry_statuses:
+            return False
+        return idempotent or response.status_code == 429
+
+    def get_delay(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        """Returns the seconds to wait before retrying after the given (0-based) attempt"""
+        if self.respect_retry_after and response is not None and response.status_code in (429, 503):
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return min(retry_after, self.max_retry_after)
+
+        backoff = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+        return random.uniform(0, backoff) if self.jitter else backoff
+
+
+class CircuitBreaker:
+    """
+    Stops sending requests to a failing host for a while.
+
+    After `failure_threshold` consecutive failures the circuit opens and requests are
+    refused. After `recovery_timeout` seconds it is half-open: up to
+    `half_open_max_calls` trial requests go through, and the circuit closes again when
+    one succeeds (or reopens when one fails).
+
+    Args:
+        failure_threshold (int): Consecutive failures that open the circuit.
+        recovery_timeout (float): Seconds the circuit stays open.
+        half_open_max_calls (int): Trial requests allowed at once while half-open.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0, half_open_max_calls: int = 1):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trials = 0
+        self.opened = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._state = self.HALF_OPEN
+            self._trials = 0
+        return self._state
+
+    def retry_in(self) -> float:
+        """Returns the seconds until the open circuit lets a trial request through"""
+        with self._lock:
+            if self._current_state() != self.OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self.recovery_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now (counts it as a trial when half-open)"""
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and self._trials < self.half_open_max_calls:
+                self._trials += 1
+                return True
+            return False
+
+    def release(self):
+        """
+        Ends a request without an outcome (e.g. a 429 or an interrupted request),
+        freeing its trial slot when half-open
+        """
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._trials > 0:
+                self._trials -= 1
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trials = 0
+
+    def record_failure(self) -> bool:
+        """Records a failure and returns True if it opened the circuit"""
+        with self._lock:
+            self._failures += 1
+            state = self._current_state()
+            if state == self.HALF_OPEN or (state == self.CLOSED and self._failures >= self.failure_threshold):
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self.opened += 1
+                return True
+            return False
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket, shared by every request it limits.
+
+    Args:
+        rate (float): Tokens added per second.
+        burst (Optional[float]): Bucket size, i.e. the requests allowed at once after an
+            idle period. Defaults to `rate` (one second worth of requests).
+
+    Example:
+        ```python
+        limiter = RateLimiter(rate=20)  # 20 requests/s across all agents
+        transport = ResilientTransport(rate_limiter=limiter)
+        ```
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self.waited = 0.0
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """
+        Takes `tokens` if available and returns 0, otherwise returns the seconds to
+        wait before they are.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until:
+                return self._paused_until - now
+            self._refill(now)
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> float:
+        """
+        Blocks until `tokens` are available and takes them.
+
+        Returns:
+            float: Seconds spent waiting.
+
+        Raises:
+            RateLimitTimeout: If the tokens were not available within `timeout` seconds.
+        """
+        started = time.monotonic()
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait == 0.0:
+                waited = time.monotonic() - started
+                if waited:
+                    with self._lock:
+                        self.waited += waited
+                return waited
+            if timeout is not None and time.monotonic() - started + wait > timeout:
+                raise RateLimitTimeout(f"No rate limit token available within {timeout} seconds")
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Holds every request for `seconds` (e.g. after a 429 with Retry-After)"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def set_rate(self, rate: float, burst: Optional[float] = None):
+        """Changes the rate (e.g. to the limit announced by the server)"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+            if burst is not None:
+                self.burst = burst
+                self._tokens = min(self._tokens, burst)
+
+
+class ResilientTransport(Transport):
+    """
+    Transport adding retries with backoff, per-host circuit breakers and a shared rate
+    limit in front of another transport.
+
+    Requests are retried as decided by the RetryPolicy: idempotent ones (GET-like
+    methods, or requests sent with `idempotent=True` such as the action requests of
+    the GAME clients) on 429, 5xx and connection errors, all others only on 429 and
+    connection failures. A 429 with Retry-After also pauses the shared rate limiter,
+    so every agent backs off instead of just the one that was refused.
+
+    Args:
+        transport (Optional[Transport]): Transport sending the requests, defaults to
+            the process-wide shared transport.
+        retry_policy (Optional[RetryPolicy]): Retry settings, defaults to RetryPolicy().
+        circuit_breaker_factory (Optional[Callable[[], CircuitBreaker]]): Creates the
+            breaker of each host. None disables the circuit breakers.
+        rate_limiter (Optional[RateLimiter]): Limiter every request (and retry) waits for.
+        block_when_open (bool): Wait for an open circuit to let trial requests through
+            instead of raising CircuitOpenError, so agents pause during an outage
+            instead of crashing.
+        sleep (Callable[[float], None]): Function used to wait between retries.
+
+    Example:
+        ```python
+        transport = ResilientTransport(
+            retry_policy=RetryPolicy(max_retries=5),
+            rate_limiter=RateLimiter(rate=50),
+            block_when_open=True,
+        )
+        agents = [Agent(..., transport=transport) for _ in range(100)]
+        print(transport.stats())
+        ```
+    """
+
+    def __init__(
+        self,
+        transport: Optional[Transport] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker_factory: Optional[Callable[[], CircuitBreaker]] = CircuitBreaker,
+        rate_limiter: Optional[RateLimiter] = None,
+        block_when_open: bool = False,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.transport = transport or get_default_transport()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker_factory = circuit_breaker_factory
+        self.rate_limiter = rate_limiter
+        self.block_when_open = block_when_open
+        self._sleep = sleep
+
+        self._lock = threading.Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+        self.requests = 0
+        self.retries = 0
+        self.retries_by_reason: Dict[str, int] = {}
+        self.rejected = 0
+        self.failures = 0
+
+    def get_circuit_breaker(self, url: str) -> Optional[CircuitBreaker]:
+        """Returns the circuit breaker of the host of `url`"""
+        if self.circuit_breaker_factory is None:
+            return None
+        host = urlsplit(url).netloc
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = self._breakers[host] = self.circuit_breaker_factory()
+            return breaker
+
+    def request(self, method: str, url: str, idempotent: Optional[bool] = None, **kwargs: Any) -> requests.Response:
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        breaker = self.get_circuit_breaker(url)
+
+        with self._lock:
+            self.requests += 1
+
+        attempt = 0
+        while True:
+            self._check_circuit(breaker, url)
+            # every request let through records an outcome or releases its trial slot,
+            # otherwise a half-open circuit would refuse requests forever
+            recorded = False
+            try:
+                if self.rate_limiter is not None:
+                    self.rate_limiter.acquire()
+
+                response = error = None
+                try:
+                    response = self.transport.request(method, url, **kwargs)
+                except requests.exceptions.RequestException as e:
+                    error = e
+
+                failed = error is not None or response.status_code >= 500
+                if breaker is not None:
+                    if failed:
+                        recorded = True
+                        if breaker.record_failure():
+                            logger.warning(
+                                "Circuit opened for %s", urlsplit(url).netloc,
+                                extra=log_fields(host=urlsplit(url).netloc, state=CircuitBreaker.OPEN),
+                            )
+                    elif response.status_code != 429:
+                        recorded = True
+                        breaker.record_success()
+            finally:
+                if breaker is not None and not recorded:
+                    breaker.release()
+
+            if not self.retry_policy.should_retry(attempt, idempotent, response, error):
+                with self._lock:
+                    self.failures += failed
+                if error is not None:
+                    raise error
+                return response
+
+            delay = self.retry_policy.get_delay(attempt, response)
+            reason = type(error).__name__ if error is not None else str(response.status_code)
+            if response is not None:
+                if response.status_code == 429 and self.rate_limiter is not None:
+                    self.rate_limiter.pause(delay)
+                if response.raw is not None:  # replayed responses have no connection
+                    response.close()
+
+            with self._lock:
+                self.retries += 1
+                self.retries_by_reason[reason] = self.retries_by_reason.get(reason, 0) + 1
+            logger.warning(
+                "Retrying %s %s in %.2fs (attempt %d, %s)", method.upper(), url, delay, attempt + 1, reason,
+                extra=log_fields(url=url, attempt=attempt + 1, delay=delay, reason=reason),
+            )
+            self._sleep(delay)
+            attempt += 1
+
+    def _check_circuit(self, breaker: Optional[CircuitBreaker], url: str):
+        if breaker is None:
+            return
+        while not breaker.allow():
+            if not self.block_when_open:
+                with self._lock:
+                    self.rejected += 1
+                raise CircuitOpenError(
+                    f"Circuit open for {urlsplit(url).netloc}, retry in {breaker.retry_in():.1f}s"
+                )
+            self._sleep(max(breaker.retry_in(), 0.05))
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the retry, failure and circuit breaker metrics"""
+        with self._lock:
+            breakers = dict(self._breakers)
+            stats = {
+                "requests": self.requests,
+                "retries": self.retries,
+                "retries_by_reason": dict(self.retries_by_reason),
+                "failures": self.failures,
+                "rejected": self.rejected,
+            }
+        stats["circuits"] = {
+            host: {"state": breaker.state, "opened": breaker.opened}
+            for host, breaker in breakers.items()
+        }
+        stats["open_circuits"] = [
+            host for host, circuit in stats["circuits"].items() if circuit["state"] != CircuitBreaker.CLOSED
+        ]
+        if self.rate_limiter is not None:
+            stats["rate_limited_seconds"] = self.rate_limiter.waited
+        return stats
+
+    def close(self):
+        """Nothing to release - the wrapped transport is left open"""
@@ -0,0 +1,398 @@
+import copy
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from game_sdk.game.agent import Agent, Session
+from game_sdk.game.custom_types import Function
+from game_sdk.game.execution import ExecutionPolicy
+from game_sdk.game.worker import Worker
+from game_sdk.log import get_logger, log_fields
+
+logger = get_logger(__name__)
+
+
+class _BoundedClient:
+    """
+    Proxy around a GAME API client that holds a shared semaphore slot for the
+    duration of every API call, bounding in-flight requests across all agents.
+    """
+
+    def __init__(self, client: Any, slots: threading.Semaphore):
+        self._client = client
+        self._slots = slots
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._client, name)
+        if not callable(attr):
+            return attr
+
+        def bounded(*args, **kwargs):
+            with self._slots:
+                return attr(*args, **kwargs)
+
+        return bounded
+
+
+class RuntimeEntry:
+    """
+    An Agent or Worker hosted by an AgentRuntime, with its scheduling settings and counters.
+
+    Attributes:
+        name (str): Unique name of the entry in the runtime.
+        target (Union[Agent, Worker]): The hosted agent or worker.
+        task (Optional[str]): Task of a hosted worker (None for agents).
+        max_steps (Optional[int]): Step budget, None for unlimited.
+        heartbeat (float): Minimum number of seconds between the start of consecutive steps.
+        steps (int): Number of completed steps.
+        error (Optional[BaseException]): Exception that stopped the entry, if any.
+        finished (bool): Whether the entry will not be scheduled again.
+        last_step_duration (Optional[float]): Duration of the last step in seconds.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        target: Union[Agent, Worker],
+        task: Optional[str],
+        max_steps: Optional[int],
+        heartbeat: float,
+    ):
+        self.name = name
+        self.target = target
+        self.task = task
+        self.max_steps = max_steps
+        self.heartbeat = heartbeat
+
+        self.steps = 0
+        self.error: Optional[BaseException] = None
+        self.finished = False
+        self.last_step_duration: Optional[float] = None
+        self._started = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "kind": "worker" if isinstance(self.target, Worker) else "agent",
+            "steps": self.steps,
+            "max_steps": self.max_steps,
+            "finished": self.finished,
+            "error": repr(self.error) if self.error is not None else None,
+            "last_step_duration": self.last_step_duration,
+        }
+
+
+class AgentRuntime:
+    """
+    Schedules the step loops of many Agents and Workers in one process.
+
+    Instead of dedicating a thread to each `agent.run()`, every hosted agent is
+    stepped by a shared thread pool. Agents that are due are served in order of their
+    due time, so no agent can starve the others, and each agent has at most one step
+    in flight.
+
+    Args:
+        max_concurrent_steps (int): Number of steps executed at the same time.
+        max_concurrent_requests (Optional[int]): Maximum number of in-flight GAME API
+            calls across all hosted agents. None leaves API calls unbounded.
+        process_pool_size (Optional[int]): Size of the process pool used for the
+            functions registered as `cpu_bound_functions`. Their executables must be
+            picklable (e.g. module-level functions).
+
+    Example:
+        ```python
+        runtime = AgentRuntime(max_concurrent_steps=8, max_concurrent_requests=16)
+        for agent in agents:
+            runtime.add_agent(agent, heartbeat=15)
+        runtime.add_worker(worker, "Summarize the latest news", max_steps=20)
+        runtime.run()  # blocks until all budgets are used up or Ctrl+C
+        ```
+    """
+
+    def __init__(
+        self,
+        max_concurrent_steps: int = 8,
+        max_concurrent_requests: Optional[int] = None,
+        process_pool_size: Optional[int] = None,
+    ):
+        self.max_concurrent_steps = max_concurrent_steps
+        self.max_concurrent_requests = max_concurrent_requests
+        self.process_pool_size = process_pool_size
+
+        self._entries: Dict[str, RuntimeEntry] = {}
+        self._queue: List[Any] = []
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+        self._inflight = 0
+        self._stopping = False
+
+        self._step_slots = threading.BoundedSemaphore(max_concurrent_steps)
+        self._request_slots = (
+            threading.BoundedSemaphore(max_concurrent_requests)
+            if max_concurrent_requests
+            else None
+        )
+        self._process_pool = (
+            ProcessPoolExecutor(max_workers=process_pool_size)
+            if process_pool_size
+            else None
+        )
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._dispatcher: Optional[threading.Thread] = None
+
+    def add_agent(
+        self,
+        agent: Agent,
+        max_steps: Optional[int] = None,
+        heartbeat: float = 0.0,
+        cpu_bound_functions: Iterable[str] = (),
+        name: Optional[str] = None,
+    ) -> str:
+        """
+        Hosts an agent. It is compiled on its first step if `compile()` was not called yet.
+
+        Args:
+            agent (Agent): The agent to host.
+            max_steps (Optional[int]): Step budget, None to run until shutdown.
+            heartbeat (float): Minimum number of seconds between the start of consecutive steps.
+            cpu_bound_functions (Iterable[str]): Names of functions to run in the process pool.
+            name (Optional[str]): Name of the entry, defaults to the agent name.
+
+        Returns:
+            str: The (unique) name of the entry.
+        """
+        action_spaces = {worker_id: config.action_space for worker_id, config in agent.workers.items()}
+        for worker_id, action_space in self._offload_functions(action_spaces, cpu_bound_functions).items():
+            # the agent gets its own copy of the config, the caller's is left unchanged
+            worker_config = agent.workers[worker_id] = copy.copy(agent.workers[worker_id])
+            worker_config.action_space = action_space
+            standalone = agent._standalone_workers.get(worker_id)
+            if standalone is not None:
+                standalone.action_space = action_space
+        # a session resumed from the agent's session store is continued, like in `run()`
+        if not agent._session_restored:
+            agent._session = Session()
+        agent._session_restored = False
+        return self._add(agent, None, max_steps, heartbeat, name or agent.name)
+
+    def add_worker(
+        self,
+        worker: Worker,
+        task: str,
+        max_steps: Optional[int] = None,
+        heartbeat: float = 0.0,
+        cpu_bound_functions: Iterable[str] = (),
+        name: Optional[str] = None,
+    ) -> str:
+        """
+        Hosts a standalone worker that runs until `task` is completed.
+
+        Args:
+            worker (Worker): The worker to host.
+            task (str): The task given to the worker.
+            max_steps (Optional[int]): Step budget, None to run until the task is completed.
+            heartbeat (float): Minimum number of seconds between the start of consecutive steps.
+            cpu_bound_functions (Iterable[str]): Names of functions to run in the process pool.
+            name (Optional[str]): Name of the entry, defaults to "worker".
+
+        Returns:
+            str: The (unique) name of the entry.
+        """
+        for action_space in self._offload_functions({"worker": worker.action_space}, cpu_bound_functions).values():
+            worker.action_space = action_space
+        return self._add(worker, task, max_steps, heartbeat, name or "worker")
+
+    def cancel(self, name: str):
+        """Stops scheduling the named entry (a step in flight is completed)"""
+        with self._cond:
+            self._entries[name].finished = True
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Returns the counters of every hosted entry, keyed by entry name"""
+        with self._cond:
+            return {name: entry.to_dict() for name, entry in self._entries.items()}
+
+    def start(self):
+        """Starts stepping the hosted agents in the background"""
+        with self._cond:
+            if self._dispatcher is not None:
+                return
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrent_steps,
+                thread_name_prefix="game-sdk-runtime",
+            )
+            self._dispatcher = threading.Thread(
+                target=self._dispatch, name="game-sdk-runtime-dispatcher", daemon=True
+            )
+            self._dispatcher.start()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits until every entry has finished (or the runtime was shut down).
+
+        Returns:
+            bool: False if the timeout expired first.
+        """
+        with self._cond:
+            return self._cond.wait_for(self._is_idle, timeout)
+
+    def run(self, timeout: Optional[float] = None):
+        """Starts the runtime and blocks until all entries finish, then shuts down"""
+        self.start()
+        try:
+            self.wait(timeout)
+        finally:
+            self.shutdown()
+
+    def shutdown(self, wait: bool = True, timeout: Optional[float] = None):
+        """
+        Stops scheduling new steps. With `wait`, blocks until the steps in flight finish.
+        """
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+
+        if wait:
+            with self._cond:
+                self._cond.wait_for(lambda: self._inflight == 0, timeout)
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=wait)
+
+    def __enter__(self) -> "AgentRuntime":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+    def _add(
+        self,
+        target: Union[Agent, Worker],
+        task: Optional[str],
+        max_steps: Optional[int],
+        heartbeat: float,
+        name: str,
+    ) -> str:
+        if self._request_slots is not None:
+            target.client = _BoundedClient(target.client, self._request_slots)
+
+        with self._cond:
+            unique_name = name
+            for n in itertools.count(2):
+                if unique_name not in self._entries:
+                    break
+                unique_name = f"{name}-{n}"
+
+            entry = RuntimeEntry(unique_name, target, task, max_steps, heartbeat)
+            self._entries[unique_name] = entry
+            self._schedule(entry, time.monotonic())
+            return unique_name
+
+    def _offload_functions(
+        self, action_spaces: Dict[str, Dict[str, Function]], fn_names: Iterable[str]
+    ) -> Dict[str, Dict[str, Function]]:
+        """
+        Returns new action spaces, by owner, in which the functions named `fn_names`
+        run in the process pool. Only the action spaces having one of the functions
+        are returned, and the given ones are not modified.
+
+        Raises:
+            ValueError: If a name matches no function, or there is no process pool.
+        """
+        fn_names = set(fn_names)
+        if not fn_names:
+            return {}
+        if self._process_pool is None:
+            raise ValueError("process_pool_size must be set to run cpu bound functions")
+        missing = fn_names.difference(*action_spaces.values())
+        if missing:
+            raise ValueError(f"cpu bound functions not found in any action space: {', '.join(sorted(missing))}")
+
+        offloaded = {}
+        for owner, action_space in action_spaces.items():
+            if fn_names.isdisjoint(action_space):
+                continue
+            offloaded[owner] = action_space = dict(action_space)
+            for fn_name in fn_names.intersection(action_space):
+                fn = action_space[fn_name]
+                timeout = fn.execution_policy.timeout if fn.execution_policy else None
+                action_space[fn_name] = fn.model_copy(
+                    update={"execution_policy": ExecutionPolicy(timeout=timeout, executor=self._process_pool)}
+                )
+        return offloaded
+
+    def _schedule(self, entry: RuntimeEntry, due: float):
+        heapq.heappush(self._queue, (due, next(self._sequence), entry))
+        self._cond.notify_all()
+
+    def _is_idle(self) -> bool:
+        if self._stopping:
+            return self._inflight == 0
+        return self._inflight == 0 and all(e.finished for e in self._entries.values())
+
+    def _dispatch(self):
+        while True:
+            with self._cond:
+                while True:
+                    if self._stopping:
+                        return
+                    now = time.monotonic()
+                    if self._queue and self._queue[0][0] <= now:
+                        _, _, entry = heapq.heappop(self._queue)
+                        if entry.finished:
+                            continue
+                        break
+                    self._cond.wait(self._queue[0][0] - now if self._queue else None)
+
+            self._step_slots.acquire()
+            with self._cond:
+                if self._stopping:
+                    self._step_slots.release()
+                    return
+                self._inflight += 1
+            self._executor.submit(self._run_step, entry)
+
+    def _run_step(self, entry: RuntimeEntry):
+        started = time.monotonic()
+        try:
+            self._step(entry)
+        except BaseException as e:
+            entry.error = e
+            entry.finished = True
+            logger.error(
+                "Runtime entry '%s' stopped: %r", entry.name, e,
+                extra=log_fields(entry=entry.name, steps=entry.steps),
+            )
+        finally:
+            entry.last_step_duration = time.monotonic() - started
+            self._step_slots.release()
+            with self._cond:
+                self._inflight -= 1
+                if entry.max_steps is not None and entry.steps >= entry.max_steps:
+                    entry.finished = True
+                if not entry.finished and not self._stopping:
+                    self._schedule(entry, started + entry.heartbeat)
+                self._cond.notify_all()
+
+    def _step(self, entry: RuntimeEntry):
+        target = entry.target
+
+        if isinstance(target, Worker):
+            if not entry._started:
+                target.set_task(entry.task)
+                entry._started = True
+            target.step()
+            entry.steps += 1
+            if not target._submission_id:
+                entry.finished = True
+            return
+
+        if target._map_id is None:
+            target.compile()
+        target.step()
+        entry.steps += 1
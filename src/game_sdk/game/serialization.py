@@ -0,0 +1,73 @@
+import json
+import uuid
+from typing import Any, List, Union
+
+from pydantic_core import from_json
+
+from game_sdk.game import tracing
+
+
+class RawJSON:
+    """
+    Already serialized JSON that `dumps` embeds verbatim instead of encoding again.
+
+    Used for request payload parts that rarely change (e.g. function definitions),
+    so they are serialized once and reused for every request.
+
+    Attributes:
+        json (str): The serialized JSON value.
+    """
+    __slots__ = ("json",)
+
+    def __init__(self, json: str):
+        self.json = json
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, RawJSON) and other.json == self.json
+
+    def __hash__(self) -> int:
+        return hash(self.json)
+
+    def __repr__(self) -> str:
+        return f"RawJSON({self.json!r})"
+
+
+def dumps(obj: Any) -> str:
+    """
+    Serializes `obj` to JSON like `json.dumps`, embedding RawJSON values verbatim.
+
+    The C encoder only calls back into Python for RawJSON values, which are replaced by
+    a unique placeholder that is swapped for the fragment afterwards, so the rest of the
+    payload is encoded at full speed.
+    """
+    fragments: List[str] = []
+    token = uuid.uuid4().hex
+
+    def default(o: Any) -> str:
+        if isinstance(o, RawJSON):
+            fragments.append(o.json)
+            return f"{token}:{len(fragments) - 1}"
+        raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+    # allow_nan=False matches the encoding requests uses for `json=` bodies
+    serialized = json.dumps(obj, default=default, allow_nan=False)
+    for i, fragment in enumerate(fragments):
+        serialized = serialized.replace(f'"{token}:{i}"', fragment, 1)
+    return serialized
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Serializes `obj` with `dumps` and encodes it as a UTF-8 request body"""
+    with tracing.span("json.encode") as span:
+        body = dumps(obj).encode("utf-8")
+        span.set_attribute("bytes", len(body))
+    return body
+
+
+def loads(body: Union[bytes, str]) -> Any:
+    """
+    Parses a JSON response body with the pydantic-core parser, straight from the raw
+    bytes (no decoding to str first, and faster than `json.loads` on large bodies).
+    """
+    with tracing.span("json.decode", bytes=len(body)):
+        return from_json(body)
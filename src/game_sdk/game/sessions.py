@@ -0,0 +1,241 @@
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+SNAPSHOT_VERSION = 1
+
+
+def _hash(value: Any) -> str:
+    return hashlib.sha256(
+        json.dumps(value, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    ).hexdigest()
+
+
+def agent_config_hash(api_key: str, name: str, agent_description: str, agent_goal: str) -> str:
+    """
+    Returns the hash of everything the remote agent is created from.
+
+    The API key is part of it (hashed, never stored) since agent ids are only valid
+    for the account that created them.
+    """
+    return _hash({
+        "api_key": hashlib.sha256(api_key.encode("utf-8")).hexdigest(),
+        "name": name,
+        "description": agent_description,
+        "goal": agent_goal,
+    })
+
+
+def standalone_worker_hash(
+    api_key: str, description: str, worker_id: Optional[str], instruction: Optional[str], fn_names: Iterable[str]
+) -> str:
+    """
+    Returns the hash of a standalone worker: the remote agent it is created from, and
+    its worker id, instruction and functions, so workers sharing a description get
+    their own remote agent (and payload delta stream).
+    """
+    return _hash({
+        "agent": agent_config_hash(api_key, "StandaloneWorker", description, "N/A"),
+        "worker_id": worker_id,
+        "instruction": instruction,
+        "functions": sorted(fn_names),
+    })
+
+
+def workers_config_hash(api_key: str, workers: Iterable[Any]) -> str:
+    """
+    Returns the hash of everything the remote worker map is created from (the id and
+    description of each worker, in order).
+    """
+    return _hash({
+        "api_key": hashlib.sha256(api_key.encode("utf-8")).hexdigest(),
+        "locations": [[w.id, w.worker_description] for w in workers],
+    })
+
+
+@dataclass
+class AgentSnapshot:
+    """
+    Everything needed to resume an Agent without creating it again on the GAME API.
+
+    Attributes:
+        key (str): Key of the snapshot in its store.
+        agent_hash (str): `agent_config_hash` of the agent the snapshot was taken from.
+        agent_id (str): Id of the remote agent.
+        workers_hash (Optional[str]): `workers_config_hash` of the compiled workers.
+        map_id (Optional[str]): Id of the remote worker map, None before `compile()`.
+        current_worker_id (Optional[str]): Worker the agent is at.
+        worker_states (Dict[str, Any]): Last state of every worker.
+        agent_state (Any): Last agent state.
+        observation (Optional[Dict[str, Any]]): Observation sent with the next action request.
+        session_id (Optional[str]): Id of the agent session.
+        function_result (Optional[Dict[str, Any]]): Last function result of the session.
+        saved_at (float): Unix time the snapshot was taken.
+        version (int): Snapshot format version.
+    """
+    key: str
+    agent_hash: str
+    agent_id: str
+    workers_hash: Optional[str] = None
+    map_id: Optional[str] = None
+    current_worker_id: Optional[str] = None
+    worker_states: Dict[str, Any] = field(default_factory=dict)
+    agent_state: Any = None
+    observation: Optional[Dict[str, Any]] = None
+    session_id: Optional[str] = None
+    function_result: Optional[Dict[str, Any]] = None
+    saved_at: float = field(default_factory=time.time)
+    version: int = SNAPSHOT_VERSION
+
+    def to_json(self) -> str:
+        # states are written as they are: unlike a lossy default=str, a state that
+        # is not JSON serializable fails loudly when the snapshot is taken
+        return json.dumps(asdict(self), allow_nan=False)
+
+    @classmethod
+    def from_json(cls, data: str) -> "AgentSnapshot":
+        values = json.loads(data)
+        if values.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported session snapshot version: {values.get('version')}")
+        return cls(**values)
+
+
+class SessionStore(ABC):
+    """
+    Base class of the stores persisting agent snapshots.
+
+    Stores must be safe to share between the agents of a process (and their threads).
+    """
+
+    @abstractmethod
+    def load(self, key: str) -> Optional[AgentSnapshot]:
+        """Returns the snapshot saved under `key`, or None"""
+
+    @abstractmethod
+    def save(self, snapshot: AgentSnapshot):
+        """Saves `snapshot` under its key, replacing any previous one"""
+
+    @abstractmethod
+    def delete(self, key: str):
+        """Deletes the snapshot saved under `key`, if any"""
+
+    @abstractmethod
+    def keys(self) -> List[str]:
+        """Returns the keys of all saved snapshots"""
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class FileSessionStore(SessionStore):
+    """
+    Stores each snapshot as a JSON file in a directory.
+
+    Files are replaced atomically, so a crash while saving leaves the previous snapshot.
+
+    Args:
+        directory (str): Directory of the snapshot files, created if missing.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        # keys are hashed so any string (e.g. an agent name with slashes) is a valid key
+        return os.path.join(self.directory, hashlib.sha256(key.encode("utf-8")).hexdigest()[:32] + ".json")
+
+    def load(self, key: str) -> Optional[AgentSnapshot]:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return AgentSnapshot.from_json(f.read())
+        except FileNotFoundError:
+            return None
+
+    def save(self, snapshot: AgentSnapshot):
+        data = snapshot.to_json()
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(snapshot.key))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def delete(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def keys(self) -> List[str]:
+        keys = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                with open(os.path.join(self.directory, name), "r", encoding="utf-8") as f:
+                    keys.append(json.loads(f.read())["key"])
+        return keys
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Stores the snapshots in a SQLite database, one row per agent.
+
+    The database is opened in WAL mode, so many agents (and processes) can save their
+    snapshots without blocking the readers.
+
+    Args:
+        path (str): Database file, created if missing (":memory:" for a private store).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS agent_sessions ("
+            "key TEXT PRIMARY KEY, snapshot TEXT NOT NULL, saved_at REAL NOT NULL)"
+        )
+
+    def load(self, key: str) -> Optional[AgentSnapshot]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT snapshot FROM agent_sessions WHERE key = ?", (key,)
+            ).fetchone()
+        return AgentSnapshot.from_json(row[0]) if row else None
+
+    def save(self, snapshot: AgentSnapshot):
+        data = snapshot.to_json()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO agent_sessions (key, snapshot, saved_at) VALUES (?, ?, ?)",
+                (snapshot.key, data, snapshot.saved_at),
+            )
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM agent_sessions WHERE key = ?", (key,))
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT key FROM agent_sessions")]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
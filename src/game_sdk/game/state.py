@@ -0,0 +1,128 @@
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, Callable, Dict, Iterable
+
+from game_sdk.game import tracing
+from game_sdk.game.execution import in_thread_pool, submit_coroutine, submit_to_thread_pool
+
+
+class ConcurrentState:
+    """
+    State function built from independent state sources, which are gathered
+    concurrently instead of one after the other.
+
+    Each source is called like a state function, with the last function result and
+    the current state, and its value is stored in the state under the source name.
+    Sources can be coroutine functions: they run on the background event loop of the
+    SDK, so sources doing I/O (fetching balances, mentions, ...) can be async.
+
+    Sources listed in `prefetch` do not depend on the function result. They are
+    started again as soon as a state is built, so they run while the GAME API picks
+    the next action and the function executes, and the next state only waits for
+    whatever is left. Their value is therefore as fresh as the start of the step,
+    not as its end.
+
+    A ConcurrentState can be passed anywhere a state function is expected
+    (`get_agent_state_fn`, `WorkerConfig(get_state_fn=...)`, `Worker(get_state_fn=...)`).
+    Use one instance per agent or worker, since it holds the prefetched values.
+
+    Sync sources run on a thread pool of their own, so agents offloading their state
+    functions to the SDK thread pool never wait on their own pool. A ConcurrentState
+    used inside a source of another one runs its sources in the calling thread,
+    without prefetching.
+
+    Args:
+        sources (Dict[str, Callable]): State sources by name, each called with
+            `(function_result, current_state)`.
+        prefetch (Iterable[str]): Names of the sources to prefetch.
+
+    Example:
+        ```python
+        get_state = ConcurrentState(
+            {
+                "balances": fetch_balances,        # async def fetch_balances(result, state)
+                "mentions": fetch_mentions,
+                "last_result": lambda result, state: result.feedback_message if result else None,
+            },
+            prefetch=["balances", "mentions"],
+        )
+        agent = Agent(..., get_agent_state_fn=get_state)
+        ```
+    """
+
+    def __init__(self, sources: Dict[str, Callable], prefetch: Iterable[str] = ()):
+        if not sources:
+            raise ValueError("At least one state source is required")
+
+        self.sources = dict(sources)
+        self.prefetch = frozenset(prefetch)
+        unknown = self.prefetch - set(self.sources)
+        if unknown:
+            raise ValueError(f"Unknown prefetched state sources: {sorted(unknown)}")
+
+        self._lock = threading.Lock()
+        self._prefetched: Dict[str, "concurrent.futures.Future[Any]"] = {}
+
+    def _submit(self, name: str, function_result: Any, current_state: Any) -> "concurrent.futures.Future[Any]":
+        source = self.sources[name]
+        if asyncio.iscoroutinefunction(source):
+            return submit_coroutine(self._run_async(name, source, function_result, current_state))
+        return submit_to_thread_pool(self._run, name, source, function_result, current_state, pool="state")
+
+    @staticmethod
+    def _run(name: str, source: Callable, function_result: Any, current_state: Any) -> Any:
+        with tracing.span("state.source", source=name):
+            return source(function_result, current_state)
+
+    @staticmethod
+    async def _run_async(name: str, source: Callable, function_result: Any, current_state: Any) -> Any:
+        with tracing.span("state.source", source=name):
+            return await source(function_result, current_state)
+
+    def __call__(self, function_result: Any, current_state: Any) -> Dict[str, Any]:
+        # on a thread of the state pool (a source of another ConcurrentState), waiting
+        # on sources submitted to the same pool could exhaust it: run them here
+        nested = in_thread_pool("state")
+
+        with self._lock:
+            prefetched, self._prefetched = self._prefetched, {}
+
+        futures = {}
+        inline = []
+        for name in self.sources:
+            if name in prefetched:
+                futures[name] = prefetched[name]
+            elif not asyncio.iscoroutinefunction(self.sources[name]) and (nested or not inline):
+                # one sync source runs in the calling thread, which would only wait otherwise
+                inline.append(name)
+            else:
+                futures[name] = self._submit(name, function_result, current_state)
+
+        state: Dict[str, Any] = {}
+        try:
+            for name in inline:
+                state[name] = self._run(name, self.sources[name], function_result, current_state)
+            for name, future in futures.items():
+                state[name] = future.result()
+        except BaseException:
+            for future in futures.values():
+                future.cancel()
+            raise
+
+        # keys in the order of `sources`, whichever finished first
+        state = {name: state[name] for name in self.sources}
+
+        if self.prefetch and not nested:
+            with self._lock:
+                for name in self.prefetch:
+                    self._prefetched[name] = self._submit(name, function_result, state)
+
+        return state
+
+    def cancel_prefetch(self):
+        """Drops the prefetched values, so the next state is built from fresh calls only"""
+        with self._lock:
+            prefetched, self._prefetched = self._prefetched, {}
+        for future in prefetched.values():
+            future.cancel()
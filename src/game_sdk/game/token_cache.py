@@ -0,0 +1,169 @@
+import base64
+import binascii
+import json
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+
+def _decode_jwt_expiry(token: str) -> Optional[float]:
+    """
+    Returns the `exp` claim (unix timestamp) of a JWT access token, or None if the
+    token is not a JWT or carries no expiry. The signature is NOT verified - the
+    claim is only used to schedule refreshes.
+    """
+    parts = token.split(".")
+    if len(parts) != 3:
+        return None
+
+    payload = parts[1] + "=" * (-len(parts[1]) % 4)
+    try:
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+    except (ValueError, binascii.Error):
+        return None
+
+    exp = claims.get("exp") if isinstance(claims, dict) else None
+    if isinstance(exp, (int, float)) and not isinstance(exp, bool):
+        return float(exp)
+    return None
+
+
+class _PendingRefresh:
+    """A token refresh in flight, shared by every caller that needs its result"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.token: Optional[str] = None
+        self.error: Optional[BaseException] = None
+
+
+class AccessTokenCache:
+    """
+    Thread-safe cache for the short-lived access token used by GAMEClient.
+
+    The token is reused until it is close to expiry. Once it enters the refresh
+    window it is still handed out while a single background refresh fetches the
+    next one; callers only block when there is no valid token at all, and then all
+    of them wait on the same in-flight request instead of each fetching a token.
+
+    Args:
+        fetch_token (Callable[[], str]): Fetches a fresh token from the API.
+        refresh_margin (float): Seconds before expiry at which a background refresh starts.
+        default_ttl (float): Lifetime assumed for tokens that carry no `exp` claim.
+        background_refresh (bool): Refresh ahead of expiry in a daemon thread. When False,
+            the token is refreshed synchronously once it enters the refresh window.
+
+    Attributes:
+        hits (int): Number of calls served from the cache.
+        refreshes (int): Number of successful token fetches.
+        failures (int): Number of failed token fetches.
+    """
+
+    def __init__(
+        self,
+        fetch_token: Callable[[], str],
+        refresh_margin: float = 60.0,
+        default_ttl: float = 300.0,
+        background_refresh: bool = True,
+    ):
+        self._fetch_token = fetch_token
+        self.refresh_margin = refresh_margin
+        self.default_ttl = default_ttl
+        self.background_refresh = background_refresh
+
+        self._lock = threading.Lock()
+        self._token: Optional[str] = None
+        # expiry on the monotonic clock
+        self._expires_at: float = 0.0
+        self._pending: Optional[_PendingRefresh] = None
+
+        self.hits = 0
+        self.refreshes = 0
+        self.failures = 0
+
+    def get_token(self) -> str:
+        """
+        Returns a valid access token, fetching one only if none is cached
+        """
+        with self._lock:
+            token = self._token
+            remaining = self._expires_at - time.monotonic()
+            if token is not None and remaining > self.refresh_margin:
+                self.hits += 1
+                return token
+            if token is not None and remaining > 0 and self.background_refresh:
+                # still valid - hand it out and refresh ahead of expiry
+                self.hits += 1
+                refresh_ahead = True
+            else:
+                refresh_ahead = False
+
+        if refresh_ahead:
+            self._refresh(wait=False)
+            return token
+
+        return self._refresh(wait=True)
+
+    def invalidate(self, token: Optional[str] = None):
+        """
+        Drops the cached token. If `token` is given, the cache is only cleared when it
+        still holds that token, so a stale 401 cannot evict a freshly fetched token.
+        """
+        with self._lock:
+            if token is None or token == self._token:
+                self._token = None
+                self._expires_at = 0.0
+
+    def stats(self) -> Dict[str, int]:
+        """Returns a snapshot of the cache counters"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "refreshes": self.refreshes,
+                "failures": self.failures,
+            }
+
+    def _refresh(self, wait: bool) -> Optional[str]:
+        with self._lock:
+            pending = self._pending
+            owner = pending is None
+            if owner:
+                pending = self._pending = _PendingRefresh()
+
+        if owner:
+            if not wait:
+                threading.Thread(
+                    target=self._run_refresh,
+                    args=(pending,),
+                    name="game-sdk-token-refresh",
+                    daemon=True,
+                ).start()
+                return None
+            self._run_refresh(pending)
+        elif not wait:
+            return None
+
+        pending.done.wait()
+        if pending.error is not None:
+            raise pending.error
+        return pending.token
+
+    def _run_refresh(self, pending: _PendingRefresh):
+        try:
+            token = self._fetch_token()
+        except BaseException as e:
+            with self._lock:
+                self.failures += 1
+                self._pending = None
+            pending.error = e
+        else:
+            exp = _decode_jwt_expiry(token)
+            ttl = exp - time.time() if exp is not None else self.default_ttl
+            with self._lock:
+                self._token = token
+                self._expires_at = time.monotonic() + ttl
+                self.refreshes += 1
+                self._pending = None
+            pending.token = token
+        finally:
+            pending.done.set()
@@ -0,0 +1,295 @@
+import contextvars
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Sequence
+
+
+class Span:
+    """
+    A timed operation of a step (e.g. the API call or a function execution).
+
+    Spans are context managers; a span opened while another one is active becomes its child.
+
+    Attributes:
+        name (str): Name of the operation, e.g. "agent.get_action".
+        attributes (Dict[str, Any]): Details of the operation (ids, sizes, statuses).
+        parent (Optional[Span]): Span that was active when this one started.
+        trace_id (str): Id shared by all the spans of a step.
+        span_id (str): Id of this span.
+        start_time_ns (int): Start time (unix epoch, in nanoseconds).
+        end_time_ns (Optional[int]): End time, None while the span is open.
+        error (Optional[BaseException]): Exception raised inside the span, if any.
+    """
+    __slots__ = (
+        "name", "attributes", "parent", "trace_id", "span_id", "start_time_ns",
+        "end_time_ns", "error", "exporter_data", "_tracer", "_token", "_started",
+    )
+
+    def __init__(self, tracer: "Tracer", name: str, attributes: Dict[str, Any]):
+        self._tracer = tracer
+        self.name = name
+        self.attributes = attributes
+        self.parent: Optional[Span] = None
+        self.trace_id = ""
+        self.span_id = ""
+        self.start_time_ns = 0
+        self.end_time_ns: Optional[int] = None
+        self.error: Optional[BaseException] = None
+        # per-exporter state, e.g. the matching OpenTelemetry span
+        self.exporter_data: Dict[int, Any] = {}
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Duration in seconds, None while the span is open"""
+        if self.end_time_ns is None:
+            return None
+        return (self.end_time_ns - self.start_time_ns) / 1e9
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def __enter__(self) -> "Span":
+        self.parent = _current_span.get()
+        self.trace_id = self.parent.trace_id if self.parent else f"{random.getrandbits(128):032x}"
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.start_time_ns = time.time_ns()
+        self._started = time.perf_counter_ns()
+        self._token = _current_span.set(self)
+        for exporter in self._tracer.exporters:
+            exporter.on_start(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end_time_ns = self.start_time_ns + (time.perf_counter_ns() - self._started)
+        self.error = exc
+        _current_span.reset(self._token)
+        for exporter in self._tracer.exporters:
+            exporter.on_end(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent.span_id if self.parent else None,
+            "start_time_ns": self.start_time_ns,
+            "duration": self.duration,
+            "attributes": dict(self.attributes),
+            "error": repr(self.error) if self.error is not None else None,
+        }
+
+
+class _NoopSpan:
+    """Span returned when tracing is disabled - a shared object that records nothing"""
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class SpanExporter(ABC):
+    """
+    Receives the spans of a Tracer. Exporters are called synchronously on the step
+    path, so they should only record spans and leave slow work to another thread.
+    """
+
+    def on_start(self, span: Span):
+        """Called when a span starts"""
+
+    @abstractmethod
+    def on_end(self, span: Span):
+        """Called when a span ends"""
+
+    def shutdown(self):
+        """Flushes and releases the exporter"""
+
+
+class RingBufferExporter(SpanExporter):
+    """
+    Keeps the last `capacity` finished spans in memory, plus timers aggregated per
+    span name over all spans.
+
+    Args:
+        capacity (int): Number of spans kept.
+
+    Example:
+        ```python
+        exporter = RingBufferExporter()
+        set_tracer(Tracer([exporter]))
+        agent.step()
+        print(exporter.summary()["agent.get_action"])  # count, total, mean and max seconds
+        ```
+    """
+
+    def __init__(self, capacity: int = 10000):
+        self._spans: Deque[Span] = deque(maxlen=capacity)
+        self._timers: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def on_end(self, span: Span):
+        duration = span.duration
+        with self._lock:
+            self._spans.append(span)
+            timer = self._timers.get(span.name)
+            if timer is None:
+                # count, total, max, errors
+                timer = self._timers[span.name] = [0, 0.0, 0.0, 0]
+            timer[0] += 1
+            timer[1] += duration
+            timer[2] = max(timer[2], duration)
+            timer[3] += span.error is not None
+
+    def spans(self, name: Optional[str] = None) -> List[Span]:
+        """Returns the buffered spans, oldest first (optionally only those named `name`)"""
+        with self._lock:
+            return [s for s in self._spans if name is None or s.name == name]
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Returns the timers of every span name: count, total, mean and max seconds, errors"""
+        with self._lock:
+            return {
+                name: {
+                    "count": count,
+                    "total": total,
+                    "mean": total / count,
+                    "max": max_,
+                    "errors": errors,
+                }
+                for name, (count, total, max_, errors) in self._timers.items()
+            }
+
+    def clear(self):
+        with self._lock:
+            self._spans.clear()
+            self._timers.clear()
+
+
+class OpenTelemetryExporter(SpanExporter):
+    """
+    Mirrors the spans as OpenTelemetry spans, with the same names, attributes and
+    parent/child structure. Spans started outside of a traced step are attached to the
+    current OpenTelemetry context, so steps show up inside the caller's traces.
+
+    Requires `opentelemetry-api` (`pip install game_sdk[otel]`) and a configured
+    OpenTelemetry SDK to actually export anything.
+
+    Args:
+        tracer (Optional[opentelemetry.trace.Tracer]): Tracer to create the spans with,
+            defaults to the tracer of the global tracer provider.
+    """
+
+    def __init__(self, tracer: Any = None):
+        try:
+            from opentelemetry import trace
+        except ImportError:
+            raise ImportError(
+                "OpenTelemetryExporter requires opentelemetry-api. "
+                "Install it with `pip install game_sdk[otel]`"
+            )
+
+        self._trace = trace
+        self._tracer = tracer or trace.get_tracer("game_sdk")
+
+    def on_start(self, span: Span):
+        parent = span.parent.exporter_data.get(id(self)) if span.parent else None
+        otel_span = self._tracer.start_span(
+            span.name,
+            context=self._trace.set_span_in_context(parent) if parent is not None else None,
+            start_time=span.start_time_ns,
+        )
+        span.exporter_data[id(self)] = otel_span
+
+    def on_end(self, span: Span):
+        otel_span = span.exporter_data.pop(id(self), None)
+        if otel_span is None:
+            return
+        for key, value in span.attributes.items():
+            if value is not None:
+                otel_span.set_attribute(
+                    key, value if isinstance(value, (str, bool, int, float)) else str(value)
+                )
+        if span.error is not None:
+            otel_span.record_exception(span.error)
+            otel_span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, str(span.error)))
+        otel_span.end(end_time=span.end_time_ns)
+
+
+class Tracer:
+    """
+    Creates the spans of the agent and worker steps and hands them to its exporters.
+
+    Args:
+        exporters (Sequence[SpanExporter]): Exporters receiving the spans.
+
+    Example:
+        ```python
+        exporter = RingBufferExporter()
+        agent = Agent(..., tracer=Tracer([exporter, OpenTelemetryExporter()]))
+        ```
+    """
+
+    def __init__(self, exporters: Sequence[SpanExporter] = ()):
+        self.exporters: List[SpanExporter] = list(exporters)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.exporters)
+
+    def span(self, name: str, **attributes: Any) -> Span:
+        """Returns a span to use as a context manager"""
+        if not self.exporters:
+            return _NOOP_SPAN
+        return Span(self, name, attributes)
+
+    def add_exporter(self, exporter: SpanExporter):
+        self.exporters.append(exporter)
+
+    def shutdown(self):
+        for exporter in self.exporters:
+            exporter.shutdown()
+
+
+_current_span: "contextvars.ContextVar[Optional[Span]]" = contextvars.ContextVar(
+    "game_sdk_current_span", default=None
+)
+
+# tracer without exporters - every span is a no-op until tracing is configured
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """Returns the process-wide tracer, used by agents and workers created without one"""
+    return _tracer
+
+
+def set_tracer(tracer: Tracer):
+    """Replaces the process-wide tracer"""
+    global _tracer
+    _tracer = tracer
+
+
+def current_span() -> Optional[Span]:
+    """Returns the active span of the current thread or asyncio task"""
+    return _current_span.get()
+
+
+def span(name: str, **attributes: Any) -> Span:
+    """
+    Returns a child span of the active span (created by the same tracer), or a span of
+    the process-wide tracer if no span is active. Used by the code below the agents
+    (API clients, transport, serialization) that has no tracer of its own.
+    """
+    parent = _current_span.get()
+    return (parent._tracer if parent is not None else _tracer).span(name, **attributes)
@@ -0,0 +1,150 @@
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from game_sdk.game import tracing
+
+
+class Transport(ABC):
+    """
+    Base class of the transports the GAME API clients send their requests through.
+
+    HTTPTransport sends them over a pooled session; the other transports (e.g.
+    ResilientTransport, RecordingTransport) wrap another transport or answer the
+    requests themselves.
+    """
+
+    @abstractmethod
+    def request(self, method: str, url: str, idempotent: Optional[bool] = None, **kwargs: Any) -> requests.Response:
+        """
+        Sends a request, with the keyword arguments of `requests.request`
+
+        `idempotent` marks requests that are safe to send more than once, for the
+        transports that retry (see ResilientTransport).
+        """
+
+    @abstractmethod
+    def close(self):
+        """Releases the resources of the transport"""
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def __enter__(self) -> "Transport":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class HTTPTransport(Transport):
+    """
+    Pooled keep-alive HTTP transport shared by the GAME API clients.
+
+    Wraps a single `requests.Session` so that consecutive calls to the same host
+    reuse an open TCP/TLS connection instead of performing a new handshake per
+    request. One transport can (and should) be shared by every Agent, Worker and
+    ChatAgent in a process.
+
+    Args:
+        pool_connections (int): Number of per-host connection pools to keep.
+        pool_maxsize (int): Maximum number of keep-alive connections per host.
+        pool_block (bool): Wait for a free pooled connection when a host's pool is
+            exhausted, instead of opening an extra connection that is discarded after use.
+        host_limits (Optional[Dict[str, int]]): Per-host overrides of `pool_maxsize`,
+            keyed by URL prefix (e.g. {"https://sdk.game.virtuals.io": 50}).
+        timeout (Optional[float]): Default timeout in seconds applied to every request
+            that does not set its own.
+
+    Example:
+        ```python
+        transport = HTTPTransport(pool_maxsize=64)
+        agents = [Agent(..., transport=transport) for _ in range(100)]
+        ```
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        host_limits: Optional[Dict[str, int]] = None,
+        timeout: Optional[float] = None,
+    ):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.host_limits = dict(host_limits or {})
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        # keep-alive is the requests default, set explicitly since it is the point of this class
+        self.session.headers["Connection"] = "keep-alive"
+
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        # requests picks the adapter with the longest matching prefix
+        for prefix, maxsize in self.host_limits.items():
+            self.session.mount(
+                prefix,
+                HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=maxsize,
+                    pool_block=pool_block,
+                ),
+            )
+
+    def request(self, method: str, url: str, idempotent: Optional[bool] = None, **kwargs: Any) -> requests.Response:
+        """
+        Sends a request over the pooled session
+
+        `idempotent` marks requests that are safe to send more than once, for the
+        transports that retry (see ResilientTransport); it is ignored here.
+        """
+        if self.timeout is not None:
+            kwargs.setdefault("timeout", self.timeout)
+        with tracing.span("http.request", method=method, url=url) as span:
+            response = self.session.request(method, url, **kwargs)
+            span.set_attribute("status_code", response.status_code)
+        return response
+
+    def close(self):
+        """Closes all pooled connections"""
+        self.session.close()
+
+
+_default_transport: Optional[Transport] = None
+_default_transport_lock = threading.Lock()
+
+
+def get_default_transport() -> Transport:
+    """
+    Returns the process-wide transport used by clients that are not given one
+    """
+    global _default_transport
+    if _default_transport is None:
+        with _default_transport_lock:
+            if _default_transport is None:
+                _default_transport = HTTPTransport()
+    return _default_transport
+
+
+def set_default_transport(transport: Transport):
+    """
+    Replaces the process-wide transport (e.g. to raise the pool size)
+    """
+    global _default_transport
+    with _default_transport_lock:
+        _default_transport = transport
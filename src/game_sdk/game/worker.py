@@ -1,7 +1,20 @@
-from typing import Any, Callable, Dict, Optional, List
-from game_sdk.game.custom_types import Function, FunctionResult, FunctionResultStatus, ActionResponse, ActionType
+import concurrent.futures
+import copy
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, List
+from game_sdk.game.custom_types import Function, FunctionResult, FunctionResultStatus, ActionResponse, ActionType, TaskResult, TaskStatus, get_function_defs_json
 from game_sdk.game.api import GAMEClient
 from game_sdk.game.api_v2 import GAMEClientV2
+from game_sdk.game.transport import Transport
+from game_sdk.game.payload_encoding import PayloadEncoder
+from game_sdk.game.tracing import Tracer, get_tracer
+from game_sdk.game.id_cache import RemoteIdCache
+from game_sdk.game.sessions import standalone_worker_hash
+from game_sdk.game.memory import MemoryBudget, json_size
+from game_sdk.log import get_logger, log_fields
+
+logger = get_logger(__name__)
 
 class Worker:
     """
@@ -17,6 +30,21 @@ class Worker:
         get_state_fn (Callable): Function to retrieve and manage worker state.
         action_space (List[Function]): List of functions available to the worker.
         instruction (Optional[str]): Additional specific instructions for the worker.
+        model_name (str): Name of the model used by the GAME API.
+        transport (Optional[Transport]): Transport to use for API calls (e.g. a sized
+            HTTPTransport or a ResilientTransport).
+            Defaults to the process-wide shared transport.
+        payload_encoder (Optional[PayloadEncoder]): Encoder applied to action request
+            payloads (e.g. to send only state deltas to a backend that supports it).
+        tracer (Optional[Tracer]): Tracer recording the spans of every step.
+            Defaults to the process-wide tracer (disabled unless configured).
+        id_cache (Optional[RemoteIdCache]): Cache of remote agent ids by configuration,
+            so a worker constructed with the same configuration again reuses its
+            remote agent instead of creating a new one.
+        memory_budget (Optional[MemoryBudget]): Limits on the size of the worker state
+            and of function result infos, for long-running workers.
+        worker_id (Optional[str]): Id of the worker config the worker is created from
+            (see `Agent.get_worker`), part of its configuration for `id_cache`.
 
     Attributes:
         description (str): Worker's role description used in interactions.
@@ -50,14 +78,23 @@ class Worker:
         # specific additional instruction for the worker (PROMPT)
         instruction: Optional[str] = "",
         model_name: str = "Llama-3.3-70B-Instruct",
+        transport: Optional[Transport] = None,
+        payload_encoder: Optional[PayloadEncoder] = None,
+        tracer: Optional[Tracer] = None,
+        id_cache: Optional[RemoteIdCache] = None,
+        memory_budget: Optional[MemoryBudget] = None,
+        worker_id: Optional[str] = None,
     ):
 
-        if api_key.startswith("apt-"):
-            self.client = GAMEClientV2(api_key)
-        else:
-            self.client = GAMEClient(api_key)
+        self.client = self._create_client(api_key, transport)
             
         self._api_key: str = api_key
+        self._transport: Optional[Transport] = transport
+        self._payload_encoder: Optional[PayloadEncoder] = payload_encoder
+        self._tracer: Optional[Tracer] = tracer
+        self._id_cache: Optional[RemoteIdCache] = id_cache
+        self._memory_budget: Optional[MemoryBudget] = memory_budget
+        self._worker_id: Optional[str] = worker_id
 
         self._model_name: str = model_name
 
@@ -92,9 +129,7 @@ class Worker:
             self.action_space: Dict[str, Function] = action_space
 
         # initialize an agent instance for the worker
-        self._agent_id: str = self.client.create_agent(
-            "StandaloneWorker", self.description, "N/A"
-        )
+        self._agent_id: Optional[str] = self._create_remote_agent()
 
         # persistent variables that is maintained through the worker running
         # task ID for everytime you provide/update the task (i.e. ask the agent to do something)
@@ -102,6 +137,34 @@ class Worker:
         # current response from the Agent
         self._function_result: Optional[FunctionResult] = None
 
+    def _create_client(self, api_key: str, transport: Optional[Transport]):
+        """
+        Creates the GAME API client matching the API key version
+        """
+        if api_key.startswith("apt-"):
+            return GAMEClientV2(api_key, transport=transport)
+        return GAMEClient(api_key, transport=transport)
+
+    def _create_remote_agent(self) -> Optional[str]:
+        """
+        Creates the agent instance backing the worker on the GAME API (or reuses a
+        cached one) and returns its id
+        """
+        def create() -> str:
+            return self.client.create_agent("StandaloneWorker", self.description, "N/A")
+
+        if self._id_cache is None:
+            return create()
+        return self._id_cache.get_or_create(self._remote_agent_fingerprint(), create)
+
+    def _remote_agent_fingerprint(self) -> str:
+        return "worker:" + standalone_worker_hash(
+            self._api_key, self.description, self._worker_id, self.instruction, self.action_space
+        )
+
+    def _get_tracer(self) -> Tracer:
+        return self._tracer or get_tracer()
+
     def set_task(self, task: str):
         """
         Sets the task for the agent
@@ -117,13 +180,13 @@ class Worker:
 
         return self._submission_id
 
-    def _get_action(
+    def _build_action_data(
         self,
         # results of the previous action (if any)
         function_result: Optional[FunctionResult] = None
-    ) -> ActionResponse:
+    ) -> Dict:
         """
-        Gets the agent action from the GAME API
+        Builds the payload for the next worker action request
         """
         # dummy function result if None is provided - for get_state_fn to take the same input all the time
         if function_result is None:
@@ -145,9 +208,7 @@ class Worker:
         # set up data payload
         data = {
             "environment": self.state,  # state (updated state)
-            "functions": [
-                f.get_function_def() for f in self.action_space.values()  # functions available
-            ],
+            "functions": get_function_defs_json(self.action_space.values()),  # functions available
             "action_result": (
                 function_result.model_dump(
                     exclude={'info'}) if function_result else None
@@ -155,53 +216,150 @@ class Worker:
             "observations": observations
         }
 
-        # make API call
-        response = self.client.get_worker_action(
-            self._agent_id, 
-            self._submission_id, 
-            data,
-            model_name=self._model_name
-        )
+        if self._payload_encoder is not None:
+            data = self._payload_encoder.encode(self._agent_id, data)
 
-        return ActionResponse.model_validate(response)
+        return data
 
-    def step(self):
+    def _get_action(
+        self,
+        # results of the previous action (if any)
+        function_result: Optional[FunctionResult] = None
+    ) -> ActionResponse:
         """
-        Execute the next step in the task - requires a task ID (i.e. task ID)
+        Gets the agent action from the GAME API
         """
-        if not self._submission_id:
-            raise ValueError("No task set")
+        tracer = self._get_tracer()
 
-        # get action from GAME API (Agent)
-        action_response = self._get_action(self._function_result)
-        action_type = action_response.action_type
+        with tracer.span("worker.build_request"):
+            data = self._build_action_data(function_result)
 
-        print(f"Action response: {action_response}")
-        print(f"Action type: {action_type}")
+        # make API call
+        try:
+            with tracer.span("worker.api_call", model_name=self._model_name):
+                response = self.client.get_worker_action(
+                    self._agent_id, 
+                    self._submission_id, 
+                    data,
+                    model_name=self._model_name,
+                    # full payloads can be resent, encoded ones refer to the previous payload
+                    idempotent=self._payload_encoder is None or self._payload_encoder.idempotent,
+                )
+        except Exception:
+            # the backend may not have seen this payload - next one is sent in full
+            if self._payload_encoder is not None:
+                self._payload_encoder.reset(self._agent_id)
+            raise
+
+        with tracer.span("worker.validate_response"):
+            return ActionResponse.from_api(response)
+
+    def _get_selected_function(self, action_response: ActionResponse) -> Optional[Function]:
+        """
+        Reports the action response and returns the function selected by GAME,
+        or None if the action does not call a function
+        """
+        fields = log_fields(
+            agent_id=self._agent_id,
+            submission_id=self._submission_id,
+            action_type=action_response.action_type.value,
+        )
+        logger.info("Action type: %s", action_response.action_type.value, extra=fields)
+        logger.debug("Action response: %r", action_response, extra=fields)
+
+        if action_response.action_type != ActionType.CALL_FUNCTION:
+            return None
 
-        # execute action
-        if action_type == ActionType.CALL_FUNCTION:
-            if not action_response.action_args:
-                raise ValueError("No function information provided by GAME")
+        if not action_response.action_args:
+            raise ValueError("No function information provided by GAME")
 
-            self._function_result = self.action_space[
-                action_response.action_args["fn_name"]
-            ].execute(**action_response.action_args)
+        fields = log_fields(**fields["game"], fn_name=action_response.action_args["fn_name"])
+        logger.info("Action selected: %s", action_response.action_args["fn_name"], extra=fields)
 
-            print(f"Function result: {self._function_result}")
+        return self.action_space[action_response.action_args["fn_name"]]
+
+    def _apply_action(self, action_response: ActionResponse):
+        """
+        Updates the worker state after an action (and its function execution, if any)
+        """
+        if action_response.action_type == ActionType.CALL_FUNCTION:
+            logger.info(
+                "Function result: %s",
+                self._function_result.action_status.value,
+                extra=log_fields(
+                    agent_id=self._agent_id,
+                    submission_id=self._submission_id,
+                    action_id=self._function_result.action_id,
+                    status=self._function_result.action_status.value,
+                ),
+            )
+            logger.debug("Function result: %r", self._function_result)
 
             # update state
-            self.state = self.get_state_fn(self._function_result, self.state)
+            with self._get_tracer().span("worker.state"):
+                state = self.get_state_fn(self._function_result, self.state)
+                if self._memory_budget is not None:
+                    state = self._memory_budget.limit_state(state, f"worker {self._agent_id}")
+                self.state = state
 
         elif action_response.action_type == ActionType.WAIT:
-            print("Task completed or ended (not possible)")
+            logger.info(
+                "Task completed or ended (not possible)",
+                extra=log_fields(agent_id=self._agent_id, submission_id=self._submission_id),
+            )
             self._submission_id = None
 
         else:
             raise ValueError(
                 f"Unexpected action type: {action_response.action_type}")
 
-        return action_response, self._function_result.model_copy()
+    def _limit_function_result(self, function_result: FunctionResult) -> FunctionResult:
+        if self._memory_budget is None:
+            return function_result
+        return self._memory_budget.limit_function_result(function_result)
+
+    def memory_report(self) -> Dict[str, Any]:
+        """
+        Returns the size (as serialized JSON) of the worker state and last function
+        result info, with the stats of the memory budget, if any
+        """
+        report: Dict[str, Any] = {
+            "agent_id": self._agent_id,
+            "state_bytes": json_size(self.state),
+            "function_result_info_bytes": json_size(self._function_result.info) if self._function_result else 0,
+        }
+        report["total_bytes"] = report["state_bytes"] + report["function_result_info_bytes"]
+        if self._memory_budget is not None:
+            report["budget"] = self._memory_budget.stats()
+        return report
+
+    def step(self):
+        """
+        Execute the next step in the task - requires a task ID (i.e. task ID)
+        """
+        if not self._submission_id:
+            raise ValueError("No task set")
+
+        tracer = self._get_tracer()
+
+        with tracer.span("worker.step", agent_id=self._agent_id) as step_span:
+            # get action from GAME API (Agent)
+            with tracer.span("worker.get_action"):
+                action_response = self._get_action(self._function_result)
+            step_span.set_attribute("action_type", action_response.action_type.value)
+
+            # execute action
+            function = self._get_selected_function(action_response)
+            if function is not None:
+                with tracer.span("function.execute", fn_name=function.fn_name) as execute_span:
+                    self._function_result = self._limit_function_result(
+                        function.execute(**action_response.action_args))
+                    execute_span.set_attribute("status", self._function_result.action_status.value)
+
+            self._apply_action(action_response)
+
+        # no function result yet if GAME ended the task before calling a function
+        return action_response, self._function_result.model_copy() if self._function_result else None
 
     def run(self, task: str):
         """
@@ -211,3 +369,145 @@ class Worker:
         self.set_task(task)
         while self._submission_id:
             self.step()
+
+    def _fork(self) -> "Worker":
+        """
+        Returns a copy of the worker for one task of `run_many`: it shares the remote
+        agent, client and action space, and starts from its own initial state
+        """
+        worker = copy.copy(self)
+        worker._submission_id = None
+        worker._function_result = None
+        # concurrent submissions of one agent cannot share a payload delta stream
+        worker._payload_encoder = None
+        worker.state = worker.get_state_fn(
+            FunctionResult(
+                action_id="",
+                action_status=FunctionResultStatus.DONE,
+                feedback_message="",
+                info={},
+            ),
+            None,
+        )
+        return worker
+
+    def _result(self, index: int, task: str, status: TaskStatus, steps: int,
+                submission_id: Optional[str], error: Optional[BaseException] = None) -> TaskResult:
+        result = TaskResult(
+            index=index,
+            task=task,
+            status=status,
+            steps=steps,
+            submission_id=submission_id,
+            function_result=self._function_result,
+            state=self.state,
+            error=error,
+        )
+        logger.log(
+            logging.WARNING if error is not None else logging.INFO,
+            "Task %d %s after %d steps",
+            index,
+            status.value,
+            steps,
+            exc_info=error,
+            extra=log_fields(agent_id=self._agent_id, submission_id=submission_id, status=status.value, steps=steps),
+        )
+        return result
+
+    def _run_task(self, index: int, task: str, max_steps: Optional[int], stop: threading.Event) -> TaskResult:
+        """Runs one task of `run_many` on a fork of the worker, until it ends or `stop` is set"""
+        worker = self._fork()
+        steps = 0
+        submission_id = None
+        try:
+            submission_id = worker.set_task(task)
+            while worker._submission_id:
+                if stop.is_set():
+                    return worker._result(index, task, TaskStatus.CANCELLED, steps, submission_id)
+                if max_steps is not None and steps >= max_steps:
+                    return worker._result(index, task, TaskStatus.MAX_STEPS, steps, submission_id)
+                worker.step()
+                steps += 1
+        except Exception as e:
+            return worker._result(index, task, TaskStatus.FAILED, steps, submission_id, e)
+        return worker._result(index, task, TaskStatus.DONE, steps, submission_id)
+
+    def run_many(
+        self,
+        tasks: Iterable[str],
+        concurrency: int = 8,
+        max_steps: Optional[int] = None,
+    ) -> Iterator[TaskResult]:
+        """
+        Runs many tasks concurrently on the worker's remote agent, yielding their
+        results as they finish (not in submission order).
+
+        Each task runs on its own copy of the worker, starting from the initial state,
+        so tasks do not see each other's state. A task whose step raises an exception
+        ends as FAILED without affecting the others. Tasks are read from `tasks` only
+        as threads become free, so it can be a lazy iterable of any length. Payload
+        encoding is not applied to these tasks. Closing the iterator early (e.g. with a
+        `break`) stops the running tasks after their current step and drops the others.
+
+        Args:
+            tasks (Iterable[str]): Tasks to run.
+            concurrency (int): Number of tasks running at the same time (threads).
+            max_steps (Optional[int]): Steps after which a task is stopped (MAX_STEPS),
+                so a runaway task cannot hold a thread forever.
+
+        Returns:
+            Iterator[TaskResult]: The result of every task, as they finish.
+
+        Example:
+            ```python
+            for result in worker.run_many(tasks, concurrency=16, max_steps=20):
+                print(result.index, result.status, result.function_result)
+            ```
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        task_iter = enumerate(tasks)
+        stop = threading.Event()
+        pool = concurrent.futures.ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="game-sdk-task")
+        pending = set()
+
+        def submit_next() -> bool:
+            for index, task in task_iter:
+                pending.add(pool.submit(self._run_task, index, task, max_steps, stop))
+                return True
+            return False
+
+        try:
+            for _ in range(concurrency):
+                if not submit_next():
+                    break
+
+            while pending:
+                done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    pending.discard(future)
+                    submit_next()
+                    yield future.result()
+        finally:
+            # closed early (e.g. a break out of the loop): the running tasks stop after
+            # their current step, and the tasks not started yet are dropped
+            stop.set()
+            for future in pending:
+                future.cancel()
+            pool.shutdown(wait=True)
+
+    def map(
+        self,
+        tasks: Iterable[str],
+        concurrency: int = 8,
+        max_steps: Optional[int] = None,
+    ) -> List[TaskResult]:
+        """
+        Runs many tasks concurrently like `run_many` and returns their results in the
+        order of `tasks`.
+        """
+        return sorted(
+            self.run_many(tasks, concurrency=concurrency, max_steps=max_steps),
+            key=lambda result: result.index,
+        )
@@ -1,9 +1,14 @@
-from typing import List, Any, Dict, Optional, Union, Set
-from dataclasses import dataclass, asdict
+from typing import List, Any, Dict, Iterable, Optional, Sequence, Union, Set, Tuple
+from dataclasses import dataclass, asdict, field
+import concurrent.futures
+import contextvars
 import json
 import uuid
 import requests
+from game_sdk.game.transport import Transport, get_default_transport
 from game_sdk.hosted_game import sdk
+from game_sdk.hosted_game.metadata_cache import MetadataCache
+from game_sdk.hosted_game.templates import ArgValidator, RequestPlan, compile_template
 
 
 @dataclass
@@ -12,6 +17,7 @@ class FunctionArgument:
     description: str
     type: str
     id: str = None
+    required: bool = True
     
     def __post_init__(self):
         self.id = self.id or str(uuid.uuid4())
@@ -30,15 +36,22 @@ class FunctionConfig:
     headersString: str = "{}"  # Added field
     payloadString: str = "{}"  # Added field
     platform: str = None
+    query_params: Dict = None  # sent in the URL, an argument without value leaves its parameter out
 
     def __post_init__(self):
         self.headers = self.headers or {}
         self.payload = self.payload or {}
+        self.query_params = self.query_params or {}
 
         self.headersString = json.dumps(self.headers, indent=4)
         self.payloadString = json.dumps(self.payload, indent=4)
 
 
+def _without_defaults(fields: Dict[str, Any], **defaults: Any) -> Dict[str, Any]:
+    """Drops the fields left at their default, so functions not using them serialize as before"""
+    return {key: value for key, value in fields.items() if key not in defaults or value != defaults[key]}
+
+
 @dataclass
 class Function:
     fn_name: str
@@ -47,85 +60,89 @@ class Function:
     config: FunctionConfig
     hint: str = ""
     id: str = None
+    # pooled session the calls are sent over, the process-wide transport by default
+    transport: Optional[Transport] = field(default=None, repr=False, compare=False)
 
     def __post_init__(self):
         self.id = self.id or str(uuid.uuid4())
+        # argument validator and request plan, compiled on the first call
+        self._compiled: Optional[Tuple[tuple, ArgValidator, RequestPlan]] = None
 
     def toJson(self):
         return {
             "id": self.id,
             "fn_name": self.fn_name,
             "fn_description": self.fn_description,
-            "args": [asdict(arg) for arg in self.args],
+            "args": [_without_defaults(asdict(arg), required=True) for arg in self.args],
             "hint": self.hint,
-            "config": asdict(self.config)
+            "config": _without_defaults(asdict(self.config), query_params={})
         }
 
-    def _validate_args(self, *args) -> Dict[str, Any]:
-        """Validate and convert positional arguments to named arguments"""
-        if len(args) != len(self.args):
-            raise ValueError(f"Expected {len(self.args)} arguments, got {len(args)}")
-
-        # Create dictionary of argument name to value
-        arg_dict = {}
-        for provided_value, arg_def in zip(args, self.args):
-            arg_dict[arg_def.name] = provided_value
+    def _compile_key(self) -> tuple:
+        """What the compiled validator and request plan are built from"""
+        config = self.config
+        return (
+            tuple((arg.name, arg.type, arg.required) for arg in self.args),
+            config.method,
+            config.url,
+            dict(config.headers),
+            dict(config.payload),
+            dict(config.query_params),
+        )
 
-            # Type validation (basic)
-            if arg_def.type == "string" and not isinstance(provided_value, str):
-                raise TypeError(f"Argument {arg_def.name} must be a string")
-            elif arg_def.type == "array" and not isinstance(provided_value, (list, tuple)):
-                raise TypeError(f"Argument {arg_def.name} must be an array")
-            # elif arg_def.type == "boolean" and not isinstance(provided_value, bool):
-            #     raise TypeError(f"Argument {arg_def.name} must be a boolean")
+    def _get_compiled(self) -> Tuple[ArgValidator, RequestPlan]:
+        """Return the argument validator and request plan, compiling them again if the args or config changed"""
+        compiled = self._compiled
+        config = self.config
+        if (
+            compiled is None
+            or len(compiled[0][0]) != len(self.args)
+            or any((arg.name, arg.type, arg.required) != compiled_arg for arg, compiled_arg in zip(self.args, compiled[0][0]))
+            or compiled[0][1:] != (config.method, config.url, config.headers, config.payload, config.query_params)
+        ):
+            compiled = self._compiled = (self._compile_key(), ArgValidator(self.args), RequestPlan(config))
+        return compiled[1], compiled[2]
 
-        return arg_dict
+    def _validate_args(self, *args) -> Dict[str, Any]:
+        """Validate and convert positional arguments to named arguments"""
+        validator, _ = self._get_compiled()
+        return validator(args)
 
     def _interpolate_template(self, template_str: str, values: Dict[str, Any]) -> str:
-        """Interpolate a template string with given values"""
-        # Convert ContentLLMTemplate-style placeholders ({{var}}) to Python style ($var)
-        python_style = template_str.replace('{{', '$').replace('}}', '')
-        return ContentLLMTemplate(python_style).safe_substitute(values)
+        """Interpolate a template string ({{var}} or {{var.path}} placeholders) with given values"""
+        return compile_template(template_str).render(values)
 
     def _prepare_request(self, arg_dict: Dict[str, Any]) -> Dict[str, Any]:
         """Prepare the request configuration with interpolated values"""
-        config = self.config
-
-        # Interpolate URL
-        url = self._interpolate_template(config.url, arg_dict)
-
-        # Interpolate payload
-        payload = {}
-        for key, value in config.payload.items():
-            if isinstance(value, str):
-                # Handle template values
-                template_key = self._interpolate_template(key, arg_dict)
-                if value.strip('{}') in arg_dict:
-                    # For array and other non-string types, use direct value
-                    payload[template_key] = arg_dict[value.strip('{}')]
-                else:
-                    # For string interpolation
-                    payload[template_key] = self._interpolate_template(value, arg_dict)
-            else:
-                payload[key] = value
-
-        return {
-            "method": config.method,
-            "url": url,
-            "headers": config.headers,
-            "data": json.dumps(payload)
-        }
+        _, plan = self._get_compiled()
+        return plan.build(arg_dict)
 
     def __call__(self, *args):
         """Allow the function to be called directly with arguments"""
+        return self.call(*args)
+
+    def call(self, *args, query_params: Optional[Dict[str, Any]] = None, feedback: bool = True):
+        """
+        Calls the function with arguments, like calling it directly.
+
+        Args:
+            query_params (Optional[Dict[str, Any]]): Query parameters added to those of
+                the config (e.g. a pagination cursor).
+            feedback (bool): Print the success or error feedback of the config.
+        """
+        validator, plan = self._get_compiled()
+
         # Validate and convert args to dictionary
-        arg_dict = self._validate_args(*args)
+        arg_dict = validator(args)
 
         # Prepare request
-        request_config = self._prepare_request(arg_dict)
+        request_config = plan.build(arg_dict)
+        if query_params:
+            request_config["params"] = {**request_config.get("params", {}), **query_params}
 
-        # Make the request
-        response = requests.request(**request_config)
+        # Make the request, over a keep-alive connection to the host if one is free
+        transport = self.transport or get_default_transport()
+        response = transport.request(**request_config)
 
         # Handle response
         if response.ok:
@@ -134,7 +151,7 @@ class Function:
             except requests.exceptions.JSONDecodeError:
                 result = response.text or None
             # Interpolate success feedback if provided
-            if hasattr(self.config, 'success_feedback'):
+            if feedback and hasattr(self.config, 'success_feedback'):
                 print(self._interpolate_template(self.config.success_feedback, 
                                               {"response": result, **arg_dict}))
             return result
@@ -144,7 +161,7 @@ class Function:
                 error_msg = response.json()
             except requests.exceptions.JSONDecodeError:
                 error_msg = {"description": response.text or response.reason}
-            if hasattr(self.config, "error_feedback"):
+            if feedback and hasattr(self.config, "error_feedback"):
                 print(
                     self._interpolate_template(
                         self.config.error_feedback, {"response": error_msg, **arg_dict}
@@ -152,6 +169,86 @@ class Function:
                 )
             raise requests.exceptions.HTTPError(f"Request failed: {error_msg}")
 
+    def call_many(
+        self,
+        calls: Iterable[Sequence[Any]],
+        concurrency: int = 10,
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """
+        Calls the function once per argument list, `concurrency` calls at a time, and
+        returns the results in the order of `calls` (see `call_many`).
+
+        Example:
+            ```python
+            send_message = TelegramClient(token).get_function("send_message")
+            results = send_message.call_many([(chat_id, text) for chat_id in chat_ids], concurrency=20)
+            ```
+        """
+        return call_many(((self, args) for args in calls), concurrency=concurrency, return_exceptions=return_exceptions)
+
+
+def call_many(
+    calls: Iterable[Tuple[Function, Sequence[Any]]],
+    concurrency: int = 10,
+    return_exceptions: bool = False,
+) -> List[Any]:
+    """
+    Calls many hosted functions concurrently, e.g. to post to many chats at once.
+
+    Calls are read from `calls` as threads become free and share the pooled
+    connections of their transport, whose `pool_maxsize` should be at least
+    `concurrency` (10 for the default transport) to keep every connection alive.
+
+    Args:
+        calls (Iterable[Tuple[Function, Sequence[Any]]]): Functions and their arguments.
+        concurrency (int): Number of calls in flight at the same time (threads).
+        return_exceptions (bool): Return the exception of a failed call in place of its
+            result. Otherwise the first failure cancels the calls not started yet and
+            is raised.
+
+    Returns:
+        List[Any]: The result of every call, in the order of `calls`.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    call_iter = enumerate(calls)
+    results: Dict[int, Any] = {}
+
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=concurrency, thread_name_prefix="game-sdk-hosted-call"
+    ) as pool:
+        pending: Dict[concurrent.futures.Future, int] = {}
+
+        def submit_next() -> bool:
+            for index, (function, args) in call_iter:
+                # a context per call, so tracing spans nest under the caller's span
+                future = pool.submit(contextvars.copy_context().run, function, *args)
+                pending[future] = index
+                return True
+            return False
+
+        for _ in range(concurrency):
+            if not submit_next():
+                break
+
+        while pending:
+            done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    if not return_exceptions:
+                        for other in pending:
+                            other.cancel()
+                        raise
+                    results[index] = e
+                submit_next()
+
+    return [results[index] for index in range(len(results))]
+
 @dataclass
 class ContentLLMTemplate:
     template_type: str
@@ -254,9 +351,10 @@ class Agent:
         main_heartbeat: int = 15,
         reaction_heartbeat: int = 5,
         task_description: str = "",
-        game_engine_model: str = "llama_3_1_405b"
+        game_engine_model: str = "llama_3_1_405b",
+        metadata_cache: Optional[MetadataCache] = None,
     ):
-        self.game_sdk = sdk.GameSDK(api_key)
+        self.game_sdk = sdk.GameSDK(api_key, metadata_cache=metadata_cache)
         self.goal = goal
         self.description = description
         self.enabled_functions: List[str] = []
@@ -382,17 +480,7 @@ class Agent:
             "goal": self.goal,
             "description": self.description,
             "functions": self.enabled_functions,
-            "customFunctions": [
-                {
-                    "id": func.id,
-                    "fn_name": func.fn_name,
-                    "fn_description": func.fn_description,
-                    "args": [asdict(arg) for arg in func.args],
-                    "hint": func.hint,
-                    "config": asdict(func.config)
-                }
-                for func in self.custom_functions
-            ]
+            "customFunctions": [func.toJson() for func in self.custom_functions]
         }
         agent_json = json.dumps(export_dict, indent=4)
 
@@ -1,5 +1,8 @@
-from typing import Dict, List
+from typing import Any, Dict, Iterator, List, Optional
+from game_sdk.game.transport import Transport
 from game_sdk.hosted_game.agent import Function, FunctionConfig, FunctionArgument
+from game_sdk.hosted_game.pagination import paginate
+from game_sdk.hosted_game.rate_limit import create_platform_transport
 
 class FarcasterClient:
     """
@@ -7,13 +10,15 @@ class FarcasterClient:
     Each function is designed with simple, intuitive arguments for LLM agents.
     """
     
-    def __init__(self, api_key: str, signer_uuid: str):
+    def __init__(self, api_key: str, signer_uuid: str, transport: Optional[Transport] = None):
         """
         Initialize the Farcaster client.
         
         Args:
             api_key (str): Your Neynar API key
             signer_uuid (str): Default signer UUID for all operations
+            transport (Optional[Transport]): Transport the functions are called over,
+                a RateLimitedTransport with the Farcaster rate limits by default
         """
         self.api_key = api_key
         self.signer_uuid = signer_uuid
@@ -24,6 +29,9 @@ class FarcasterClient:
             "api_key": self.api_key
         }
 
+        # calls of every function share the rate limits of the client
+        self.transport = transport or create_platform_transport("farcaster")
+
         self._functions: Dict[str, Function] = {
             # Content Creation
             "post_cast": self._create_post_cast(),
@@ -47,6 +55,8 @@ class FarcasterClient:
             "search_casts": self._create_search_casts(),
             "search_users": self._create_search_users(),
         }
+        for function in self._functions.values():
+            function.transport = self.transport
 
     @property
     def available_functions(self) -> List[str]:
@@ -59,6 +69,40 @@ class FarcasterClient:
             raise ValueError(f"Function '{fn_name}' not found. Available functions: {', '.join(self.available_functions)}")
         return self._functions[fn_name]
 
+    def _paginate(self, fn_name: str, args: tuple, items_path: str, cursor_path: str, dedupe_field: str, options: Dict[str, Any]) -> Iterator[Dict]:
+        # trailing optional arguments without value are left out
+        while args and args[-1] is None:
+            args = args[:-1]
+        options.setdefault("dedupe_key", lambda item: item.get(dedupe_field))
+        return paginate(self.get_function(fn_name), args, items_path=items_path, cursor_path=cursor_path, **options)
+
+    def iter_trending_casts(self, time_window: Optional[str] = None, **options: Any) -> Iterator[Dict]:
+        """
+        Iterate over the trending casts, following the Neynar cursors lazily.
+
+        Args:
+            time_window (Optional[str]): '1h', '6h', '24h' or '7d'.
+            **options: Options of `pagination.paginate` (max_items, max_seconds,
+                page_size, prefetch, ...). Casts are deduplicated by hash.
+
+        Example:
+            for cast in client.iter_trending_casts("24h", max_items=500, max_seconds=60):
+                ...
+        """
+        return self._paginate("get_trending_casts", (time_window,), "casts", "next.cursor", "hash", options)
+
+    def iter_user_casts(self, fid: int, **options: Any) -> Iterator[Dict]:
+        """Iterate over the casts of a user (see `iter_trending_casts` for the options)."""
+        return self._paginate("get_user_casts", (fid,), "casts", "next.cursor", "hash", options)
+
+    def iter_search_casts(self, query: str, channel_name: Optional[str] = None, **options: Any) -> Iterator[Dict]:
+        """Iterate over the casts matching a search (see `iter_trending_casts` for the options)."""
+        return self._paginate("search_casts", (query, channel_name), "result.casts", "result.next.cursor", "hash", options)
+
+    def iter_search_users(self, query: str, **options: Any) -> Iterator[Dict]:
+        """Iterate over the users matching a search, deduplicated by fid (see `iter_trending_casts` for the options)."""
+        return self._paginate("search_users", (query,), "result.users", "result.next.cursor", "fid", options)
+
     def _create_post_cast(self) -> Function:
         return Function(
             fn_name="post_cast",
@@ -290,7 +334,7 @@ class FarcasterClient:
             ],
             config=FunctionConfig(
                 method="get",
-                url=f"{self.base_url}/farcaster/cast/{{cast_hash}}/reactions",
+                url=self.base_url + "/farcaster/cast/{{cast_hash}}/reactions",
                 platform="farcaster",
                 headers=self.base_headers,
                 success_feedback="Cast has {{response.reactions.likes}} likes and {{response.reactions.recasts}} recasts. Top engaging users: {{response.reactions.top_likers.[0].username}}, {{response.reactions.top_likers.[1].username}}, {{response.reactions.top_likers.[2].username}}"
@@ -411,7 +455,7 @@ class FarcasterClient:
             ],
             config=FunctionConfig(
                 method="get",
-                url=f"{self.base_url}/farcaster/cast/{{cast_hash}}/reactions",
+                url=self.base_url + "/farcaster/cast/{{cast_hash}}/reactions",
                 platform="farcaster",
                 headers=self.base_headers,
                 success_feedback="Cast has {{response.reactions.likes}} likes and {{response.reactions.recasts}} recasts. Most engaged users: {{response.reactions.top_likers.[0].username}}, {{response.reactions.top_likers.[1].username}}",
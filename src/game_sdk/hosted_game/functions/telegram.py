@@ -1,5 +1,7 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
+from game_sdk.game.transport import Transport
 from game_sdk.hosted_game.agent import Function, FunctionConfig, FunctionArgument
+from game_sdk.hosted_game.rate_limit import create_platform_transport
 
 class TelegramClient:
     """
@@ -12,15 +14,20 @@ class TelegramClient:
         send_message = client.get_send_message_function()
     """
     
-    def __init__(self, bot_token: str):
+    def __init__(self, bot_token: str, transport: Optional[Transport] = None):
         """
         Initialize the Telegram client with a bot token.
         
         Args:
             bot_token (str): Your Telegram bot token
+            transport (Optional[Transport]): Transport the functions are called over,
+                a RateLimitedTransport with the Telegram rate limits by default
         """
         self.bot_token = bot_token
 
+        # calls of every function share the rate limits of the client
+        self.transport = transport or create_platform_transport("telegram")
+
         self._functions: Dict[str, Function] = {
             "send_message": self._create_send_message(),
             "send_media": self._create_send_media(),
@@ -28,6 +35,8 @@ class TelegramClient:
             "pin_message": self._create_pin_message(),
             "delete_message": self._create_delete_message(),
         }
+        for function in self._functions.values():
+            function.transport = self.transport
 
     @property
     def available_functions(self) -> List[str]:
@@ -0,0 +1,211 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from game_sdk.log import get_logger, log_fields
+
+logger = get_logger(__name__)
+
+# result of a fetch: the value and its ETag, or None when the server answered 304 Not Modified
+FetchResult = Optional[Tuple[Any, Optional[str]]]
+
+
+def cache_key(api_key: str, resource: str) -> str:
+    """Returns the cache key of a resource fetched with an API key (which is not stored)"""
+    return hashlib.sha256(f"{api_key}\n{resource}".encode("utf-8")).hexdigest()[:32]
+
+
+class MetadataCache:
+    """
+    Thread-safe cache of read-only hosted GAME metadata, such as the default function
+    catalog returned by `GameSDK.functions()`.
+
+    Values are kept in memory, and in a directory when one is given, so the processes
+    of a fleet share them across restarts. A value is served as is for `ttl` seconds;
+    after that it is revalidated with its ETag (`If-None-Match`), so an unchanged
+    value costs a 304 response instead of a download. Concurrent lookups of a missing
+    or stale value wait on a single request.
+
+    Entries are keyed by a hash of the API key and the resource, so every GameSDK
+    using the same API key shares them (see `get_default_metadata_cache`).
+
+    Args:
+        directory (Optional[str]): Directory of the cache files, created if missing.
+            None keeps the cache in memory.
+        ttl (float): Seconds during which a cached value is used without revalidation.
+
+    Attributes:
+        hits (int): Lookups served from the cache without a request.
+        revalidated (int): Stale values confirmed unchanged by the server (304).
+        misses (int): Lookups that downloaded the value.
+
+    Example:
+        ```python
+        set_default_metadata_cache(MetadataCache(directory="~/.cache/game_sdk", ttl=3600))
+        agents = [Agent(api_key, ...) for _ in range(100)]
+        agents[0].list_available_default_twitter_functions()  # downloaded once for all agents
+        ```
+    """
+
+    def __init__(self, directory: Optional[str] = None, ttl: float = 300.0):
+        if ttl < 0:
+            raise ValueError("ttl must not be negative")
+
+        self.directory = os.path.expanduser(directory) if directory is not None else None
+        self.ttl = ttl
+        if self.directory is not None:
+            os.makedirs(self.directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        # key -> {"value": ..., "etag": ..., "fetched_at": unix time}
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._fetching: Dict[str, threading.Lock] = {}
+
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".json")
+
+    def _is_fresh(self, entry: Dict[str, Any]) -> bool:
+        return time.time() - entry["fetched_at"] < self.ttl
+
+    def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        """Returns the entry of `key`, read from the directory if it is not in memory"""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None or self.directory is None:
+            return entry
+
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            # a corrupt file is only a miss
+            return None
+        with self._lock:
+            return self._entries.setdefault(key, entry)
+
+    def _store(self, key: str, entry: Dict[str, Any]):
+        with self._lock:
+            self._entries[key] = entry
+        if self.directory is None:
+            return
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def get(self, key: str, fetch: Callable[[Optional[str]], FetchResult], refresh: bool = False) -> Any:
+        """
+        Returns the value cached for `key`, fetching it if missing or stale.
+
+        Args:
+            key (str): Cache key (see `cache_key`).
+            fetch (Callable[[Optional[str]], FetchResult]): Requests the value, with the
+                ETag of the cached value to send as If-None-Match (or None). Returns
+                the value and its ETag, or None if the server answered 304.
+            refresh (bool): Revalidate the cached value even if it is fresh.
+        """
+        entry = self._load(key)
+        if entry is not None and not refresh and self._is_fresh(entry):
+            with self._lock:
+                self.hits += 1
+            return entry["value"]
+
+        with self._lock:
+            fetching = self._fetching.setdefault(key, threading.Lock())
+
+        with fetching:
+            # fetched by the caller that held the lock before us
+            with self._lock:
+                current = self._entries.get(key)
+            if current is not None and current is not entry and self._is_fresh(current):
+                with self._lock:
+                    self.hits += 1
+                return current["value"]
+            entry = current or entry
+
+            result = fetch(entry["etag"] if entry is not None else None)
+            if result is None and entry is not None:
+                entry = dict(entry, fetched_at=time.time())
+                with self._lock:
+                    self.revalidated += 1
+            else:
+                if result is None:
+                    raise ValueError("The server answered 304 Not Modified to a request without ETag")
+                value, etag = result
+                entry = {"value": value, "etag": etag, "fetched_at": time.time()}
+                with self._lock:
+                    self.misses += 1
+            self._store(key, entry)
+
+        logger.debug(
+            "Metadata %s %s", key, "revalidated" if result is None else "fetched",
+            extra=log_fields(key=key, etag=entry["etag"]),
+        )
+        return entry["value"]
+
+    def invalidate(self, key: Optional[str] = None):
+        """Drops the value cached for `key`, or every cached value if None"""
+        with self._lock:
+            keys = list(self._entries) if key is None else [key]
+            for dropped in keys:
+                self._entries.pop(dropped, None)
+        if self.directory is None:
+            return
+        if key is None:
+            keys = [name[:-len(".json")] for name in os.listdir(self.directory) if name.endswith(".json")]
+        for dropped in keys:
+            try:
+                os.remove(self._path(dropped))
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the number of cached values, hits, revalidations and misses"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "misses": self.misses,
+            }
+
+
+_default_cache: Optional[MetadataCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_metadata_cache() -> MetadataCache:
+    """
+    Returns the process-wide metadata cache (in memory) used by GameSDK instances
+    that are not given one
+    """
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = MetadataCache()
+    return _default_cache
+
+
+def set_default_metadata_cache(cache: MetadataCache):
+    """
+    Replaces the process-wide metadata cache (e.g. with one kept on disk)
+    """
+    global _default_cache
+    with _default_cache_lock:
+        _default_cache = cache
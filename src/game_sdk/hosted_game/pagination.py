@@ -0,0 +1,134 @@
+import collections
+import concurrent.futures
+import time
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence
+
+from game_sdk.game.execution import in_thread_pool, submit_to_thread_pool
+from game_sdk.log import get_logger, log_fields
+
+logger = get_logger(__name__)
+
+
+def _get_path(value: Any, path: str) -> Any:
+    """Returns the value at a dotted path of a response (None if it is missing)"""
+    for key in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def paginate(
+    function: Any,
+    args: Sequence[Any] = (),
+    items_path: str = "casts",
+    cursor_path: str = "next.cursor",
+    cursor_param: str = "cursor",
+    page_size: Optional[int] = None,
+    page_size_param: str = "limit",
+    max_items: Optional[int] = None,
+    max_pages: Optional[int] = None,
+    max_seconds: Optional[float] = None,
+    prefetch: bool = True,
+    dedupe_key: Optional[Callable[[Any], Any]] = None,
+    dedupe_window: int = 10_000,
+) -> Iterator[Any]:
+    """
+    Iterates over the items of a cursor-paginated hosted Function, page after page.
+
+    Pages are requested lazily, and only as long as items are consumed: at most the
+    current page and the next one are held in memory, whatever the size of the feed.
+    With `prefetch`, the next page is requested on the shared thread pool of the SDK
+    as soon as the current one arrives, so it is usually there when the current page
+    is used up.
+
+    Args:
+        function (Function): The hosted function returning the pages.
+        args (Sequence[Any]): Arguments of the function.
+        items_path (str): Dotted path of the items in a page (e.g. "result.casts").
+        cursor_path (str): Dotted path of the cursor of the next page in a page.
+        cursor_param (str): Query parameter the cursor is sent in.
+        page_size (Optional[int]): Items per page, sent in `page_size_param`.
+        page_size_param (str): Query parameter of the page size.
+        max_items (Optional[int]): Items after which the iteration stops.
+        max_pages (Optional[int]): Pages after which the iteration stops.
+        max_seconds (Optional[float]): Seconds after which the iteration stops (no new
+            page is requested and no more item is returned once they have passed).
+        prefetch (bool): Request the next page while the current one is used.
+        dedupe_key (Optional[Callable[[Any], Any]]): Returns the identity of an item;
+            items with an identity already returned are skipped (e.g. casts shifting to
+            the next page of a live feed). None returns every item.
+        dedupe_window (int): Identities remembered for deduplication, the most recent
+            ones, so memory stays bounded on endless feeds.
+
+    Returns:
+        Iterator[Any]: The items of the pages, in order.
+
+    Example:
+        ```python
+        for cast in paginate(client.get_function("get_trending_casts"), items_path="casts",
+                             max_items=1000, dedupe_key=lambda cast: cast["hash"]):
+            ...
+        ```
+    """
+    # a thread of the SDK pool must not wait on a page fetched by the same pool
+    prefetch = prefetch and not in_thread_pool()
+    deadline = time.monotonic() + max_seconds if max_seconds is not None else None
+    base_params: Dict[str, Any] = {}
+    if page_size is not None:
+        base_params[page_size_param] = page_size
+
+    def fetch(cursor: Optional[str]) -> Any:
+        params = dict(base_params)
+        if cursor is not None:
+            params[cursor_param] = cursor
+        return function.call(*args, query_params=params, feedback=False)
+
+    def expired() -> bool:
+        return deadline is not None and time.monotonic() >= deadline
+
+    seen: "collections.OrderedDict[Any, None]" = collections.OrderedDict()
+    returned = 0
+    pages = 0
+    next_page: Optional["concurrent.futures.Future[Any]"] = None
+    page = fetch(None)
+
+    try:
+        while True:
+            pages += 1
+            cursor = _get_path(page, cursor_path)
+            more = bool(cursor) and (max_pages is None or pages < max_pages)
+            if more and prefetch:
+                next_page = submit_to_thread_pool(fetch, cursor)
+
+            for item in _get_path(page, items_path) or ():
+                if expired() or (max_items is not None and returned >= max_items):
+                    return
+                if dedupe_key is not None:
+                    key = dedupe_key(item)
+                    if key in seen:
+                        continue
+                    seen[key] = None
+                    if len(seen) > dedupe_window:
+                        seen.popitem(last=False)
+                returned += 1
+                yield item
+
+            if not more or expired() or (max_items is not None and returned >= max_items):
+                return
+            # let the page be freed while the next one is awaited
+            page = None
+            if next_page is not None:
+                page, next_page = next_page.result(), None
+            else:
+                page = fetch(cursor)
+    finally:
+        if next_page is not None:
+            next_page.cancel()
+        logger.debug(
+            "Paginated %s: %d items in %d pages",
+            function.fn_name,
+            returned,
+            pages,
+            extra=log_fields(function=function.fn_name, items=returned, pages=pages),
+        )
@@ -0,0 +1,311 @@
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from game_sdk.game.resilience import RateLimiter, parse_retry_after
+from game_sdk.game.transport import Transport, get_default_transport
+from game_sdk.log import get_logger, log_fields
+
+logger = get_logger(__name__)
+
+# Telegram bot API paths carry the bot token (/bot123456:ABC.../sendMessage)
+_BOT_TOKEN = re.compile(r"/bot\d+:[^/]+")
+
+
+def default_route_key(method: str, url: str) -> str:
+    """Returns the route of a request: its method, host and path (without bot tokens)"""
+    parts = urlsplit(url)
+    return f"{method.upper()} {parts.netloc}{_BOT_TOKEN.sub('/bot<token>', parts.path)}"
+
+
+def _header_float(headers: Any, name: str) -> Optional[float]:
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def parse_rate_limit(response: requests.Response) -> Dict[str, Any]:
+    """
+    Reads the rate limit announced by a platform response.
+
+    Understands the `X-RateLimit-*` headers (Discord's `X-RateLimit-Reset-After`,
+    `X-RateLimit-Global` and `X-RateLimit-Scope`, and the epoch `X-RateLimit-Reset`
+    of other APIs), `Retry-After`, and the `parameters.retry_after` of Telegram 429
+    responses.
+
+    Returns:
+        Dict[str, Any]: `limit` (requests allowed per window), `remaining` (requests
+            left in the window), `reset_after`
+            (seconds until the window resets), `retry_after` (seconds to wait after a
+            429) and `global` (whether the limit is shared by every route); None when
+            the response does not say.
+    """
+    headers = response.headers
+    limit = _header_float(headers, "X-RateLimit-Limit")
+    remaining = _header_float(headers, "X-RateLimit-Remaining")
+
+    reset_after = _header_float(headers, "X-RateLimit-Reset-After")
+    if reset_after is None:
+        reset = _header_float(headers, "X-RateLimit-Reset")
+        if reset is not None:
+            # epoch seconds (or milliseconds), or already a delay for some APIs
+            if reset > 1e12:
+                reset /= 1000.0
+            reset_after = reset - time.time() if reset > 1e9 else reset
+    if reset_after is not None:
+        reset_after = max(0.0, reset_after)
+
+    retry_after = None
+    if response.status_code == 429:
+        retry_after = parse_retry_after(headers.get("Retry-After"))
+        if retry_after is None:
+            try:
+                body = response.json()
+            except ValueError:
+                body = None
+            if isinstance(body, dict):
+                # Telegram: {"parameters": {"retry_after": 5}}, Discord: {"retry_after": 1.5}
+                value = (body.get("parameters") or {}).get("retry_after", body.get("retry_after"))
+                if isinstance(value, (int, float)):
+                    retry_after = max(0.0, float(value))
+        if retry_after is None:
+            retry_after = reset_after
+
+    is_global = (
+        headers.get("X-RateLimit-Global", "").lower() == "true"
+        or headers.get("X-RateLimit-Scope", "").lower() == "global"
+    )
+    return {"limit": limit, "remaining": remaining, "reset_after": reset_after, "retry_after": retry_after, "global": is_global}
+
+
+class _Route:
+    """The token bucket of a route, and the rate limit window announced by the platform"""
+
+    __slots__ = ("limiter", "lock", "limit", "window", "remaining", "reset_at", "requests", "throttled", "delayed", "waited")
+
+    def __init__(self, limiter: RateLimiter):
+        self.limiter = limiter
+        self.lock = threading.Lock()
+        # unknown until a response announces them
+        self.limit: Optional[float] = None
+        self.window: Optional[float] = None
+        self.remaining: Optional[float] = None
+        self.reset_at: Optional[float] = None
+
+        self.requests = 0
+        self.throttled = 0
+        self.delayed = 0
+        self.waited = 0.0
+
+    def reserve(self) -> float:
+        """Takes a request of the window and returns 0, or returns the seconds until the window resets"""
+        with self.lock:
+            now = time.monotonic()
+            if self.reset_at is not None and now >= self.reset_at:
+                # a new window, assumed as long as the longest seen until a response says
+                self.remaining = self.limit
+                self.reset_at = now + self.window if self.limit is not None and self.window else None
+            if self.remaining is None:
+                return 0.0
+            if self.remaining >= 1:
+                self.remaining -= 1
+                return 0.0
+            # used up, and the platform did not say when it resets: let it answer
+            return self.reset_at - now if self.reset_at is not None else 0.0
+
+    def update(self, limit: Dict[str, Any]):
+        """Aligns the window with the rate limit of a response"""
+        with self.lock:
+            if limit["limit"] is not None:
+                self.limit = limit["limit"]
+            if limit["remaining"] is not None and limit["reset_after"] is not None:
+                now = time.monotonic()
+                if self.remaining is None or (self.reset_at is not None and now >= self.reset_at):
+                    self.remaining = limit["remaining"]
+                else:
+                    # calls sent since the response was produced are not counted by the platform yet
+                    self.remaining = min(self.remaining, limit["remaining"])
+                self.reset_at = now + limit["reset_after"]
+                self.window = max(self.window or 0.0, limit["reset_after"])
+
+    def hold(self, seconds: float):
+        """Holds the calls of the route for `seconds` (after a 429)"""
+        with self.lock:
+            self.remaining = 0
+            self.reset_at = max(self.reset_at or 0.0, time.monotonic() + seconds)
+
+
+class RateLimitedTransport(Transport):
+    """
+    Transport limiting the calls of a platform client, per route and overall.
+
+    Every route (method, host and path, e.g. the messages of one Discord channel) has
+    its own token bucket, and `global_rate` bounds the calls of all routes together.
+    Calls wait for a token instead of failing. The limits announced by the platform
+    are followed as well: when a response says no request is left in the window
+    (`X-RateLimit-Remaining: 0`) the route waits for the reset, and a 429 pauses the
+    route (or every route, for a global limit) for as long as it asks, then the call
+    is sent again, up to `max_retries` times.
+
+    One transport is shared by all the functions of a client (see the `transport`
+    argument of DiscordClient, TelegramClient and FarcasterClient), and can be shared
+    by several clients of the same account.
+
+    Args:
+        rate (float): Calls per second allowed on each route.
+        burst (Optional[float]): Calls allowed at once on each route, defaults to `rate`.
+        global_rate (Optional[float]): Calls per second allowed over all routes.
+        transport (Optional[Transport]): Transport sending the requests, defaults
+            to the process-wide shared transport.
+        route_key (Callable[[str, str], str]): Returns the route of a request from its
+            method and URL.
+        max_retries (int): Times a call refused with a 429 is sent again.
+        max_wait (float): Longest pause honoured after a 429, in seconds. A call asked
+            to wait longer fails (its 429 response is returned).
+
+    Example:
+        ```python
+        transport = RateLimitedTransport(rate=1, burst=5, global_rate=50)
+        client = DiscordClient(bot_token, transport=transport)
+        ...
+        print(transport.stats())
+        ```
+    """
+
+    def __init__(
+        self,
+        rate: float = 5.0,
+        burst: Optional[float] = None,
+        global_rate: Optional[float] = None,
+        transport: Optional[Transport] = None,
+        route_key: Callable[[str, str], str] = default_route_key,
+        max_retries: int = 3,
+        max_wait: float = 60.0,
+    ):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.transport = transport or get_default_transport()
+        self.rate = rate
+        self.burst = burst
+        self.global_limiter = RateLimiter(global_rate) if global_rate is not None else None
+        self.route_key = route_key
+        self.max_retries = max_retries
+        self.max_wait = max_wait
+
+        self._lock = threading.Lock()
+        self._routes: Dict[str, _Route] = {}
+
+    def _get_route(self, key: str) -> _Route:
+        with self._lock:
+            route = self._routes.get(key)
+            if route is None:
+                route = self._routes[key] = _Route(RateLimiter(self.rate, self.burst))
+            return route
+
+    def _acquire(self, route: _Route) -> float:
+        """Waits for the window and the token buckets of the route, returns the seconds waited"""
+        started = time.monotonic()
+        while True:
+            wait = route.reserve()
+            if not wait:
+                break
+            time.sleep(wait)
+        route.limiter.acquire()
+        if self.global_limiter is not None:
+            self.global_limiter.acquire()
+        return time.monotonic() - started
+
+    def request(self, method: str, url: str, idempotent: Optional[bool] = None, **kwargs: Any) -> requests.Response:
+        key = self.route_key(method, url)
+        route = self._get_route(key)
+
+        attempt = 0
+        while True:
+            waited = self._acquire(route)
+            response = self.transport.request(method, url, idempotent=idempotent, **kwargs)
+            limit = parse_rate_limit(response)
+            route.update(limit)
+
+            with self._lock:
+                route.requests += 1
+                # waits shorter than a millisecond are only lock contention
+                if waited > 0.001:
+                    route.delayed += 1
+                    route.waited += waited
+
+            if response.status_code != 429:
+                return response
+
+            delay = limit["retry_after"] or 1.0
+            with self._lock:
+                route.throttled += 1
+                routes = list(self._routes.values()) if limit["global"] else [route]
+            for held in routes:
+                held.hold(delay)
+            if limit["global"] and self.global_limiter is not None:
+                self.global_limiter.pause(delay)
+
+            if attempt >= self.max_retries or delay > self.max_wait:
+                logger.warning(
+                    "Rate limited on %s, giving up (retry after %.2fs)", key, delay,
+                    extra=log_fields(route=key, attempt=attempt + 1, delay=delay),
+                )
+                return response
+
+            logger.info(
+                "Rate limited on %s, retrying in %.2fs", key, delay,
+                extra=log_fields(route=key, attempt=attempt + 1, delay=delay, scope="global" if limit["global"] else "route"),
+            )
+            if response.raw is not None:
+                response.close()
+            attempt += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the number of calls, 429 responses, delayed calls and wait time, overall and per route"""
+        with self._lock:
+            routes = {
+                key: {
+                    "requests": route.requests,
+                    "throttled": route.throttled,
+                    "delayed": route.delayed,
+                    "waited_seconds": route.waited,
+                    "remaining": route.remaining,
+                }
+                for key, route in self._routes.items()
+            }
+        return {
+            "requests": sum(route["requests"] for route in routes.values()),
+            "throttled": sum(route["throttled"] for route in routes.values()),
+            "delayed": sum(route["delayed"] for route in routes.values()),
+            "waited_seconds": sum(route["waited_seconds"] for route in routes.values()),
+            "routes": routes,
+        }
+
+    def close(self):
+        """Nothing to release - the wrapped transport is left open"""
+
+
+# limits applied by the platform clients when they are not given a transport
+PLATFORM_LIMITS: Dict[str, Dict[str, float]] = {
+    # Discord: about 5 calls per few seconds per route, 50/s per bot
+    "discord": {"rate": 1.0, "burst": 5.0, "global_rate": 50.0},
+    # Telegram: about 30 messages/s per bot
+    "telegram": {"rate": 30.0, "global_rate": 30.0},
+    # Neynar (Farcaster): per-endpoint limits of a few calls per second on the base plans
+    "farcaster": {"rate": 5.0, "global_rate": 10.0},
+}
+
+
+def create_platform_transport(platform: str, transport: Optional[Transport] = None) -> RateLimitedTransport:
+    """Returns a RateLimitedTransport with the default limits of `platform` (see PLATFORM_LIMITS)"""
+    if platform not in PLATFORM_LIMITS:
+        raise ValueError(f"Unknown platform: {platform}. Available platforms: {', '.join(PLATFORM_LIMITS)}")
+    return RateLimitedTransport(transport=transport, **PLATFORM_LIMITS[platform])
@@ -1,26 +1,48 @@
+from typing import Optional
+
 import requests
+from game_sdk.hosted_game.metadata_cache import FetchResult, MetadataCache, cache_key, get_default_metadata_cache
+from game_sdk.log import get_logger, log_fields
+
+logger = get_logger(__name__)
 
 
 class GameSDK:
     api_url: str = "https://game-api.virtuals.io/api"
     api_key: str
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, metadata_cache: Optional[MetadataCache] = None):
         self.api_key = api_key
+        # shared by every GameSDK of the process unless one is given
+        self.metadata_cache = metadata_cache or get_default_metadata_cache()
 
-    def functions(self):
-        """
-        Get all default functions
-        """
-        response = requests.get(
-            f"{self.api_url}/functions", headers={"x-api-key": self.api_key})
+    def _fetch_functions(self, etag: Optional[str]) -> FetchResult:
+        headers = {"x-api-key": self.api_key}
+        if etag:
+            headers["If-None-Match"] = etag
+        response = requests.get(f"{self.api_url}/functions", headers=headers)
 
+        if response.status_code == 304:
+            return None
         if (response.status_code != 200):
             raise Exception(response.json())
 
+        return response.json()["data"], response.headers.get("ETag")
+
+    def functions(self, refresh: bool = False):
+        """
+        Get all default functions
+
+        The catalog is cached per API key (see MetadataCache), and revalidated with
+        its ETag once stale or when `refresh` is set.
+        """
+        catalog = self.metadata_cache.get(
+            cache_key(self.api_key, f"{self.api_url}/functions"), self._fetch_functions, refresh=refresh
+        )
+
         functions = {}
 
-        for x in response.json()["data"]:
+        for x in catalog:
             functions[x["fn_name"]] = x["fn_description"]
 
         return functions
@@ -74,8 +96,12 @@ class GameSDK:
             
         if (tweet_id):
             payload["tweetId"] = tweet_id
-            
-        print(payload)
+
+        # the payload holds every function definition - only format it when debugging
+        logger.debug(
+            "React payload: %s", payload,
+            extra=log_fields(session_id=session_id, platform=platform),
+        )
 
         response = requests.post(
             url,
@@ -0,0 +1,282 @@
+import functools
+import json
+import re
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+# {{name}} or {{name.path.to.value}}, e.g. {{response.result.message_id}}, with list
+# items as `.[N]` or `.N` ({{response.casts.[0].text}}), and the sections opened by
+# {{#path}} and closed by {{/path}}
+PLACEHOLDER = re.compile(r"\{\{\s*([#/]?)\s*([A-Za-z_]\w*(?:\.(?:\w+|\[\d+\]))*)\s*\}\}")
+
+_MISSING = object()
+
+
+def _parse_path(path: str) -> Tuple[str, ...]:
+    return tuple(key[1:-1] if key.startswith("[") else key for key in path.split("."))
+
+
+def _lookup(values: Dict[str, Any], path: Tuple[str, ...]) -> Any:
+    value: Any = values
+    for key in path:
+        if isinstance(value, dict):
+            value = value.get(key, _MISSING)
+        elif isinstance(value, (list, tuple)) and key.isdigit() and int(key) < len(value):
+            value = value[int(key)]
+        elif isinstance(value, (list, tuple)) and key == "length":
+            value = len(value)
+        else:
+            return _MISSING
+        if value is _MISSING:
+            return _MISSING
+    return value
+
+
+class _Section:
+    """The parts between {{#path}} and {{/path}}, rendered only if the value at `path` is not empty"""
+    __slots__ = ("path", "parts")
+
+    def __init__(self, path: Tuple[str, ...]):
+        self.path = path
+        self.parts: List[Any] = []
+
+
+def _sections(matches: List["re.Match[str]"]) -> Set[int]:
+    """Returns the indexes of the section tags having their opening or closing tag"""
+    paired: Set[int] = set()
+    opened: List[int] = []
+    for i, match in enumerate(matches):
+        if match.group(1) == "#":
+            opened.append(i)
+        elif match.group(1) == "/" and opened and matches[opened[-1]].group(2) == match.group(2):
+            paired.update((opened.pop(), i))
+    return paired
+
+
+class CompiledTemplate:
+    """
+    A `{{placeholder}}` template parsed once into literal text and value paths.
+
+    Placeholders may be dotted paths into the values (`{{response.result.id}}`), with
+    list items by index (`{{response.casts.[0].text}}`) and the `length` of lists.
+    Placeholders without a value are left as they are. The text of a section
+    (`{{#response.cast.embeds.[0]}}...{{/response.cast.embeds.[0]}}`) is only
+    rendered when the value of its path is present and not empty.
+
+    Attributes:
+        source (str): The template.
+        placeholders (Tuple[str, ...]): The placeholders of the template, in order
+            (section paths included).
+    """
+    __slots__ = ("source", "placeholders", "_parts", "_single")
+
+    def __init__(self, source: str):
+        self.source = source
+        # literal strings, (value path, placeholder text) pairs and sections, in order
+        self._parts: List[Any] = []
+        placeholders = []
+
+        matches = list(PLACEHOLDER.finditer(source))
+        paired = _sections(matches)
+        # parts of the template, then of the open sections (innermost last)
+        stack: List[List[Any]] = [self._parts]
+        position = 0
+        for i, match in enumerate(matches):
+            tag, path = match.group(1), match.group(2)
+            if tag and i not in paired:
+                # a section tag without its opening or closing tag is text
+                continue
+            if match.start() > position:
+                stack[-1].append(source[position:match.start()])
+            position = match.end()
+            placeholders.append(path)
+
+            if tag == "#":
+                section = _Section(_parse_path(path))
+                stack[-1].append(section)
+                stack.append(section.parts)
+            elif tag == "/":
+                stack.pop()
+            else:
+                stack[-1].append((_parse_path(path), match.group(0)))
+        if position < len(source):
+            self._parts.append(source[position:])
+
+        self.placeholders = tuple(placeholders)
+        # the whole template is one placeholder: `resolve` can return the value as is
+        self._single: Optional[Tuple[str, ...]] = (
+            self._parts[0][0] if len(self._parts) == 1 and isinstance(self._parts[0], tuple) else None
+        )
+
+    @staticmethod
+    def _render(parts: List[Any], values: Dict[str, Any], rendered: List[str]):
+        for part in parts:
+            if isinstance(part, str):
+                rendered.append(part)
+            elif isinstance(part, _Section):
+                value = _lookup(values, part.path)
+                if value is not _MISSING and value:
+                    CompiledTemplate._render(part.parts, values, rendered)
+            else:
+                value = _lookup(values, part[0])
+                if value is _MISSING:
+                    rendered.append(part[1])
+                elif isinstance(value, str):
+                    rendered.append(value)
+                else:
+                    rendered.append(str(value))
+
+    def render(self, values: Dict[str, Any]) -> str:
+        """Returns the template with its placeholders replaced by their values"""
+        if not self.placeholders:
+            return self.source
+
+        rendered: List[str] = []
+        self._render(self._parts, values, rendered)
+        return "".join(rendered)
+
+    def has_values(self, values: Dict[str, Any]) -> bool:
+        """Whether every placeholder of the template (outside sections) has a value"""
+        return all(
+            _lookup(values, part[0]) is not _MISSING for part in self._parts if isinstance(part, tuple)
+        )
+
+    def resolve(self, values: Dict[str, Any]) -> Any:
+        """
+        Returns the value of a template made of a single placeholder as is (e.g. a list
+        for "{{options}}"), otherwise the rendered template
+        """
+        if self._single is not None:
+            value = _lookup(values, self._single)
+            if value is not _MISSING:
+                return value
+        return self.render(values)
+
+    def __repr__(self) -> str:
+        return f"CompiledTemplate({self.source!r})"
+
+
+@functools.lru_cache(maxsize=4096)
+def compile_template(source: str) -> CompiledTemplate:
+    """Returns the compiled template of `source` (cached, templates are immutable)"""
+    return CompiledTemplate(source)
+
+
+# checks of the argument types, other types are not checked
+_ARG_TYPES: Dict[str, Tuple[type, ...]] = {
+    "string": (str,),
+    "array": (list, tuple),
+}
+
+_ARG_TYPE_NAMES = {
+    "string": "a string",
+    "array": "an array",
+}
+
+
+class ArgValidator:
+    """
+    Converts the positional arguments of a hosted Function call to named arguments,
+    with the type checks of its argument definitions resolved once.
+
+    Optional arguments (`required=False`) that are left out or None have no value,
+    so the placeholders and query parameters using them are left out as well.
+
+    Args:
+        args (Sequence): The FunctionArgument definitions of the function.
+    """
+    __slots__ = ("names", "required", "_optional", "_checks")
+
+    def __init__(self, args: Sequence[Any]):
+        self.names: Tuple[str, ...] = tuple(arg.name for arg in args)
+        # arguments up to the last required one must be given
+        self.required = max(
+            (i + 1 for i, arg in enumerate(args) if getattr(arg, "required", True)), default=0
+        )
+        self._optional = frozenset(arg.name for arg in args if not getattr(arg, "required", True))
+        self._checks: Tuple[Tuple[int, str, Tuple[type, ...], str], ...] = tuple(
+            (i, arg.name, _ARG_TYPES[arg.type], _ARG_TYPE_NAMES[arg.type])
+            for i, arg in enumerate(args)
+            if arg.type in _ARG_TYPES
+        )
+
+    def __call__(self, values: Sequence[Any]) -> Dict[str, Any]:
+        if not self.required <= len(values) <= len(self.names):
+            if self.required == len(self.names):
+                raise ValueError(f"Expected {len(self.names)} arguments, got {len(values)}")
+            raise ValueError(f"Expected {self.required} to {len(self.names)} arguments, got {len(values)}")
+
+        for i, name, types, type_name in self._checks:
+            if i < len(values) and not isinstance(values[i], types):
+                if values[i] is None and name in self._optional:
+                    continue
+                raise TypeError(f"Argument {name} must be {type_name}")
+
+        if not self._optional:
+            return dict(zip(self.names, values))
+        return {
+            name: value
+            for name, value in zip(self.names, values)
+            if value is not None or name not in self._optional
+        }
+
+
+class RequestPlan:
+    """
+    The request of a hosted Function, with its URL, payload keys and payload values
+    compiled once, so a call only substitutes the argument values.
+
+    Args:
+        config: The FunctionConfig of the function.
+    """
+    __slots__ = ("method", "url", "headers", "_payload", "_params")
+
+    def __init__(self, config: Any):
+        self.method: str = config.method
+        self.url = compile_template(config.url)
+        self.headers: Dict[str, Any] = config.headers
+
+        # query parameters, left out when an argument they use has no value
+        self._params: List[Tuple[str, Any]] = [
+            (key, compile_template(value) if isinstance(value, str) else value)
+            for key, value in (getattr(config, "query_params", None) or {}).items()
+        ]
+
+        # (key, value) pairs: static values are kept as they are, string values are
+        # compiled (with their key); a compiled value made of a single placeholder
+        # keeps the type of the argument (e.g. arrays)
+        self._payload: List[Tuple[Any, Any, bool]] = []
+        for key, value in config.payload.items():
+            if isinstance(value, str):
+                self._payload.append((compile_template(key), compile_template(value), True))
+            else:
+                self._payload.append((key, value, False))
+
+    def build_payload(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        payload = {}
+        for key, value, compiled in self._payload:
+            if compiled:
+                payload[key.render(values)] = value.resolve(values)
+            else:
+                payload[key] = value
+        return payload
+
+    def build_params(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        params = {}
+        for key, value in self._params:
+            if not isinstance(value, CompiledTemplate):
+                params[key] = value
+            elif value.has_values(values):
+                params[key] = value.resolve(values)
+        return params
+
+    def build(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        """Returns the arguments of `requests.request` for the given argument values"""
+        request = {
+            "method": self.method,
+            "url": self.url.render(values),
+            "headers": self.headers,
+            "data": json.dumps(self.build_payload(values)),
+        }
+        if self._params:
+            request["params"] = self.build_params(values)
+        return request
@@ -0,0 +1,162 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+from typing import Any, Dict, Optional, TextIO
+
+# root logger of the SDK, every module logs to a child of it
+LOGGER_NAME = "game_sdk"
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Returns the logger of an SDK module (e.g. `get_logger(__name__)`)"""
+    if name != LOGGER_NAME and not name.startswith(LOGGER_NAME + "."):
+        name = f"{LOGGER_NAME}.{name}"
+    return logging.getLogger(name)
+
+
+def log_fields(**fields: Any) -> Dict[str, Any]:
+    """
+    Returns the `extra` argument attaching structured fields to a log record.
+
+    The fields are stored in the `game` attribute of the record and emitted as JSON
+    keys by JSONFormatter.
+
+    Example:
+        ```python
+        logger.info("Action selected: %s", fn_name, extra=log_fields(agent_id=agent_id, fn_name=fn_name))
+        ```
+    """
+    return {"game": fields}
+
+
+class JSONFormatter(logging.Formatter):
+    """Formats records as one JSON object per line, including their structured fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update(getattr(record, "game", None) or {})
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class _StdoutFallbackHandler(logging.StreamHandler):
+    """
+    Prints the SDK messages to stdout (like the SDK always did) as long as the
+    application has not configured logging itself.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.setFormatter(logging.Formatter("%(message)s"))
+
+    @property
+    def stream(self) -> TextIO:
+        # resolved on every record, so redirected stdout is honoured
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value: TextIO):
+        pass
+
+    def emit(self, record: logging.LogRecord):
+        if logging.getLogger().handlers:
+            return  # the root handlers get the record through propagation
+        super().emit(record)
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener thread, so the message
+    (e.g. the repr of a large response) is not built on the step path.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+_fallback_handler = _StdoutFallbackHandler()
+_handler: Optional[logging.Handler] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+
+_sdk_logger = logging.getLogger(LOGGER_NAME)
+_sdk_logger.setLevel(logging.INFO)
+_sdk_logger.addHandler(_fallback_handler)
+
+
+def configure_logging(
+    level: int = logging.INFO,
+    stream: Optional[TextIO] = None,
+    handler: Optional[logging.Handler] = None,
+    json_format: bool = False,
+    queued: bool = False,
+    propagate: bool = False,
+) -> logging.Logger:
+    """
+    Configures the SDK loggers, replacing any previous configuration.
+
+    Args:
+        level (int): Minimum level to log. Step summaries are logged at INFO, full
+            action responses, function results and payloads at DEBUG.
+        stream (Optional[TextIO]): Stream to log to, defaults to stdout.
+        handler (Optional[logging.Handler]): Handler to log to, instead of a stream handler.
+        json_format (bool): Format records as JSON lines with their structured fields.
+        queued (bool): Hand records to a background thread that formats and writes them,
+            so the agent loop never blocks on the handler.
+        propagate (bool): Also pass records to the application (root) handlers.
+
+    Returns:
+        logging.Logger: The root logger of the SDK.
+
+    Example:
+        ```python
+        configure_logging(logging.DEBUG, json_format=True, queued=True)
+        ```
+    """
+    global _handler, _listener
+    shutdown_logging()
+
+    if handler is None:
+        handler = logging.StreamHandler(stream or sys.stdout)
+        handler.setFormatter(
+            JSONFormatter() if json_format
+            else logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+        )
+    elif json_format:
+        handler.setFormatter(JSONFormatter())
+
+    if queued:
+        records: "queue.Queue[logging.LogRecord]" = queue.Queue()
+        _listener = logging.handlers.QueueListener(records, handler, respect_handler_level=True)
+        _listener.start()
+        _handler = _DeferredQueueHandler(records)
+    else:
+        _handler = handler
+
+    _sdk_logger.removeHandler(_fallback_handler)
+    _sdk_logger.addHandler(_handler)
+    _sdk_logger.setLevel(level)
+    _sdk_logger.propagate = propagate
+    return _sdk_logger
+
+
+def shutdown_logging():
+    """Flushes the queued records (if any) and removes the handler set by `configure_logging`"""
+    global _handler, _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    if _handler is not None:
+        _sdk_logger.removeHandler(_handler)
+        _handler = None
+
+
+atexit.register(shutdown_logging)